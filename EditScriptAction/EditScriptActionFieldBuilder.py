@@ -15,6 +15,7 @@ from Model.ScriptInputEventAction import ScriptInputEventAction
 from Model.ScriptMessageAction import ScriptMessageAction
 from Model.ScriptRunAction import ScriptRunAction, NOOPScriptRunAction, NOOP_SCRIPT
 from Model.ScriptSnapshotAction import ScriptSnapshotAction
+from Service.ScriptStorage import SCRIPT_FILE_FORMATS
 from Service.SettingsManager import SettingsManagerProtocol, SettingsManagerField
 from Service.Work.ScriptActionExecutionCluster import ScriptSnapshotExecution
 from Utilities import Path as PathUtils
@@ -195,7 +196,13 @@ class EditScriptActionFieldBuilder(EditScriptActionFieldBuilderProtocol):
                 file_name.set_delegate(presenter)
                 presenter.start(file_name)
                 
+                timeout = EditScriptActionFieldFloat(name='Timeout (seconds, 0 = settings)', min=0, decimals=3)
+                presenter = EditScriptActionFieldPresenter(action.timeout, action.set_timeout)
+                timeout.set_delegate(presenter)
+                presenter.start(timeout)
+                
                 fields.append(file_name)
+                fields.append(timeout)
             else:
                 assert False # ScriptAction implement: not implemented
         
@@ -231,6 +238,5 @@ class EditScriptActionFieldBuilder(EditScriptActionFieldBuilderProtocol):
         return result
     
     def get_all_script_files(self, base_dir: str):
-        file_format = self.settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)
-        items = PathUtils.directory_file_list(base_dir, file_format)
+        items = PathUtils.directory_file_list(base_dir, SCRIPT_FILE_FORMATS)
         return list(map(lambda item: item.last_component(), items))
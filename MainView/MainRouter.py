@@ -1,5 +1,5 @@
 from typing import Protocol
-from PyQt5.QtWidgets import QVBoxLayout
+from PyQt5.QtWidgets import QVBoxLayout, QMessageBox
 from kink import di
 from ChooseKeyboardKey.ChooseKeyboardKeyPresenter import ChooseKeyboardKeyPresenter
 from ChooseKeyboardKey.ChooseKeyboardKeyWidget import ChooseKeyboardKeyWidget
@@ -11,7 +11,7 @@ from MainView.SettingsPresenter import SettingsPresenter
 from Model.ScriptData import ScriptData
 from OpenScriptView.OpenScriptRouter import OpenScriptRouter
 from MainView.ShowScriptsPresenter import ShowScriptsPresenter
-from MainView.RecordScriptPresenter import RecordScriptPresenter
+from MainView.RecordScriptPresenter import RecordScriptPresenter, RecordingRecoveryChoice
 from Service.PickFileBrowser import PickFileBrowser
 from Service.SettingsManager import SettingsManagerField, SettingsManagerProtocol
 from Utilities.Path import Path
@@ -23,10 +23,9 @@ class MainRouter(Protocol):
     # - Init
     
     def __init__(self):
-        settings = di[SettingsManagerProtocol]
         self.widget = None
+        self.settings = di[SettingsManagerProtocol]
         self.pick_file_browser = di[PickFileBrowser]
-        self.file_format = settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)
         self.show_scripts_presenter = ShowScriptsPresenter()
         self.rec_presenter = RecordScriptPresenter()
         self.settings_presenter = SettingsPresenter()
@@ -96,7 +95,25 @@ class MainRouter(Protocol):
             assert False # Invalid tab selected
     
     def pick_save_file(self, directory) -> Path:
-        return self.pick_file_browser.pick_file(self.widget, "Save File", self.file_format, directory)
+        file_format = self.settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)
+        return self.pick_file_browser.pick_file(self.widget, "Save File", file_format, directory)
+    
+    def prompt_recover_recording(self, parent, event_count) -> RecordingRecoveryChoice:
+        box = QMessageBox(parent)
+        box.setWindowTitle('Recover recording')
+        box.setText(f'A recording that was not saved was found ({event_count} events).')
+        box.setInformativeText('Save it as a script?')
+        save_button = box.addButton('Save...', QMessageBox.AcceptRole)
+        discard_button = box.addButton('Discard', QMessageBox.DestructiveRole)
+        box.addButton('Later', QMessageBox.RejectRole)
+        box.exec()
+        
+        if box.clickedButton() is save_button:
+            return RecordingRecoveryChoice.SAVE
+        elif box.clickedButton() is discard_button:
+            return RecordingRecoveryChoice.DISCARD
+        else:
+            return RecordingRecoveryChoice.LATER
     
     def configure_script(self, parent, script: ScriptData):
         presenter = ConfigureScriptPresenter(script)
@@ -126,9 +143,8 @@ class MainRouter(Protocol):
     
     # - DialogRouter
     
-    def on_dialog_appear(self, sender):
-        self.show_scripts_presenter.reload_data()
-    
+    # The scripts list is kept up to date by its directory watcher, no reload needed
+    def on_dialog_appear(self, sender): pass
     def on_dialog_disappear(self, sender): pass
     def on_dialog_close(self, sender): pass
     
@@ -1,4 +1,5 @@
-import time
+import enum
+from dataclasses import replace
 from kink import di
 from typing import Protocol
 from PyQt5.QtCore import QTimer
@@ -7,24 +8,33 @@ from Model.ScriptActions import ScriptActions
 from Model.ScriptConfiguration import ScriptConfiguration
 from Model.ScriptData import ScriptData
 from Model.ScriptInfo import ScriptInfo
-from Model.ScriptInputEventAction import ScriptInputEventAction
 from Model.ScriptSummary import ScriptSummary
-from Parser.ScriptActionDescriptionParser import ScriptActionDescriptionParserProtocol, Grouping
-from Parser.ScriptActionTypeParser import ScriptActionTypeParserProtocol
+from Parser.ScriptActionDescriptionParser import ScriptActionDescriptionParserProtocol, ScriptActionDescriptionState, Grouping
 from Presenter.Presenter import Presenter
 from Service.EventMonitor import KeyboardEventMonitor
 from Service.EventMonitorManager import EventMonitorManager
 from MainView.RecordScriptWidget import RecordScriptWidgetProtocol
+from Service.RecordingFilter import RecordingFilterOptions
+from Service.RecordingJournal import RecordingJournal, unfinalized_journals
 from Service.ScriptStorage import ScriptStorage
 from Service.SettingsManager import SettingsManagerField, SettingsManagerProtocol
+from Utilities.Clock import ClockProtocol, ns_to_seconds
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 from Utilities.Path import Path
 
 
+class RecordingRecoveryChoice(enum.Enum):
+    SAVE = 0
+    DISCARD = 1
+    LATER = 2
+
+
 class RecordScriptPresenterRouter(Protocol):
     def enable_tabs(self, value): pass
     def pick_save_file(self, directory) -> Path: pass
     def configure_script(self, parent, script: ScriptData): pass
+    def prompt_recover_recording(self, parent, event_count) -> RecordingRecoveryChoice: pass
 
 
 class RecordScriptPresenter(Presenter):
@@ -40,18 +50,21 @@ class RecordScriptPresenter(Presenter):
         self.settings = di[SettingsManagerProtocol]
         self.keyboard_monitor = di[KeyboardEventMonitor]
         self.description_parser = di[ScriptActionDescriptionParserProtocol]
-        self.action_type_parser = di[ScriptActionTypeParserProtocol]
         
         self.event_monitor = EventMonitorManager()
+        self.event_monitor.set_delegate(self)
+        self.description_state = ScriptActionDescriptionState(Grouping(ScriptActionType.MOUSE_MOVE))
+        self.events_generation = 0 # Of the described events
         self.script_info = ScriptInfo()
         self.script_config = ScriptConfiguration()
         
         self.running = False
-        self.file_format = '.json'
+        self.recovery_offered = False # Journals left behind are offered once, when the tab first starts
         self.trigger_key = None
         
         # When used, the hotkey is suspended for a short period
-        self.hotkey_click_time = 0
+        self.clock = di[ClockProtocol]
+        self.hotkey_click_time = 0 # Capture time (in ns) of the last used hotkey
         self.hotkey_suspend_interval = 0.5
         
         self.update_timer = QTimer(self)
@@ -59,7 +72,7 @@ class RecordScriptPresenter(Presenter):
         self.update_timer.setInterval(100)
         self.update_timer.timeout.connect(self.update_events)
         
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.UI)
     
     # - Properties
     
@@ -68,18 +81,14 @@ class RecordScriptPresenter(Presenter):
     def set_widget(self, widget): self.widget = widget
     def get_router(self) -> RecordScriptPresenterRouter: return self.router
     def set_router(self, router): self.router = router
-    def get_recorded_events(self) -> []: return self.event_monitor.get_events()
     def get_script_info(self) -> ScriptInfo: return self.script_info
     def get_script_config(self) -> ScriptConfiguration: return self.script_config
-    def get_recorded_events_as_actions(self) -> ScriptActions:
-        type_parser = self.action_type_parser
-        events = self.get_recorded_events()
-        
-        result = list(map(lambda event: ScriptInputEventAction(type_parser.type_for_input_event(event),
-                                                               event,
-                                                               event.time()), events))
-        
-        return ScriptActions(result)
+    def get_recorded_events_as_actions(self) -> ScriptActions: return self.event_monitor.get_actions()
+    
+    def get_filter_options(self) -> RecordingFilterOptions:
+        return RecordingFilterOptions(self.settings.field_value(SettingsManagerField.RECORD_MOVE_INTERVAL),
+                                      self.settings.field_value(SettingsManagerField.RECORD_MOVE_DISTANCE),
+                                      self.settings.field_value(SettingsManagerField.RECORD_PATH_TOLERANCE))
     
     # - Setup
     
@@ -91,6 +100,9 @@ class RecordScriptPresenter(Presenter):
         self.keyboard_monitor.start()
         
         self.event_monitor.filter_keys.append(self.trigger_key)
+        
+        if not self.recovery_offered:
+            self.recover_recordings()
     
     def stop(self):
         if self.keyboard_monitor.is_running():
@@ -113,11 +125,21 @@ class RecordScriptPresenter(Presenter):
         
         self.logger.info('RecordScriptPresenter begin')
         
+        # Not saved, replaced by the new recording like the events kept in memory
+        previous_journal = self.event_monitor.get_journal()
+        
+        if previous_journal is not None:
+            self.event_monitor.wait()
+            previous_journal.remove()
+        
         self.running = True
+        self.event_monitor.set_filter_options(self.get_filter_options())
+        self.event_monitor.set_journal(RecordingJournal() if self.settings.field_value(SettingsManagerField.RECORD_TO_JOURNAL) else None)
         self.event_monitor.start()
+        self.reset_events()
         self.update_events()
         self.update_timer.start()
-        self.hotkey_click_time = time.time()
+        self.hotkey_click_time = self.clock.now_ns()
         
         # If command was initiated by the widget, do not forward it back
         if sender is not self.widget:
@@ -129,14 +151,22 @@ class RecordScriptPresenter(Presenter):
         
         self.logger.info('RecordScriptPresenter stop recording')
         
+        # The worker replaces the recorded events when it finishes, they are described again after that
         self.running = False
-        self.event_monitor.stop()
         self.update_timer.stop()
+        self.event_monitor.stop()
         
         # If command was initiated by the widget, do not forward it back
         if sender is not self.widget:
             self.widget.stop_recording(sender=self)
     
+    # The recorded mouse paths may have been simplified, show the final events
+    def recording_finished(self):
+        if self.running:
+            return
+        
+        self.update_events()
+    
     def configure_script(self):
         actions = self.get_recorded_events_as_actions()
         info = self.get_script_info().copy()
@@ -153,39 +183,83 @@ class RecordScriptPresenter(Presenter):
     def save_recording(self):
         assert self.router is not None
         
-        actions = self.get_recorded_events_as_actions()
         info = self.get_script_info().copy()
         config = self.get_script_config().copy()
         
         self.logger.info(f'RecordScriptPresenter save {info.name}')
-        scripts_dir = self.settings.field_value(SettingsManagerField.SCRIPTS_PATH)
-        file_path = self.router.pick_save_file(scripts_dir)
+        file_path = self.pick_script_file()
         
         if file_path is None:
             return
         
-        if not file_path.absolute.endswith(self.file_format):
-            file_path.append_to_end(self.file_format)
-        
         # When name is not set, set it to equal file name
         if info.is_name_default():
-            info.name = file_path.stem()
+            info = replace(info, name=file_path.stem())
         
         summary = ScriptSummary(info, config)
-        script = ScriptData(actions, summary)
-        ScriptStorage(file_path).write_script_data_to_file(script)
+        journal = self.event_monitor.get_journal()
+        
+        if journal is not None:
+            self.event_monitor.wait()
+            journal.finalize(file_path, summary)
+            journal.remove()
+        else:
+            script = ScriptData(self.get_recorded_events_as_actions(), summary)
+            ScriptStorage(file_path).write_script_data_to_file(script)
         
         self.widget.disable_save_recording()
         self.widget.on_script_save()
     
+    # Journals left behind by recordings that were interrupted or not saved, each one can be saved as a script
+    def recover_recordings(self):
+        assert self.router is not None
+        assert not self.running
+        
+        self.recovery_offered = True
+        
+        for path in unfinalized_journals():
+            journal = RecordingJournal(path)
+            
+            try:
+                actions = journal.read_actions()
+            except Exception as error:
+                self.logger.error(f"RecordScriptPresenter failed to read '{path.absolute}', error: {error}")
+                continue
+            
+            if actions.count() == 0:
+                journal.remove()
+                continue
+            
+            self.logger.info(f"RecordScriptPresenter found unsaved recording '{path.absolute}'")
+            
+            match self.router.prompt_recover_recording(self.widget, actions.count()):
+                case RecordingRecoveryChoice.SAVE:
+                    self.save_recovered_recording(journal, actions)
+                case RecordingRecoveryChoice.DISCARD:
+                    journal.remove()
+                case RecordingRecoveryChoice.LATER:
+                    pass
+    
+    # The journal is kept if no file is picked, and offered again on the next start
+    def save_recovered_recording(self, journal: RecordingJournal, actions: ScriptActions):
+        file_path = self.pick_script_file()
+        
+        if file_path is None:
+            return
+        
+        summary = ScriptSummary(ScriptInfo(name=file_path.stem()), ScriptConfiguration())
+        ScriptStorage(file_path).write_script_data_to_file(ScriptData(actions, summary))
+        journal.remove()
+    
     def on_key_press(self, event):
-        time_since_last_usage = time.time() - self.hotkey_click_time
+        capture_time = self.keyboard_monitor.get_capture_time()
+        time_since_last_usage = ns_to_seconds(capture_time - self.hotkey_click_time)
         
         if time_since_last_usage < self.hotkey_suspend_interval:
             return
         
         if event.key == self.trigger_key:
-            self.hotkey_click_time = time.time()
+            self.hotkey_click_time = capture_time
             
             if self.is_running():
                 self.stop_recording(sender=self)
@@ -195,9 +269,35 @@ class RecordScriptPresenter(Presenter):
     def noop_on_key_press(self, key):
         pass
     
+    # Only the events recorded since the last update are described, unless the recorded events were replaced
     def update_events(self):
-        actions = self.get_recorded_events_as_actions()
-        actions.reverse()
-        descriptions = self.description_parser.parse_actions(actions, group_options=Grouping(ScriptActionType.MOUSE_MOVE))
-        self.widget.set_events_data(descriptions)
-
+        if self.event_monitor.get_events_generation() != self.events_generation:
+            self.reset_events()
+        
+        state = self.description_state
+        actions = self.event_monitor.get_actions_since(state.action_count)
+        
+        if actions.count() == 0:
+            return
+        
+        removed_count, descriptions = self.description_parser.parse_new_actions(state, actions)
+        self.widget.add_events_data(removed_count, descriptions)
+    
+    # - Helpers
+    
+    # The only place where the described events are cleared, for a new recording or replaced events
+    def reset_events(self):
+        self.description_state = ScriptActionDescriptionState(Grouping(ScriptActionType.MOUSE_MOVE))
+        self.events_generation = self.event_monitor.get_events_generation()
+        self.widget.set_events_data([])
+    
+    # The file format is read when saving, it can be changed in the settings after the tab was created
+    def pick_script_file(self) -> Path:
+        scripts_dir = self.settings.field_value(SettingsManagerField.SCRIPTS_PATH)
+        file_format = f'.{self.settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)}'
+        result = self.router.pick_save_file(scripts_dir)
+        
+        if result is not None and not result.absolute.endswith(file_format):
+            result = Path(f'{result.absolute}{file_format}')
+        
+        return result
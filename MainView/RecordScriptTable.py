@@ -1,9 +1,12 @@
 from PyQt5.QtWidgets import *
 from kink import inject, di
 
+from MainView.ScriptActionTableModel import ScriptActionTableModel, COLUMNS
 from Model.ScriptActionDescription import ScriptActionDescription
+from Parser.ScriptActionDescriptionParser import ScriptActionDescriptionParserProtocol
 
 
+# data holds descriptions or actions, actions are described when displayed
 @inject(use_factory=True)
 class RecordScriptTableDataSource:
     
@@ -11,33 +14,50 @@ class RecordScriptTableDataSource:
     
     def __init__(self, data=None):
         self.data = data if data is not None else []
+        self.description_parser = di[ScriptActionDescriptionParserProtocol]
+        self.cached_row = -1 # The columns of a row are requested one after another
+        self.cached_entry = None
     
     # - Properties
     
     def count(self) -> int:
         return len(self.data)
     
-    def item(self, column, row) -> QTableWidgetItem:
+    def entry(self, row) -> ScriptActionDescription:
+        if row != self.cached_row:
+            value = self.data[row]
+            self.cached_entry = value if isinstance(value, ScriptActionDescription) else self.description_parser.parse(value)
+            self.cached_row = row
+        
+        return self.cached_entry
+    
+    def text(self, column, row) -> str:
         assert column <= 2
         
-        entry: ScriptActionDescription = self.data[row]
+        entry = self.entry(row)
         
         match column:
-            case 0: return QTableWidgetItem(entry.timestamp)
-            case 1: return QTableWidgetItem(entry.type)
-            case 2: return QTableWidgetItem(entry.value)
+            case 0: return entry.timestamp
+            case 1: return entry.type
+            case 2: return entry.value
+    
+    # - Actions
+    
+    def invalidate(self):
+        self.cached_row = -1
+        self.cached_entry = None
 
 
-class RecordScriptTable(QTableWidget):
-    COLUMNS = 3
+class RecordScriptTable(QTableView):
+    COLUMNS = COLUMNS
     
     # - Init
     
     def __init__(self, parent=None):
         super(RecordScriptTable, self).__init__(parent)
         self.data_source = di[RecordScriptTableDataSource]
-        self.setColumnCount(RecordScriptTable.COLUMNS)
-        self.setRowCount(0)
+        self.table_model = ScriptActionTableModel(self.data_source, self)
+        self.setModel(self.table_model)
         self.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSelectionMode(QAbstractItemView.SingleSelection)
@@ -48,21 +68,39 @@ class RecordScriptTable(QTableWidget):
     # - Properties
     
     def get_data_source(self) -> RecordScriptTableDataSource: return self.data_source
-    def set_data_source(self, data_source): self.data_source = data_source
+    
+    def set_data_source(self, data_source):
+        self.data_source = data_source
+        self.table_model.set_data_source(data_source)
+    
+    def current_row(self) -> int:
+        return self.currentIndex().row()
     
     # - Setup
     
     def update_data(self):
         if self.data_source is not None:
-            current_selection = self.currentIndex().row()
+            current_selection = self.current_row()
             
-            self.setRowCount(self.data_source.count())
-            
-            for row in range(0, self.data_source.count()):
-                for column in range(0, self.COLUMNS):
-                    self.setItem(row, column, self.data_source.item(column, row))
+            self.table_model.reload()
             
             if self.data_source.count() > 0:
                 current_selection = 0 if current_selection < 0 else current_selection
                 new_index = current_selection if current_selection < self.data_source.count() else self.data_source.count() - 1
                 self.selectRow(new_index)
+    
+    # Replaces the first removed_count rows with the given entries, the last entry becomes the first row
+    # Only the changed rows are updated
+    def prepend_data(self, removed_count, entries):
+        if self.data_source is None:
+            return
+        
+        current_selection = self.current_row()
+        
+        self.table_model.remove_entries(0, removed_count)
+        self.table_model.insert_entries(0, list(reversed(entries)))
+        
+        # Same as update_data, the selection stays at the same row
+        if self.data_source.count() > 0:
+            current_selection = 0 if current_selection < 0 else current_selection
+            self.selectRow(min(current_selection, self.data_source.count() - 1))
@@ -8,6 +8,7 @@ class RecordScriptWidgetProtocol(Protocol):
     def stop_recording(self, sender): pass
     def disable_save_recording(self): pass
     def set_events_data(self, data): pass
+    def add_events_data(self, removed_count, data): pass
     def on_script_save(self): pass
 
 
@@ -55,7 +56,7 @@ class RecordScriptWidget(QWidget):
     def get_delegate(self) -> RecordWidgetDelegate: return self.delegate
     def set_delegate(self, delegate): self.delegate = delegate
     def get_data_source(self) -> RecordScriptTableDataSource: return self.table.data_source
-    def set_data_source(self, data_source): self.table.data_source = data_source
+    def set_data_source(self, data_source): self.table.set_data_source(data_source)
     
     # - Actions
     
@@ -101,5 +102,9 @@ class RecordScriptWidget(QWidget):
         self.get_data_source().data = data
         self.table.update_data()
     
+    # The newest events are shown first: removed_count rows are replaced at the top by the given data (oldest first)
+    def add_events_data(self, removed_count, data):
+        self.table.prepend_data(removed_count, data)
+    
     def on_script_save(self):
         self.config_button.setEnabled(False)
@@ -0,0 +1,65 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+COLUMNS = 3
+
+
+# Table model shared by the record, run and edit tables
+# Cells are formatted on demand, only for the rows that are displayed
+# data_source: RecordScriptTableDataSource
+class ScriptActionTableModel(QAbstractTableModel):
+    
+    # - Init
+    
+    def __init__(self, data_source, parent=None):
+        super(ScriptActionTableModel, self).__init__(parent)
+        self.data_source = data_source
+    
+    # - Properties
+    
+    def get_data_source(self): return self.data_source
+    
+    def set_data_source(self, data_source):
+        self.beginResetModel()
+        self.data_source = data_source
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self.data_source is None:
+            return 0
+        
+        return self.data_source.count()
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else COLUMNS
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        
+        return self.data_source.text(index.column(), index.row())
+    
+    # - Actions
+    
+    # The whole data source changed
+    def reload(self):
+        self.beginResetModel()
+        self.data_source.invalidate()
+        self.endResetModel()
+    
+    def insert_entries(self, row, entries):
+        if len(entries) == 0:
+            return
+        
+        self.beginInsertRows(QModelIndex(), row, row + len(entries) - 1)
+        self.data_source.data[row:row] = entries
+        self.data_source.invalidate()
+        self.endInsertRows()
+    
+    def remove_entries(self, row, count):
+        if count == 0:
+            return
+        
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self.data_source.data[row:row + count]
+        self.data_source.invalidate()
+        self.endRemoveRows()
@@ -7,6 +7,7 @@ from Service.SettingsManager import SettingsManagerField, SettingsManagerProtoco
 from kink import di
 from Service.ThreadWorkerManager import ThreadWorkerManagerProtocol
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 from Utilities.Threading import run_in_background, run_in_background_with_result
 
 THREAD_WORKER_READ_LABEL = 'read'
@@ -27,7 +28,7 @@ class SettingsPresenter(Presenter):
         self.router = None
         self.widget = None
         self.settings = di[SettingsManagerProtocol]
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.UI)
         self.thread_worker_manager = di[ThreadWorkerManagerProtocol]
     
     # - Properties
@@ -84,6 +85,16 @@ class SettingsPresenter(Presenter):
         self.widget.setup_field(pause_hotkey, KeyboardKeyParser.key_to_string(self.settings.field_value(pause_hotkey)))
         record_hotkey = SettingsManagerField.RECORD_HOTKEY
         self.widget.setup_field(record_hotkey, KeyboardKeyParser.key_to_string(self.settings.field_value(record_hotkey)))
+        
+        for parameter in (SettingsManagerField.RECORD_MOVE_INTERVAL,
+                          SettingsManagerField.RECORD_MOVE_DISTANCE,
+                          SettingsManagerField.RECORD_PATH_TOLERANCE,
+                          SettingsManagerField.COMMAND_TIMEOUT):
+            self.widget.setup_field(parameter, f'{self.settings.field_value(parameter):g}')
+        
+        for parameter in (SettingsManagerField.RECORD_TO_JOURNAL,
+                          SettingsManagerField.PLAYBACK_TIMING_REPORT):
+            self.widget.setup_field(parameter, 'true' if self.settings.field_value(parameter) else 'false')
     
     def save_settings(self):
         if self.thread_worker_manager.is_running_worker(THREAD_WORKER_WRITE_LABEL):
@@ -106,3 +117,24 @@ class SettingsPresenter(Presenter):
             assert False # bad logic
         
         self.save_settings()
+    
+    def assign_value(self, parameter: SettingsManagerField, value: str):
+        if parameter.is_flag():
+            self.settings.set_field_value(parameter, value)
+            self.save_settings()
+            return
+        
+        assert parameter.is_number()
+        
+        try:
+            number = float(value)
+        except ValueError:
+            number = -1
+        
+        if number < 0:
+            self.logger.warning(f'Invalid value {value} for {parameter}')
+            self.widget.setup_field(parameter, f'{self.settings.field_value(parameter):g}')
+            return
+        
+        self.settings.set_field_value(parameter, f'{number:g}')
+        self.save_settings()
@@ -1,3 +1,4 @@
+from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtWidgets import *
 from typing import Protocol
 from Service.SettingsManager import SettingsManagerField
@@ -10,6 +11,7 @@ class SettingsWidgetProtocol(Protocol):
 class SettingsWidgetDelegate(Protocol):
     def save_settings(self): pass
     def assign_hotkey(self, sender): pass
+    def assign_value(self, parameter: SettingsManagerField, value: str): pass
 
 
 class SettingsWidget(QWidget):
@@ -50,8 +52,46 @@ class SettingsWidget(QWidget):
         record_layout.addWidget(self.record_hotkey_button)
         self.record_hotkey_button.clicked.connect(self.on_record_hotkey)
         
+        recording_label = QLabel('Recording')
+        layout.addWidget(recording_label)
+        
+        self.move_interval_field = self.add_number_field(layout, 'Min mouse move interval (seconds, 0 = off)',
+                                                         SettingsManagerField.RECORD_MOVE_INTERVAL)
+        self.move_distance_field = self.add_number_field(layout, 'Min mouse move distance (pixels, 0 = off)',
+                                                         SettingsManagerField.RECORD_MOVE_DISTANCE)
+        self.path_tolerance_field = self.add_number_field(layout, 'Mouse path tolerance (pixels, 0 = off)',
+                                                          SettingsManagerField.RECORD_PATH_TOLERANCE)
+        
+        self.journal_checkbox = self.add_flag_field(layout, 'Write recorded events to disk while recording',
+                                                    SettingsManagerField.RECORD_TO_JOURNAL)
+        
+        playback_label = QLabel('Playback')
+        layout.addWidget(playback_label)
+        
+        self.timing_report_checkbox = self.add_flag_field(layout, 'Write a timing report of every run to the scripts folder',
+                                                          SettingsManagerField.PLAYBACK_TIMING_REPORT)
+        self.command_timeout_field = self.add_number_field(layout, 'Command timeout (seconds, 0 = no limit)',
+                                                           SettingsManagerField.COMMAND_TIMEOUT)
+        
         self.setLayout(layout)
     
+    def add_number_field(self, layout, title, parameter: SettingsManagerField) -> QLineEdit:
+        field_layout = QHBoxLayout()
+        layout.addLayout(field_layout)
+        field_label = QLabel(title)
+        field_layout.addWidget(field_label)
+        field = QLineEdit()
+        field.setValidator(QDoubleValidator(0, 10000, 3))
+        field_layout.addWidget(field)
+        field.editingFinished.connect(lambda: self.on_value_changed(parameter, field.text()))
+        return field
+    
+    def add_flag_field(self, layout, title, parameter: SettingsManagerField) -> QCheckBox:
+        field = QCheckBox(title)
+        layout.addWidget(field)
+        field.clicked.connect(lambda checked: self.on_value_changed(parameter, 'true' if checked else 'false'))
+        return field
+    
     # - Properties
     
     def get_delegate(self) -> SettingsWidgetDelegate: return self.delegate
@@ -65,6 +105,18 @@ class SettingsWidget(QWidget):
                 self.pause_hotkey_button.setText(value)
             case SettingsManagerField.RECORD_HOTKEY:
                 self.record_hotkey_button.setText(value)
+            case SettingsManagerField.RECORD_MOVE_INTERVAL:
+                self.move_interval_field.setText(value)
+            case SettingsManagerField.RECORD_MOVE_DISTANCE:
+                self.move_distance_field.setText(value)
+            case SettingsManagerField.RECORD_PATH_TOLERANCE:
+                self.path_tolerance_field.setText(value)
+            case SettingsManagerField.RECORD_TO_JOURNAL:
+                self.journal_checkbox.setChecked(value == 'true')
+            case SettingsManagerField.PLAYBACK_TIMING_REPORT:
+                self.timing_report_checkbox.setChecked(value == 'true')
+            case SettingsManagerField.COMMAND_TIMEOUT:
+                self.command_timeout_field.setText(value)
     
     # - Actions
     
@@ -76,3 +128,6 @@ class SettingsWidget(QWidget):
     
     def on_record_hotkey(self):
         self.delegate.assign_hotkey(SettingsManagerField.RECORD_HOTKEY)
+    
+    def on_value_changed(self, parameter: SettingsManagerField, value):
+        self.delegate.assign_value(parameter, value)
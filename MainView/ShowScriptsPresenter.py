@@ -1,17 +1,22 @@
+import threading
 from typing import Protocol
+from PyQt5.QtCore import pyqtSignal
 from kink import di
 
 from Dialog.Dialog import Dialog, build_error_dialog
 from Model.ScriptData import ScriptData
+from Model.ScriptDirectoryChanges import ScriptDirectoryChanges
 from Model.ScriptSummary import ScriptSummary
 from Presenter.Presenter import Presenter
 from MainView.ShowScriptsWidget import ShowScriptsWidgetProtocol
 from Provider.ScriptDataProvider import ScriptDataProvider
-from Service.ScriptStorage import ScriptStorage
+from Service.ScriptCatalog import ScriptCatalog, ScriptCatalogSort
+from Service.ScriptDirectoryWatcher import ScriptDirectoryWatcher
+from Service.ScriptStorage import SCRIPT_FILE_FORMATS
 from Service.SettingsManager import SettingsManagerField, SettingsManagerProtocol
 from Service.ThreadWorkerManager import ThreadWorkerManagerProtocol
-from Utilities import Path as PathUtils
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 from Utilities.Rect import Rect
 from Utilities.Threading import run_in_background_with_result
 
@@ -26,6 +31,9 @@ class ShowScriptsWidgetRouter(Protocol):
 
 class ShowScriptsPresenter(Presenter):
     
+    # Emitted from the loading thread when more scripts are read, delivered on the main thread
+    signal_progress = pyqtSignal(name='ShowScriptsPresenter.update_visible_scripts')
+    
     # - Init
     
     def __init__(self):
@@ -34,9 +42,19 @@ class ShowScriptsPresenter(Presenter):
         self.widget = None
         self.router = None
         self.working_dir = settings.field_value(SettingsManagerField.SCRIPTS_PATH)
-        self.file_format = settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)
-        self.scripts = []
-        self.logger = di[LoggerProtocol]
+        self.file_formats = SCRIPT_FILE_FORMATS # Scripts of every format are listed
+        self.catalog = ScriptCatalog(self.working_dir, self.file_formats)
+        self.filter_text = ''
+        self.sort = ScriptCatalogSort.NAME
+        self.scripts = [] # Visible scripts, filtered and sorted
+        self.watcher = ScriptDirectoryWatcher(self.working_dir, self.file_formats)
+        self.watcher.set_delegate(self)
+        self.changed_file_names = set() # Reported by the watcher while the catalog was updating
+        self.cancel_event = threading.Event() # Set when the tab is left while loading
+        self.active = False
+        self.reload_needed = True
+        self.signal_progress.connect(self.update_visible_scripts)
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.UI)
         self.thread_worker_manager = di[ThreadWorkerManagerProtocol]
     
     # - Property
@@ -49,7 +67,14 @@ class ShowScriptsPresenter(Presenter):
     # - Setup
     
     def setup(self):
-        self.reload_data()
+        self.widget.set_sort_options([sort.title() for sort in ScriptCatalogSort], self.sort)
+        
+        # Full reload once, then the watcher reports the changes, also while the tab is hidden
+        if not self.watcher.is_running():
+            self.watcher.start()
+        
+        if self.reload_needed:
+            self.reload_data()
     
     # - Actions
     
@@ -57,51 +82,83 @@ class ShowScriptsPresenter(Presenter):
         assert self.widget is not None
         
         self.logger.info('start presenter')
+        self.active = True
         self.setup()
     
+    # Loading is cancelled, the scripts not read yet are read when the tab is shown again
+    def stop(self):
+        self.active = False
+        
+        if self.thread_worker_manager.is_running_worker(THREAD_WORKER_RELOAD_LABEL):
+            self.logger.info('cancel loading script data')
+            self.cancel_event.set()
+            self.reload_needed = True
+    
     def reload_data(self):
         if self.thread_worker_manager.is_running_worker(THREAD_WORKER_RELOAD_LABEL):
             return
         
         self.logger.info('reloading data...')
         
+        self.reload_needed = False
+        self.cancel_event.clear()
+        
         worker = run_in_background_with_result(self._load_scripts_data_in_background,
                                                self._finish_loading_scripts_data)
         self.thread_worker_manager.add_worker(worker, THREAD_WORKER_RELOAD_LABEL)
     
+    # Only the scripts changed since the last reload are read, the others come from the catalog
+    # The list is updated as the scripts are read
     def _load_scripts_data_in_background(self):
-        result = []
-        
-        file_list = PathUtils.directory_file_list(self.working_dir, self.file_format)
+        self.catalog.update(self.signal_progress.emit, self.cancel_event)
+        return self.catalog.count()
+    
+    def _finish_loading_scripts_data(self, result):
+        self.thread_worker_manager.remove_worker(THREAD_WORKER_RELOAD_LABEL)
         
-        script_names = []
+        self.logger.info(f'finished loading script data, found {result} scripts in work directory')
         
-        for file_path in file_list:
-            storage = ScriptStorage(file_path)
-            
-            try:
-                script_summary = storage.read_script_summary_from_file()
-                name = script_summary.get_info().name
-                script_names.append(name)
-                result.append(script_summary)
-            except Exception:
-                pass
+        self.update_visible_scripts()
         
-        return result
+        if self.active and self.reload_needed:
+            self.reload_data() # Shown again while a cancelled load was ending
+        else:
+            self.update_changed_scripts()
     
-    def _finish_loading_scripts_data(self, result):
-        self.thread_worker_manager.remove_worker(THREAD_WORKER_RELOAD_LABEL)
+    def update_changed_scripts(self):
+        if len(self.changed_file_names) == 0:
+            return
+        
+        if self.thread_worker_manager.is_running_worker(THREAD_WORKER_RELOAD_LABEL):
+            return # Updated when the running worker finishes
         
-        self.logger.info(f'finished loading script data, found {len(result)} scripts in work directory')
+        file_names = self.changed_file_names
+        self.changed_file_names = set()
         
-        self.scripts = result
+        self.logger.info(f'updating {len(file_names)} changed scripts...')
+        
+        self.cancel_event.clear()
+        
+        worker = run_in_background_with_result(self._update_scripts_data_in_background,
+                                               self._finish_loading_scripts_data,
+                                               process_with_param=file_names)
+        self.thread_worker_manager.add_worker(worker, THREAD_WORKER_RELOAD_LABEL)
+    
+    def _update_scripts_data_in_background(self, file_names):
+        self.catalog.update_files(file_names, self.signal_progress.emit, self.cancel_event)
+        return self.catalog.count()
+    
+    # Filters and sorts the catalog, no file is read
+    def update_visible_scripts(self):
+        entries = self.catalog.query(self.filter_text, self.sort)
+        self.scripts = [entry.summary for entry in entries]
         
-        script_names = []
+        rows = []
         
-        for script in self.scripts:
-            script_names.append(script.get_info().name)
+        for entry in entries:
+            rows.append([entry.name(), str(entry.event_count), f'{entry.duration:.1f}s'])
         
-        self.widget.set_data(script_names)
+        self.widget.set_data(rows)
     
     def _finish_opening_script(self, result: ScriptData):
         self.thread_worker_manager.remove_worker(THREAD_WORKER_READ_LABEL)
@@ -116,6 +173,20 @@ class ShowScriptsPresenter(Presenter):
     
     def can_open_script(self, item) -> bool: return True
     
+    def set_filter_text(self, text):
+        self.filter_text = text
+        self.update_visible_scripts()
+    
+    def set_sort(self, index):
+        self.sort = ScriptCatalogSort(index)
+        self.update_visible_scripts()
+    
+    # - ScriptDirectoryWatcherDelegate
+    
+    def on_scripts_changed(self, sender, changes: ScriptDirectoryChanges):
+        self.changed_file_names |= changes.file_names()
+        self.update_changed_scripts()
+    
     def open_script(self, index):
         assert index >= 0 and index < len(self.scripts)
         
@@ -1,7 +1,10 @@
 from PyQt5.QtWidgets import *
 from kink import inject, di
 
+COLUMN_TITLES = ['Name', 'Events', 'Duration']
 
+
+# data is a list of rows, one value per column
 @inject(use_factory=True)
 class ShowScriptsTableDataSource:
     
@@ -15,8 +18,11 @@ class ShowScriptsTableDataSource:
     def count(self) -> int:
         return len(self.data)
     
-    def item(self, index) -> QTableWidgetItem:
-        return QTableWidgetItem(self.data[index])
+    def name(self, index) -> str:
+        return self.data[index][0]
+    
+    def item(self, index, column) -> QTableWidgetItem:
+        return QTableWidgetItem(self.data[index][column])
 
 
 class ShowScriptsTable(QTableWidget):
@@ -26,13 +32,14 @@ class ShowScriptsTable(QTableWidget):
     def __init__(self, parent=None):
         super(ShowScriptsTable, self).__init__(parent)
         self.data_source = di[ShowScriptsTableDataSource]
-        self.setColumnCount(1)
+        self.setColumnCount(len(COLUMN_TITLES))
+        self.setHorizontalHeaderLabels(COLUMN_TITLES)
         self.setRowCount(0)
         self.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.horizontalHeader().setVisible(False)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
         self.verticalHeader().setVisible(False)
     
     # - Properties
@@ -47,7 +54,8 @@ class ShowScriptsTable(QTableWidget):
             self.setRowCount(self.data_source.count())
             
             for i in range(0, self.data_source.count()):
-                self.setItem(i, 0, self.data_source.item(i))
+                for column in range(0, len(COLUMN_TITLES)):
+                    self.setItem(i, column, self.data_source.item(i, column))
             
             if self.data_source.count() > 0:
                 self.selectRow(0)
@@ -4,15 +4,19 @@ from kink import di
 
 from MainView.ShowScriptsTable import ShowScriptsTableDataSource, ShowScriptsTable
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 
 
 class ShowScriptsWidgetProtocol(Protocol):
     def set_data(self, data): pass
+    def set_sort_options(self, titles, selected_index): pass
 
 
 class ShowScriptsWidgetDelegate(Protocol):
     def can_open_script(self, index) -> bool: pass
     def open_script(self, index): pass
+    def set_filter_text(self, text): pass
+    def set_sort(self, index): pass
 
 
 class ShowScriptsWidget(QWidget):
@@ -26,6 +30,20 @@ class ShowScriptsWidget(QWidget):
         
         layout = QVBoxLayout()
         
+        filter_layout = QHBoxLayout()
+        
+        self.filter_field = QLineEdit()
+        self.filter_field.setPlaceholderText('Filter')
+        self.filter_field.setClearButtonEnabled(True)
+        self.filter_field.textChanged.connect(self.on_filter_text_changed)
+        filter_layout.addWidget(self.filter_field)
+        
+        self.sort_field = QComboBox()
+        self.sort_field.currentIndexChanged.connect(self.on_sort_changed)
+        filter_layout.addWidget(self.sort_field)
+        
+        layout.addLayout(filter_layout)
+        
         self.table = ShowScriptsTable()
         layout.addWidget(self.table)
         
@@ -35,7 +53,7 @@ class ShowScriptsWidget(QWidget):
         
         self.setLayout(layout)
         
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.UI)
     
     # - Properties
     
@@ -44,9 +62,21 @@ class ShowScriptsWidget(QWidget):
     def get_data_source(self) -> ShowScriptsTableDataSource: return self.table.data_source
     def set_data_source(self, data_source): self.table.data_source = data_source
     
+    # Keeps the selected script selected
     def set_data(self, data):
+        selected_name = self.selected_item() if self.table.selectionModel().hasSelection() else None
         self.get_data_source().data = data
         self.update_data()
+        
+        if selected_name is not None:
+            self.select_item(selected_name)
+    
+    def set_sort_options(self, titles, selected_index):
+        self.sort_field.blockSignals(True)
+        self.sort_field.clear()
+        self.sort_field.addItems(titles)
+        self.sort_field.setCurrentIndex(selected_index)
+        self.sort_field.blockSignals(False)
     
     # - Actions
     
@@ -56,10 +86,16 @@ class ShowScriptsWidget(QWidget):
         return index
     
     def selected_item(self) -> str:
-        return self.get_data_source().data[self.selected_index()]
+        return self.get_data_source().name(self.selected_index())
+    
+    def select_item(self, name):
+        for index in range(0, self.get_data_source().count()):
+            if self.get_data_source().name(index) == name:
+                self.table.selectRow(index)
+                return
     
     def open_selected_script(self):
-        if self.delegate is not None:
+        if self.delegate is not None and self.table.selectionModel().hasSelection():
             name = self.selected_item()
             index = self.selected_index()
             
@@ -75,3 +111,11 @@ class ShowScriptsWidget(QWidget):
     
     def update_data(self):
         self.table.update_data()
+    
+    def on_filter_text_changed(self, text):
+        if self.delegate is not None:
+            self.delegate.set_filter_text(text)
+    
+    def on_sort_changed(self, index):
+        if self.delegate is not None and index >= 0:
+            self.delegate.set_sort(index)
@@ -3,6 +3,8 @@ from typing import Protocol, runtime_checkable
 
 @runtime_checkable
 class InputEvent(Protocol):
+    __slots__ = ()
+    
     def copy(self): return None
     
     def time(self): assert False
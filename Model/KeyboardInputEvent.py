@@ -7,6 +7,7 @@ FLOAT_ROUND_DECIMALS = 3
 
 
 class KeystrokeEvent(InputEvent):
+    __slots__ = ('timestamp', 'press', 'key')
     
     # - Init
     
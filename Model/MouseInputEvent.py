@@ -8,6 +8,7 @@ FLOAT_ROUND_DECIMALS = 3
 
 
 class MouseClickEvent(InputEvent):
+    __slots__ = ('timestamp', 'press', 'key', 'point')
     
     # - Init
     
@@ -59,11 +60,11 @@ class MouseClickEvent(InputEvent):
 
 
 class MouseMoveEvent(InputEvent):
-    timestamp = 0
-    point = Point(0, 0)
+    __slots__ = ('timestamp', 'point')
     
     def __init__(self, point):
         super(MouseMoveEvent, self).__init__()
+        self.timestamp = 0
         self.set_point(point)
     
     def time(self): return self.timestamp
@@ -81,12 +82,11 @@ class MouseMoveEvent(InputEvent):
 
 
 class MouseScrollEvent(InputEvent):
-    timestamp = 0
-    point = Point(0, 0)
-    scroll_dt = Point(0, 0)
+    __slots__ = ('timestamp', 'point', 'scroll_dt')
     
     def __init__(self, point, scroll_dt):
         super(MouseScrollEvent, self).__init__()
+        self.timestamp = 0
         self.set_point(point)
         self.set_scroll_dt(scroll_dt)
     
@@ -5,6 +5,8 @@ from Model.ScriptActionType import ScriptActionType
 
 
 class ScriptAction(Protocol):
+    __slots__ = ()
+    
     def copy(self): return None
     
     def time(self): assert False
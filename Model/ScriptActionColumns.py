@@ -0,0 +1,195 @@
+from array import array
+from Model.InputEvent import InputEvent
+from Model.KeyPressType import KeyPressType
+from Model.KeyboardInputEvent import KeystrokeEvent
+from Model.MouseInputEvent import MouseClickEvent, MouseMoveEvent, MouseScrollEvent
+from Model.ScriptAction import ScriptAction
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptInputEventAction import ScriptInputEventAction
+from Utilities.Point import Point
+
+NO_KEY = -1
+
+# Type codes of the input event actions, any other action is kept as an object
+INPUT_ACTION_TYPES = (ScriptActionType.KEYBOARD_PRESS,
+                      ScriptActionType.KEYBOARD_RELEASE,
+                      ScriptActionType.KEYBOARD_CLICK,
+                      ScriptActionType.MOUSE_PRESS,
+                      ScriptActionType.MOUSE_RELEASE,
+                      ScriptActionType.MOUSE_CLICK,
+                      ScriptActionType.MOUSE_MOVE,
+                      ScriptActionType.MOUSE_SCROLL)
+OTHER_TYPE_CODE = len(INPUT_ACTION_TYPES)
+TYPE_CODES = {action_type: code for code, action_type in enumerate(INPUT_ACTION_TYPES)}
+
+PRESS_TYPES = {
+    ScriptActionType.KEYBOARD_PRESS: KeyPressType.PRESS,
+    ScriptActionType.KEYBOARD_RELEASE: KeyPressType.RELEASE,
+    ScriptActionType.KEYBOARD_CLICK: KeyPressType.CLICK,
+    ScriptActionType.MOUSE_PRESS: KeyPressType.PRESS,
+    ScriptActionType.MOUSE_RELEASE: KeyPressType.RELEASE,
+    ScriptActionType.MOUSE_CLICK: KeyPressType.CLICK
+}
+
+
+# Compact, array backed sequence of actions
+# Input events are stored in parallel columns (time, type, x, y, dx, dy, key), other actions are stored as is
+# Action objects are created on access, so changing them does not change the columns
+class ScriptActionColumns:
+    
+    # - Init
+    
+    def __init__(self, actions: [ScriptAction] = None):
+        self.times = array('d')
+        self.types = array('B')
+        self.xs = array('d')
+        self.ys = array('d')
+        self.dxs = array('d')
+        self.dys = array('d')
+        self.keys = array('i')
+        self.key_table = [] # Key values, referenced by index from the keys column
+        self.key_ids = {}
+        self.others = {} # Non input actions, by index
+        
+        if actions is not None:
+            self.extend(actions)
+    
+    def copy(self):
+        result = ScriptActionColumns()
+        result.times = array('d', self.times)
+        result.types = array('B', self.types)
+        result.xs = array('d', self.xs)
+        result.ys = array('d', self.ys)
+        result.dxs = array('d', self.dxs)
+        result.dys = array('d', self.dys)
+        result.keys = array('i', self.keys)
+        result.key_table = self.key_table.copy()
+        result.key_ids = self.key_ids.copy()
+        result.others = {index: action.copy() for index, action in self.others.items()}
+        return result
+    
+    # - Properties
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.action(i) for i in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        
+        if not 0 <= index < len(self):
+            raise IndexError('action index out of range')
+        
+        return self.action(index)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.action(index)
+    
+    def time(self, index) -> float:
+        return self.times[index]
+    
+    def action_type(self, index) -> ScriptActionType:
+        code = self.types[index]
+        return INPUT_ACTION_TYPES[code] if code != OTHER_TYPE_CODE else self.others[index].action_type()
+    
+    # Approximate size (in bytes) of the stored data
+    def memory_size(self) -> int:
+        columns = (self.times, self.types, self.xs, self.ys, self.dxs, self.dys, self.keys)
+        return sum(column.itemsize * len(column) for column in columns)
+    
+    def to_list(self) -> [ScriptAction]:
+        return [self.action(index) for index in range(len(self))]
+    
+    # New columns with only the rows at the given (ascending) indices
+    def select(self, indices):
+        result = ScriptActionColumns()
+        result.times = array('d', (self.times[index] for index in indices))
+        result.types = array('B', (self.types[index] for index in indices))
+        result.xs = array('d', (self.xs[index] for index in indices))
+        result.ys = array('d', (self.ys[index] for index in indices))
+        result.dxs = array('d', (self.dxs[index] for index in indices))
+        result.dys = array('d', (self.dys[index] for index in indices))
+        result.keys = array('i', (self.keys[index] for index in indices))
+        result.key_table = self.key_table.copy()
+        result.key_ids = self.key_ids.copy()
+        result.others = {new_index: self.others[index] for new_index, index in enumerate(indices) if index in self.others}
+        return result
+    
+    # - Actions
+    
+    def append(self, action: ScriptAction):
+        if isinstance(action, ScriptInputEventAction):
+            self.append_event(action.get_event(), action.action_type())
+        else:
+            self.others[len(self.times)] = action
+            self.append_values(OTHER_TYPE_CODE, action.time())
+    
+    def extend(self, actions: [ScriptAction]):
+        for action in actions:
+            self.append(action)
+    
+    def append_event(self, event: InputEvent, action_type: ScriptActionType):
+        code = TYPE_CODES[action_type]
+        
+        if isinstance(event, KeystrokeEvent):
+            self.append_values(code, event.time(), key=event.key_value())
+        elif isinstance(event, MouseClickEvent):
+            self.append_values(code, event.time(), event.point.x, event.point.y, key=event.key_value())
+        elif isinstance(event, MouseMoveEvent):
+            self.append_values(code, event.time(), event.point.x, event.point.y)
+        elif isinstance(event, MouseScrollEvent):
+            self.append_values(code, event.time(), event.point.x, event.point.y, event.scroll_dt.x, event.scroll_dt.y)
+        else:
+            assert False
+    
+    def append_values(self, code: int, time: float, x=0.0, y=0.0, dx=0.0, dy=0.0, key=None):
+        self.times.append(time)
+        self.types.append(code)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.dxs.append(dx)
+        self.dys.append(dy)
+        self.keys.append(self.key_id(key) if key is not None else NO_KEY)
+    
+    # - Helpers
+    
+    def key_id(self, key) -> int:
+        result = self.key_ids.get(key)
+        
+        if result is None:
+            result = len(self.key_table)
+            self.key_table.append(key)
+            self.key_ids[key] = result
+        
+        return result
+    
+    def point(self, xs, ys, index) -> Point:
+        return Point(coordinate(xs[index]), coordinate(ys[index]))
+    
+    def action(self, index) -> ScriptAction:
+        code = self.types[index]
+        
+        if code == OTHER_TYPE_CODE:
+            return self.others[index]
+        
+        action_type = INPUT_ACTION_TYPES[code]
+        
+        if action_type.is_keyboard():
+            event = KeystrokeEvent(PRESS_TYPES[action_type], self.key_table[self.keys[index]])
+        elif action_type == ScriptActionType.MOUSE_MOVE:
+            event = MouseMoveEvent(self.point(self.xs, self.ys, index))
+        elif action_type == ScriptActionType.MOUSE_SCROLL:
+            event = MouseScrollEvent(self.point(self.xs, self.ys, index), self.point(self.dxs, self.dys, index))
+        else:
+            event = MouseClickEvent(PRESS_TYPES[action_type], self.key_table[self.keys[index]], self.point(self.xs, self.ys, index))
+        
+        return ScriptInputEventAction(action_type, event, self.times[index])
+
+
+# Whole coordinates are restored as int, as recorded
+def coordinate(value: float):
+    return int(value) if value.is_integer() else value
@@ -13,6 +13,7 @@ KEY_MESSAGE = "message"
 KEY_MESSAGE_NOTIFICATION = "notification"
 KEY_PATH = "path"
 KEY_COMMAND = "command"
+KEY_TIMEOUT = "timeout"
 
 
 def default_event_as_json(type, time=0) -> dict:
@@ -51,6 +52,7 @@ def default_event_as_json(type, time=0) -> dict:
         result[KEY_PATH] = 'snapshot'
     elif type == ScriptActionType.COMMAND:
         result[KEY_COMMAND] = ''
+        result[KEY_TIMEOUT] = 0
     else:
         assert False # ScriptAction implement: not implemented
     
@@ -0,0 +1,48 @@
+from Model.ScriptAction import ScriptAction
+from Model.ScriptActionColumns import ScriptActionColumns
+from Model.ScriptActions import ScriptActions
+from Model.ScriptActionType import ScriptActionType
+
+
+# Read only, ordered sequence of actions
+# Shared between all executions (repeats) of the same script, and walked with an index cursor
+class ScriptActionTimeline:
+    
+    # - Init
+    
+    def __init__(self, actions: ScriptActions):
+        # Columns are shared instead of copied, the actions must not be modified while the timeline is in use
+        self.data = actions.data if actions.is_columnar() else tuple(actions.data)
+        self.duration_time = actions.duration()
+    
+    # - Properties
+    
+    def count(self) -> int:
+        return len(self.data)
+    
+    def is_columnar(self) -> bool:
+        return not isinstance(self.data, tuple)
+    
+    # The shared columns, None when the actions are stored as objects
+    def columns(self) -> ScriptActionColumns:
+        return self.data if self.is_columnar() else None
+    
+    def action(self, index) -> ScriptAction:
+        return self.data[index]
+    
+    def time(self, index) -> float:
+        return self.data[index].time() if isinstance(self.data, tuple) else self.data.time(index)
+    
+    def action_type(self, index) -> ScriptActionType:
+        return self.data[index].action_type() if isinstance(self.data, tuple) else self.data.action_type(index)
+    
+    # Indices of the actions that are not input events (messages, nested scripts, commands...), in order
+    def other_indices(self) -> [int]:
+        if isinstance(self.data, tuple):
+            return [index for index, action in enumerate(self.data)
+                    if not action.action_type().is_keyboard() and not action.action_type().is_mouse()]
+        
+        return sorted(self.data.others.keys())
+    
+    def duration(self) -> float:
+        return self.duration_time
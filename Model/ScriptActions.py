@@ -1,12 +1,17 @@
 from dataclasses import dataclass
 from Model.ScriptAction import ScriptAction
+from Model.ScriptActionColumns import ScriptActionColumns
 
 
+# data is either a list of actions or, for large read only scripts, ScriptActionColumns
 @dataclass
 class ScriptActions:
     data: [ScriptAction]
     
     def copy(self):
+        if self.is_columnar():
+            return ScriptActions(self.data.copy())
+        
         result = []
         
         for action in self.data:
@@ -23,7 +28,16 @@ class ScriptActions:
     def duration(self) -> float:
         return self.data[self.count() - 1].time() if self.count() > 0 else 0
     
+    def is_columnar(self) -> bool:
+        return isinstance(self.data, ScriptActionColumns)
+    
+    # Converts the columns to a list of action objects, required before the actions are edited
+    def materialize(self):
+        if self.is_columnar():
+            self.data = self.data.to_list()
+    
     def sort(self):
+        self.materialize()
         self.data.sort()
     
     def reverse(self):
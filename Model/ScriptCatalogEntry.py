@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from Model.ScriptSummary import ScriptSummary
+
+
+# Summary of a script file, valid while the file modification time and size are unchanged
+@dataclass(frozen=True, slots=True)
+class ScriptCatalogEntry:
+    file_name: str
+    modified_time: int # ns
+    file_size: int # Bytes
+    summary: ScriptSummary
+    event_count: int
+    duration: float # Seconds
+    
+    def name(self) -> str:
+        return self.summary.get_info().name
+    
+    def is_valid_for(self, modified_time: int, file_size: int) -> bool:
+        return self.modified_time == modified_time and self.file_size == file_size
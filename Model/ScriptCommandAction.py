@@ -6,17 +6,20 @@ FLOAT_ROUND_DECIMALS = 3
 
 
 class ScriptCommandAction(ScriptAction):
+    __slots__ = ('timestamp', 'directory_path', 'command_value', 'timeout_value')
     
     # - Init
     
-    def __init__(self, directory: Path, command: str, time: float):
+    # timeout in seconds, 0 = the command timeout of the settings
+    def __init__(self, directory: Path, command: str, time: float, timeout=0):
         super(ScriptCommandAction, self).__init__()
         self.timestamp = time
         self.directory_path = directory
         self.command_value = command
+        self.timeout_value = timeout
     
     def copy(self):
-        result = ScriptCommandAction(self.directory(), self.command(), self.time())
+        result = ScriptCommandAction(self.directory(), self.command(), self.time(), self.timeout())
         return result
     
     # - Properties
@@ -39,6 +42,12 @@ class ScriptCommandAction(ScriptAction):
     def set_command(self, command: str):
         self.command_value = command
     
+    def timeout(self) -> float:
+        return self.timeout_value
+    
+    def set_timeout(self, value: float):
+        self.timeout_value = round(value, FLOAT_ROUND_DECIMALS)
+    
     def action_type(self) -> ScriptActionType:
         return ScriptActionType.COMMAND
     
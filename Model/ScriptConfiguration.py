@@ -6,22 +6,17 @@ JSON_NOTIFY_START = 'notify-start'
 JSON_NOTIFY_END = 'notify-end'
 
 
+# Immutable, use dataclasses.replace to change a value
+@dataclass(frozen=True, slots=True)
 class ScriptConfiguration:
+    repeat_count: int = 0
+    repeat_forever: bool = False
+    notify_on_start: bool = False
+    notify_on_end: bool = False
     
-    def __init__(self):
-        self.repeat_count = 0
-        self.repeat_forever = False
-        self.notify_on_start = False
-        self.notify_on_end = False
-    
+    # Copies share the same instance
     def copy(self):
-        result = ScriptConfiguration()
-        result.repeat_count = self.repeat_count
-        result.repeat_forever = self.repeat_forever
-        result.notify_on_start = self.notify_on_start
-        result.notify_on_end = self.notify_on_end
-        return result
+        return self
     
     def __cmp__(self):
         return self.copy()
-
@@ -6,6 +6,7 @@ from Utilities.Path import Path
 
 
 class ScriptData:
+    __slots__ = ('actions', 'summary')
     
     def __init__(self, actions=ScriptActions([]), summary=ScriptSummary()):
         self.actions = actions.copy()
@@ -14,10 +15,10 @@ class ScriptData:
     def get_actions(self) -> ScriptActions: return self.actions
     def set_actions(self, value): self.actions = value
     def get_summary(self) -> ScriptSummary: return self.summary.copy()
-    def get_info(self) -> ScriptInfo: return self.summary.info.copy()
-    def set_info(self, value): self.summary.info = value.copy()
-    def get_config(self) -> ScriptConfiguration: return self.summary.config.copy()
-    def set_config(self, value): self.summary.config = value.copy()
+    def get_info(self) -> ScriptInfo: return self.summary.info
+    def set_info(self, value): self.summary.info = value
+    def get_config(self) -> ScriptConfiguration: return self.summary.config
+    def set_config(self, value): self.summary.config = value
     def get_file_path(self) -> Path: return self.summary.get_file_path()
     def set_file_path(self, value): self.summary.set_file_path(value)
     
@@ -31,7 +32,7 @@ class ScriptData:
         return self.copy()
     
     def sort_actions(self):
-        self.actions.data.sort()
+        self.actions.sort()
     
     def update_modified_date(self):
-        self.summary.info.update_modified_date()
+        self.summary.info = self.summary.info.with_modified_date_updated()
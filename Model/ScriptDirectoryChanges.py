@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+
+
+# File names added, modified and removed in a scripts directory since the last scan
+@dataclass(frozen=True)
+class ScriptDirectoryChanges:
+    added: frozenset = frozenset()
+    modified: frozenset = frozenset()
+    removed: frozenset = frozenset()
+    
+    def is_empty(self) -> bool:
+        return len(self.added) == 0 and len(self.modified) == 0 and len(self.removed) == 0
+    
+    def count(self) -> int:
+        return len(self.added) + len(self.modified) + len(self.removed)
+    
+    def file_names(self) -> set:
+        return set(self.added) | set(self.modified) | set(self.removed)
+
+
+# Changes between two scans, given as {file name: (modification time, size)}
+def compare_scans(old: dict, new: dict) -> ScriptDirectoryChanges:
+    added = frozenset(name for name in new if name not in old)
+    removed = frozenset(name for name in old if name not in new)
+    modified = frozenset(name for name, values in new.items() if name in old and old[name] != values)
+    return ScriptDirectoryChanges(added, modified, removed)
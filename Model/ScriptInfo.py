@@ -1,3 +1,4 @@
+from dataclasses import dataclass, field, replace
 from Utilities import Logger
 
 
@@ -6,25 +7,18 @@ DEFAULT_SCRIPT_NAME = 'script'
 DEFAULT_SCRIPT_DESCRIPTION = ''
 
 
+# Immutable, use dataclasses.replace to change a value
+@dataclass(frozen=True, slots=True)
 class ScriptInfo:
+    version: str = CURRENT_VERSION
+    name: str = DEFAULT_SCRIPT_NAME
+    description: str = DEFAULT_SCRIPT_DESCRIPTION
+    date_created: str = field(default_factory=Logger.current_date)
+    date_modified: str = field(default_factory=Logger.current_date)
     
-    # - Init
-    
-    def __init__(self):
-        self.version = CURRENT_VERSION
-        self.name = DEFAULT_SCRIPT_NAME
-        self.description = DEFAULT_SCRIPT_DESCRIPTION
-        self.date_created = Logger.current_date()
-        self.date_modified = Logger.current_date()
-    
+    # Copies share the same instance
     def copy(self):
-        result = ScriptInfo()
-        result.version = self.version
-        result.name = self.name
-        result.description = self.description
-        result.date_created = self.date_created
-        result.date_modified = self.date_modified
-        return result
+        return self
     
     def __cmp__(self):
         return self.copy()
@@ -32,18 +26,13 @@ class ScriptInfo:
     # - Properties
     
     def get_version(self) -> str: return self.version
-    def set_version(self, version): self.version = version
     def get_name(self) -> str: return self.name
-    def set_name(self, name): self.name = name
     def get_description(self) -> str: return self.description
-    def set_description(self, description): self.description = description
     def get_date_created(self) -> str: return self.date_created
-    def set_date_created(self, date): self.date_created = date
     def get_date_modified(self) -> str: return self.date_modified
-    def set_date_modified(self, date): self.date_modified = date
     
     def is_name_default(self) -> bool:
         return self.name == DEFAULT_SCRIPT_NAME
     
-    def update_modified_date(self):
-        self.date_modified = Logger.current_date()
+    def with_modified_date_updated(self):
+        return replace(self, date_modified=Logger.current_date())
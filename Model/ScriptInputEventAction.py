@@ -4,6 +4,7 @@ from Model.ScriptActionType import ScriptActionType
 
 
 class ScriptInputEventAction(ScriptAction):
+    __slots__ = ('type', 'event')
     
     # - Init
     
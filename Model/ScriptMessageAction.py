@@ -5,6 +5,7 @@ FLOAT_ROUND_DECIMALS = 3
 
 
 class ScriptMessageAction(ScriptAction):
+    __slots__ = ('timestamp', 'message_string', 'notification')
     
     # - Init
     
@@ -7,6 +7,7 @@ FLOAT_ROUND_DECIMALS = 3
 NOOP_SCRIPT = '<noop>'
 
 class ScriptRunAction(ScriptAction):
+    __slots__ = ('timestamp', 'path')
     
     # - Init
     
@@ -59,6 +60,7 @@ class ScriptRunAction(ScriptAction):
 
 
 class NOOPScriptRunAction(ScriptRunAction):
+    __slots__ = ()
     
     # - Init
     
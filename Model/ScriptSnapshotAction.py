@@ -5,6 +5,7 @@ FLOAT_ROUND_DECIMALS = 3
 
 
 class ScriptSnapshotAction(ScriptAction):
+    __slots__ = ('timestamp', 'path')
     
     # - Init
     
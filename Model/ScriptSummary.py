@@ -4,17 +4,30 @@ from Utilities.Path import Path
 
 
 class ScriptSummary:
+    __slots__ = ('info', 'config', 'file_path', 'event_count', 'duration')
+    
+    # info and config are immutable, they are shared between copies
     def __init__(self, info=ScriptInfo(), config=ScriptConfiguration()):
-        self.info = info.copy()
-        self.config = config.copy()
+        self.info = info
+        self.config = config
         self.file_path = None
+        # Read from the script file header, None when unknown (not read, or the file predates them)
+        self.event_count = None
+        self.duration = None
     
     def copy(self):
-        result = ScriptSummary(self.info.copy(), self.config.copy())
+        result = ScriptSummary(self.info, self.config)
         result.file_path = self.file_path.copy() if self.file_path is not None else None
+        result.event_count = self.event_count
+        result.duration = self.duration
         return result
     
     def get_info(self) -> ScriptInfo: return self.info
     def get_config(self) -> ScriptConfiguration: return self.config
     def get_file_path(self) -> Path: return self.file_path
     def set_file_path(self, path): self.file_path = path.copy()
+    def get_event_count(self) -> int: return self.event_count
+    def get_duration(self) -> float: return self.duration
+    
+    def has_stats(self) -> bool:
+        return self.event_count is not None and self.duration is not None
@@ -8,7 +8,6 @@ from Model.ScriptActions import ScriptActions
 from Model.ScriptData import ScriptData
 from Model.ScriptInputEventAction import ScriptInputEventAction
 from OpenScriptView.EditScriptWidget import EditScriptWidgetProtocol
-from Parser.ScriptActionDescriptionParser import ScriptActionDescriptionParserProtocol
 from Parser.ScriptActionParser import ScriptActionParserProtocol
 from Presenter.Presenter import Presenter
 from Provider.ScriptDataProvider import ScriptDataProvider
@@ -39,11 +38,9 @@ class EditScriptPresenter(Presenter):
         self.router = None
         settings: SettingsManagerProtocol = di[SettingsManagerProtocol]
         self.action_parser = di[ScriptActionParserProtocol]
-        self.action_string_parser = di[ScriptActionDescriptionParserProtocol]
         self.file_format = settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)
         self.script_data = script_data.copy()
         self.script_provider = ScriptDataProvider(script_data.get_file_path())
-        self.action_descriptions = []
     
     # Properties
     
@@ -53,7 +50,10 @@ class EditScriptPresenter(Presenter):
     def set_router(self, router): self.router = router
     def get_file_format(self) -> str: return self.file_format
     def get_actions(self) -> ScriptActions: return self.script_data.get_actions()
-    def get_action_descriptions(self) -> []: return self.action_descriptions
+    def get_editable_actions(self) -> ScriptActions:
+        actions = self.get_actions()
+        actions.materialize() # Columnar actions are read only
+        return actions
     def get_script_data(self) -> ScriptData: return self.script_data.copy()
     def get_script_path(self) -> Path: return self.script_provider.get_file_path()
     
@@ -77,14 +77,10 @@ class EditScriptPresenter(Presenter):
     
     def update_data(self, script: ScriptData, completion=None):
         self.script_data = script
-        self.setup_action_descriptions(self.script_data.get_actions())
-        self.widget.set_events_data(self.action_descriptions)
+        self.widget.set_events_data(self.script_data.get_actions().data) # Described lazily by the table
         
         if completion is not None: completion()
     
-    def setup_action_descriptions(self, script_actions: ScriptActions):
-        self.action_descriptions = self.action_string_parser.parse_actions(script_actions)
-    
     def on_save(self):
         ScriptStorage(self.get_script_path()).write_script_data_to_file(self.script_data)
         self.update_data(self.script_data)
@@ -112,9 +108,9 @@ class EditScriptPresenter(Presenter):
         self.router.insert_script_action(self.widget, new_action)
     
     def delete_script_action(self, action_index):
-        actions_data = self.get_actions().data
+        actions_data = self.get_editable_actions().data
         actions_data.remove(actions_data[action_index])
-        self.script_data.events = ScriptActions(actions_data)
+        self.script_data.set_actions(ScriptActions(actions_data))
         self.update_data(self.script_data)
         self.widget.on_script_action_changed()
     
@@ -130,10 +126,10 @@ class EditScriptPresenter(Presenter):
         if input_event is None:
             return
         
-        actions_data = self.get_actions().data
+        actions_data = self.get_editable_actions().data
         actions_data.append(input_event)
-        self.script_data.events = ScriptActions(actions_data)
-        self.script_data.events.sort()
+        self.script_data.set_actions(ScriptActions(actions_data))
+        self.script_data.get_actions().sort()
         
         self.widget.on_script_action_changed()
         
@@ -145,7 +141,7 @@ class EditScriptPresenter(Presenter):
         if action is None:
             return
         
-        actions = self.get_actions()
+        actions = self.get_editable_actions()
         
         assert 0 <= action_index and action_index < actions.count()
         
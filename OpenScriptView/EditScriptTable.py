@@ -11,5 +11,5 @@ class EditScriptTableDataSource(RecordScriptTableDataSource):
 class EditScriptTable(RecordScriptTable):
     def __init__(self, parent=None):
         super(EditScriptTable, self).__init__(parent)
-        self.data_source = di[EditScriptTableDataSource]
+        self.set_data_source(di[EditScriptTableDataSource])
 
@@ -63,15 +63,15 @@ class EditScriptWidget(QWidget):
     def get_delegate(self) -> EditScriptWidgetDelegate: return self.delegate
     def set_delegate(self, delegate): self.delegate = delegate
     def get_data_source(self) -> EditScriptTableDataSource: return self.table.data_source
-    def set_data_source(self, data_source): self.table.data_source = data_source
+    def set_data_source(self, data_source): self.table.set_data_source(data_source)
     
     def set_events_data(self, data):
         data_source = self.get_data_source()
         data_source.data = data
         self.table.update_data()
         
-        self.delete_button.setEnabled(len(data_source.data) > 0)
-        self.edit_button.setEnabled(len(data_source.data) > 0)
+        self.delete_button.setEnabled(data_source.count() > 0)
+        self.edit_button.setEnabled(data_source.count() > 0)
     
     # - Actions
     
@@ -79,7 +79,7 @@ class EditScriptWidget(QWidget):
         self.table.selectRow(index)
     
     def select_next_index(self):
-        current_index = self.table.currentRow()
+        current_index = self.table.current_row()
         
         if current_index + 1 < self.get_data_source().count():
             self.table.selectRow(current_index + 1)
@@ -88,16 +88,16 @@ class EditScriptWidget(QWidget):
         self.save_button.setEnabled(True)
     
     def insert_event(self):
-        index = self.table.currentRow()
+        index = self.table.current_row()
         index = index if index >= 0 else 0
         self.delegate.insert_script_action(index)
     
     def delete_event(self):
-        self.delegate.delete_script_action(self.table.currentRow())
-        self.delete_button.setEnabled(len(self.get_data_source().data) > 0)
+        self.delegate.delete_script_action(self.table.current_row())
+        self.delete_button.setEnabled(self.get_data_source().count() > 0)
     
     def edit_event(self):
-        self.delegate.edit_script_action(self.table.currentRow())
+        self.delegate.edit_script_action(self.table.current_row())
     
     def save(self):
         self.save_button.setEnabled(False)
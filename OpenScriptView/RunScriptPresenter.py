@@ -1,11 +1,9 @@
-import time
 from kink import di
 from typing import Protocol
 from PyQt5.QtCore import QTimer
 
 from Model.ScriptActions import ScriptActions
 from Model.ScriptData import ScriptData
-from Parser.ScriptActionDescriptionParser import ScriptActionDescriptionParserProtocol
 from Presenter.Presenter import Presenter
 from Provider.ScriptDataProvider import ScriptDataProviderProtocol, ScriptDataProvider
 from Service.EventMonitor import KeyboardEventMonitor
@@ -13,7 +11,9 @@ from Service.ScriptStorage import ScriptStorage
 from Service.EventSimulatorManager import EventSimulatorManager
 from OpenScriptView.RunScriptWidget import RunScriptWidgetProtocol
 from Service.SettingsManager import SettingsManagerField, SettingsManagerProtocol
+from Utilities.Clock import ClockProtocol, ns_to_seconds
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 
 
 class RunScriptPresenterRouter(Protocol):
@@ -32,13 +32,13 @@ class RunScriptPresenter(Presenter):
         self.running = False
         self.simulator = None
         self.keyboard_monitor = di[KeyboardEventMonitor]
-        self.action_description_parser = di[ScriptActionDescriptionParserProtocol]
         self.settings = di[SettingsManagerProtocol]
         self.play_trigger_key = None
         self.pause_trigger_key = None
         
         # When used, the hotkey is suspended for a short period
-        self.hotkey_click_time = 0
+        self.clock = di[ClockProtocol]
+        self.hotkey_click_time = 0 # Capture time (in ns) of the last used hotkey
         self.hotkey_suspend_interval = 0.5
         
         self.file_format = self.settings.field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT)
@@ -50,7 +50,7 @@ class RunScriptPresenter(Presenter):
         self.update_timer.setInterval(100)
         self.update_timer.timeout.connect(self.update_events)
         
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.UI)
     
     # Property
     
@@ -60,7 +60,6 @@ class RunScriptPresenter(Presenter):
     def set_router(self, router): self.router = router
     def get_script(self) -> ScriptData: return self.script_data
     def get_script_actions(self) -> ScriptActions: return self.script_data.get_actions()
-    def get_script_actions_as_strings(self) -> []: return self.action_description_parser.parse_actions(self.get_script_actions())
     
     # Setup
     
@@ -98,7 +97,7 @@ class RunScriptPresenter(Presenter):
     
     def update_data(self, script: ScriptData, completion=None):
         self.script_data = script
-        self.widget.set_events_data(self.get_script_actions_as_strings())
+        self.widget.set_events_data(self.get_script_actions().data) # Described lazily by the table
         
         if completion is not None: completion()
     
@@ -169,7 +168,8 @@ class RunScriptPresenter(Presenter):
         self.router.enable_tabs(value)
     
     def on_key_press(self, event):
-        time_since_last_usage = time.time() - self.hotkey_click_time
+        capture_time = self.keyboard_monitor.get_capture_time()
+        time_since_last_usage = ns_to_seconds(capture_time - self.hotkey_click_time)
         
         if time_since_last_usage < self.hotkey_suspend_interval:
             self.logger.verbose_info('RunScriptPresenter hotkey pass')
@@ -193,7 +193,7 @@ class RunScriptPresenter(Presenter):
             return
         
         # Update timer only when hotkey is used
-        self.hotkey_click_time = time.time()
+        self.hotkey_click_time = capture_time
     
     def noop_on_key_press(self, key):
         pass
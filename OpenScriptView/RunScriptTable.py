@@ -11,5 +11,5 @@ class RunScriptTableDataSource(RecordScriptTableDataSource):
 class RunScriptTable(RecordScriptTable):
     def __init__(self, parent=None):
         super(RunScriptTable, self).__init__(parent)
-        self.data_source = di[RunScriptTableDataSource]
+        self.set_data_source(di[RunScriptTableDataSource])
 
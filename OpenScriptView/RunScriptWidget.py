@@ -5,6 +5,7 @@ from kink import di
 
 from OpenScriptView.RunScriptTable import RunScriptTable, RunScriptTableDataSource
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 
 
 class RunScriptWidgetProtocol(Protocol):
@@ -59,14 +60,14 @@ class RunScriptWidget(QWidget):
         
         self.setLayout(layout)
         
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.UI)
     
     # - Properties
     
     def get_delegate(self) -> RunScriptWidgetDelegate: return self.delegate
     def set_delegate(self, delegate): self.delegate = delegate
     def get_data_source(self) -> RunScriptTableDataSource: return self.table.data_source
-    def set_data_source(self, data_source): self.table.data_source = data_source
+    def set_data_source(self, data_source): self.table.set_data_source(data_source)
     
     # - Actions
     
@@ -137,10 +138,10 @@ class RunScriptWidget(QWidget):
         data_source.data = data
         self.table.update_data()
         
-        self.state_button.setEnabled(len(data_source.data) > 0)
+        self.state_button.setEnabled(data_source.count() > 0)
     
     def update_progress(self, index, percentage: int):
-        count = len(self.get_data_source().data)
+        count = self.get_data_source().count()
         
         #self.logger.debug(f'update_events index={index}/{count} progress={percentage}/100')
         
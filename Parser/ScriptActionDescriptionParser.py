@@ -16,9 +16,23 @@ class Grouping:
         return action.action_type() == self.type
 
 
+# Descriptions of a growing sequence of actions, along with the grouping progress
+class ScriptActionDescriptionState:
+    
+    def __init__(self, group_options: Grouping = None):
+        self.group_options = group_options
+        self.descriptions = []
+        self.previous_actions = [] # Last two described actions
+        self.action_count = 0
+    
+    def count(self) -> int:
+        return len(self.descriptions)
+
+
 class ScriptActionDescriptionParserProtocol(Protocol):
     def parse(self, action) -> ScriptActionDescription: pass
     def parse_actions(self, actions: ScriptActions, group_options: Grouping = None) -> [ScriptActionDescription]: pass
+    def parse_new_actions(self, state: ScriptActionDescriptionState, actions: ScriptActions) -> (int, [ScriptActionDescription]): pass
 
 
 @inject(use_factory=True, alias=ScriptActionDescriptionParserProtocol)
@@ -34,23 +48,37 @@ class ScriptActionDescriptionParser(ScriptActionDescriptionParserProtocol):
         return ScriptActionDescription(timestamp, type, value)
     
     def parse_actions(self, actions: ScriptActions, group_options: Grouping = None) -> [ScriptActionDescription]:
-        result = []
-        previous_events = []
+        state = ScriptActionDescriptionState(group_options)
+        self.parse_new_actions(state, actions)
+        return state.descriptions
+    
+    # Appends the descriptions of the given actions to the state
+    # Grouping may replace already described actions: returns how many of the old descriptions were removed
+    # from the end, and the descriptions that were appended in their place
+    def parse_new_actions(self, state: ScriptActionDescriptionState, actions: ScriptActions) -> (int, [ScriptActionDescription]):
+        result = state.descriptions
+        previous_events = state.previous_actions
+        group_options = state.group_options
         group_enabled = group_options is not None
         
+        initial_count = len(result)
+        unchanged_count = initial_count
+        
         for action in actions.data:
             
-            # Group logic
+            # Group logic, runs of matching actions are collapsed to their first and last action
             if group_enabled:
                 if group_options.match_action(action) and len(previous_events) >= 2:
                     if group_options.match_action(previous_events[0]) and group_options.match_action(previous_events[1]):
                         result.pop()
+                        unchanged_count = min(unchanged_count, len(result))
             
             if len(previous_events) >= 2:
                 previous_events.pop(0)
             
             result.append(self.parse(action))
             previous_events.append(action)
+            state.action_count += 1
         
-        return result
+        return initial_count - unchanged_count, result[unchanged_count:]
 
@@ -3,7 +3,9 @@ from kink import inject, di
 from Model import ScriptAction
 from Model.KeyPressType import KeyPressType
 from Model.KeyboardInputEvent import KeystrokeEvent
-from Model.MouseInputEvent import MouseMoveEvent, MouseClickEvent, MouseScrollEvent
+from Model.MouseInputEvent import MouseMoveEvent, MouseClickEvent, MouseScrollEvent, FLOAT_ROUND_DECIMALS
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES
+from pynput.mouse import Button as MouseKey
 from Model.ScriptCommandAction import ScriptCommandAction
 from Model.ScriptSnapshotAction import ScriptSnapshotAction
 from Service.SettingsManager import SettingsManagerProtocol, SettingsManagerField
@@ -13,11 +15,13 @@ from Model.ScriptActionType import ScriptActionType
 from Model.ScriptInputEventAction import ScriptInputEventAction
 from Model.ScriptMessageAction import ScriptMessageAction
 from Model.ScriptRunAction import ScriptRunAction, NOOPScriptRunAction, NOOP_SCRIPT
+from Parser.KeyboardKeyParser import string_to_key
 
 
 class ScriptActionParserProtocol(Protocol):
     def parse_to_json(self, action: ScriptAction) -> dict: pass
     def parse_to_action(self, json) -> ScriptAction: pass
+    def parse_to_columns(self, json, columns: ScriptActionColumns): pass
 
 
 @inject(use_factory=True, alias=ScriptActionParserProtocol)
@@ -66,6 +70,7 @@ class ScriptActionParser(ScriptActionParserProtocol):
             result[KEY_PATH] = action.file_name()
         elif isinstance(action, ScriptCommandAction):
             result[KEY_COMMAND] = action.command()
+            result[KEY_TIMEOUT] = action.timeout()
         else:
             assert False # ScriptAction implement: not implemented
         
@@ -121,8 +126,39 @@ class ScriptActionParser(ScriptActionParserProtocol):
                     settings = di[SettingsManagerProtocol]
                     directory = settings.field_value(SettingsManagerField.SCRIPTS_PATH)
                     result = ScriptCommandAction(directory, get_value(KEY_COMMAND), 0)
+                    result.set_timeout(float(json.get(KEY_TIMEOUT, 0))) # Missing in older scripts
                 case _:
                     assert False # # ScriptAction implement: not implemented or bad type
         
         result.set_time(float(get_value(KEY_TIME)))
         return result
+    
+    # Same as parse_to_action, but input events are written directly to the columns, without creating objects
+    def parse_to_columns(self, json, columns: ScriptActionColumns):
+        def get_value(key):
+            if key not in json:
+                raise ValueError(f"Bad script action json, key '{key}' not found")
+            return json[key]
+        
+        action_type = ScriptActionType(get_value(KEY_TYPE))
+        code = TYPE_CODES.get(action_type)
+        
+        if code is None:
+            columns.append(self.parse_to_action(json))
+            return
+        
+        def coordinate(key) -> float: return round(get_value(key), FLOAT_ROUND_DECIMALS)
+        
+        time = round(float(get_value(KEY_TIME)), FLOAT_ROUND_DECIMALS)
+        
+        match action_type:
+            case ScriptActionType.KEYBOARD_PRESS | ScriptActionType.KEYBOARD_RELEASE | ScriptActionType.KEYBOARD_CLICK:
+                columns.append_values(code, time, key=string_to_key(get_value(KEY_KEYSTROKE)))
+            case ScriptActionType.MOUSE_MOVE:
+                columns.append_values(code, time, coordinate(KEY_POINT_X), coordinate(KEY_POINT_Y))
+            case ScriptActionType.MOUSE_SCROLL:
+                columns.append_values(code, time, coordinate(KEY_POINT_X), coordinate(KEY_POINT_Y),
+                                      coordinate(KEY_POINT_DT_X), coordinate(KEY_POINT_DT_Y))
+            case _:
+                columns.append_values(code, time, coordinate(KEY_POINT_X), coordinate(KEY_POINT_Y),
+                                      key=MouseKey[get_value(KEY_KEYSTROKE)])
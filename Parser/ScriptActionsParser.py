@@ -1,6 +1,7 @@
 import json
 from typing import Protocol
 from kink import di, inject
+from Model.ScriptActionColumns import ScriptActionColumns
 from Model.ScriptActions import ScriptActions
 from Parser.ScriptActionParser import ScriptActionParserProtocol
 
@@ -8,7 +9,7 @@ from Parser.ScriptActionParser import ScriptActionParserProtocol
 class ScriptActionsParserProtocol(Protocol):
     def parse_to_json(self, actions: ScriptActions) -> str: pass
     def parse_to_list(self, actions: ScriptActions) -> list: pass
-    def parse_to_actions(self, json) -> ScriptActions: pass
+    def parse_to_actions(self, json, columnar=False) -> ScriptActions: pass
 
 
 @inject(use_factory=True, alias=ScriptActionsParserProtocol)
@@ -22,15 +23,23 @@ class ScriptActionsParser(ScriptActionsParserProtocol):
         return json.dumps(actions)
     
     def parse_to_list(self, actions: ScriptActions) -> list:
-        return list(map(lambda action: self.inner_parser.parse_to_json(action), actions.data.copy()))
+        return list(map(lambda action: self.inner_parser.parse_to_json(action), actions.data))
     
-    def parse_to_actions(self, data) -> ScriptActions:
+    def parse_to_actions(self, data, columnar=False) -> ScriptActions:
         if isinstance(data, str):
             data = json.loads(data)
         
         if not isinstance(data, list):
             raise ValueError("Bad given script actions data")
         
+        if columnar:
+            result = ScriptActionColumns()
+            
+            for item in data:
+                self.inner_parser.parse_to_columns(item, result)
+            
+            return ScriptActions(result)
+        
         result = []
         
         for item in data:
@@ -0,0 +1,197 @@
+import json
+import struct
+import sys
+from array import array
+from typing import Protocol
+from kink import inject, di
+from pynput.mouse import Button as MouseKey
+from Model.ScriptActionColumns import ScriptActionColumns, OTHER_TYPE_CODE
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Model.ScriptSummary import ScriptSummary
+from Parser.KeyboardKeyParser import key_to_string, string_to_key
+from Parser.ScriptActionParser import ScriptActionParserProtocol
+from Parser.ScriptDataParser import ScriptDataParserProtocol, JSON_INFO, JSON_CONFIGURATION
+
+# File layout, all values little endian:
+# header
+# metadata     JSON object with the info and configuration, same keys as the JSON format
+# strings      u32 byte length of every string, then the UTF-8 bytes of all strings
+# keys         i32 string index and u8 kind (keyboard or mouse) of every key
+# others       u32 action index and i32 string index of every non input action, stored as its JSON object
+# columns      f64 time, u8 type, f64 x, f64 y, f64 dx, f64 dy, i32 key of every action, one column after the other
+BINARY_MAGIC = b'MKYS'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHIIIIII') # magic, version, flags, metadata size, action count, string count, strings size, key count, other count
+
+KEY_KIND_KEYBOARD = 0
+KEY_KIND_MOUSE = 1
+
+SWAP_BYTES = sys.byteorder != 'little'
+
+
+class ScriptBinaryParserProtocol(Protocol):
+    def parse_to_bytes(self, script: ScriptData) -> bytes: pass
+    def parse_to_script(self, data: bytes, ignore_actions=False, columnar=False) -> ScriptData: pass
+
+
+def is_binary_script(data: bytes) -> bool:
+    return data[:len(BINARY_MAGIC)] == BINARY_MAGIC
+
+
+# Bytes to read to parse the summary (header and metadata), given at least the header
+def binary_summary_size(data: bytes) -> int:
+    if len(data) < BINARY_HEADER.size:
+        return BINARY_HEADER.size
+    
+    return BINARY_HEADER.size + BINARY_HEADER.unpack_from(data)[3]
+
+
+# Compact alternative to the JSON format, input events are stored as packed fixed width columns
+# that are loaded straight into ScriptActionColumns
+@inject(use_factory=True, alias=ScriptBinaryParserProtocol)
+class ScriptBinaryParser(ScriptBinaryParserProtocol):
+    
+    def __init__(self):
+        self.data_parser = di[ScriptDataParserProtocol]
+        self.action_parser = di[ScriptActionParserProtocol]
+    
+    def parse_to_bytes(self, script: ScriptData) -> bytes:
+        actions = script.get_actions()
+        columns = actions.data if actions.is_columnar() else ScriptActionColumns(actions.data)
+        
+        strings = []
+        
+        def add_string(value: str) -> int:
+            strings.append(value.encode('utf-8'))
+            return len(strings) - 1
+        
+        metadata = json.dumps({
+            JSON_INFO: self.data_parser.parse_script_info_to_dict(script.get_info(), actions),
+            JSON_CONFIGURATION: self.data_parser.parse_script_config_to_dict(script.get_config())
+        }).encode('utf-8')
+        
+        key_strings = array('i')
+        key_kinds = array('B')
+        
+        for key in columns.key_table:
+            if isinstance(key, MouseKey):
+                key_strings.append(add_string(key.name))
+                key_kinds.append(KEY_KIND_MOUSE)
+            else:
+                key_strings.append(add_string(key_to_string(key)))
+                key_kinds.append(KEY_KIND_KEYBOARD)
+        
+        other_indices = array('I', sorted(columns.others.keys()))
+        other_strings = array('i', (add_string(json.dumps(self.action_parser.parse_to_json(columns.others[index])))
+                                    for index in other_indices))
+        
+        string_lengths = array('I', (len(value) for value in strings))
+        strings_size = sum(string_lengths)
+        
+        header = BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, len(metadata), len(columns), len(strings), strings_size,
+                                    len(key_strings), len(other_indices))
+        
+        parts = [header, metadata, packed(string_lengths), b''.join(strings), packed(key_strings), packed(key_kinds),
+                 packed(other_indices), packed(other_strings)]
+        parts.extend(packed(column) for column in (columns.times, columns.types, columns.xs, columns.ys, columns.dxs,
+                                                   columns.dys, columns.keys))
+        return b''.join(parts)
+    
+    def parse_to_script(self, data: bytes, ignore_actions=False, columnar=False) -> ScriptData:
+        reader = BinaryReader(data)
+        
+        if len(data) < BINARY_HEADER.size or not is_binary_script(data):
+            raise ValueError("Bad binary script, no header")
+        
+        (_, version, _, metadata_size, action_count, string_count, strings_size,
+         key_count, other_count) = BINARY_HEADER.unpack(reader.read(BINARY_HEADER.size))
+        
+        if version > BINARY_VERSION:
+            raise ValueError(f"Unsupported binary script version {version}")
+        
+        metadata = json.loads(reader.read(metadata_size).decode('utf-8'))
+        
+        if ignore_actions:
+            summary = self.data_parser.parse_json_to_script_summary(metadata[JSON_INFO], metadata[JSON_CONFIGURATION])
+            return ScriptData(ScriptActions([]), summary)
+        
+        info = self.data_parser.parse_json_to_script_info(metadata[JSON_INFO])
+        config = self.data_parser.parse_json_to_script_config(metadata[JSON_CONFIGURATION])
+        summary = ScriptSummary(info, config)
+        
+        string_lengths = reader.read_array('I', string_count)
+        strings_data = reader.read(strings_size)
+        strings = []
+        offset = 0
+        
+        for length in string_lengths:
+            strings.append(strings_data[offset:offset + length].decode('utf-8'))
+            offset += length
+        
+        key_strings = reader.read_array('i', key_count)
+        key_kinds = reader.read_array('B', key_count)
+        other_indices = reader.read_array('I', other_count)
+        other_strings = reader.read_array('i', other_count)
+        
+        columns = ScriptActionColumns()
+        columns.times = reader.read_array('d', action_count)
+        columns.types = reader.read_array('B', action_count)
+        columns.xs = reader.read_array('d', action_count)
+        columns.ys = reader.read_array('d', action_count)
+        columns.dxs = reader.read_array('d', action_count)
+        columns.dys = reader.read_array('d', action_count)
+        columns.keys = reader.read_array('i', action_count)
+        
+        for string_index, kind in zip(key_strings, key_kinds):
+            value = strings[string_index]
+            key = MouseKey[value] if kind == KEY_KIND_MOUSE else string_to_key(value)
+            columns.key_ids.setdefault(key, len(columns.key_table))
+            columns.key_table.append(key)
+        
+        for index, string_index in zip(other_indices, other_strings):
+            if index >= action_count or columns.types[index] != OTHER_TYPE_CODE:
+                raise ValueError(f"Bad binary script, action {index} is not stored as an object")
+            
+            columns.others[index] = self.action_parser.parse_to_action(json.loads(strings[string_index]))
+        
+        actions = ScriptActions(columns if columnar else columns.to_list())
+        return ScriptData(actions, summary)
+
+
+def packed(values: array) -> bytes:
+    if not SWAP_BYTES or values.itemsize == 1:
+        return values.tobytes()
+    
+    result = array(values.typecode, values)
+    result.byteswap()
+    return result.tobytes()
+
+
+# Reads the sections of a binary script in order, failing on truncated data
+class BinaryReader:
+    
+    # - Init
+    
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+    
+    # - Actions
+    
+    def read(self, size) -> bytes:
+        if self.offset + size > len(self.data):
+            raise ValueError("Bad binary script, unexpected end of data")
+        
+        result = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return bytes(result)
+    
+    def read_array(self, typecode, count) -> array:
+        result = array(typecode)
+        result.frombytes(self.read(result.itemsize * count))
+        
+        if SWAP_BYTES and result.itemsize > 1:
+            result.byteswap()
+        
+        return result
@@ -9,6 +9,7 @@ from Model.ScriptInfo import ScriptInfo
 from Model.ScriptSummary import ScriptSummary
 from Parser.ScriptActionsParser import ScriptActionsParserProtocol
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 
 JSON_DEFAULT_ROOT = 'root'
 JSON_INFO = 'info'
@@ -22,6 +23,7 @@ JSON_DESCRIPTION = 'description'
 JSON_CDATE = 'date-created'
 JSON_MDATE = 'date-modified'
 JSON_EVENT_COUNT = 'event-count'
+JSON_DURATION = 'duration'
 JSON_REPEAT_COUNT = 'repeat-count'
 JSON_REPEAT_FOREVER = 'repeat-forever'
 JSON_NOTIFY_START = 'notify-start'
@@ -30,11 +32,19 @@ JSON_NOTIFY_END = 'notify-end'
 
 DEFAULT_INDENT = 2
 
+WHITESPACE = ' \t\n\r'
+
 
 class ScriptDataParserProtocol(Protocol):
     def parse_to_dict(self, script: ScriptData) -> dict: pass
     def parse_to_json(self, script: ScriptData) -> Any: pass
-    def parse_to_script(self, data, ignore_actions=False) -> ScriptData: pass
+    def parse_to_script(self, data, ignore_actions=False, columnar=False) -> ScriptData: pass
+    def parse_to_summary(self, text: str) -> ScriptSummary: pass
+    def parse_script_info_to_dict(self, info: ScriptInfo, actions: ScriptActions) -> dict: pass
+    def parse_json_to_script_info(self, data: dict) -> ScriptInfo: pass
+    def parse_script_config_to_dict(self, config: ScriptConfiguration) -> dict: pass
+    def parse_json_to_script_config(self, data: dict) -> ScriptConfiguration: pass
+    def parse_json_to_script_summary(self, info: dict, config: dict) -> ScriptSummary: pass
 
 
 @inject(use_factory=True, alias=ScriptDataParserProtocol)
@@ -43,17 +53,17 @@ class ScriptDataParser(ScriptDataParserProtocol):
     def __init__(self, root=JSON_DEFAULT_ROOT):
         self.root = root
         self.actions_parser = di[ScriptActionsParserProtocol]
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.STORAGE)
         self.indent = DEFAULT_INDENT
     
     def get_root(self) -> str: return self.root
     def set_root(self, value: str): self.root = value
     def get_indent(self) -> int: return self.indent
     def set_indent(self, value: int): self.indent = value
-
+    
     def parse_to_dict(self, script: ScriptData) -> dict:
         actions = self.actions_parser.parse_to_list(script.get_actions())
-        info = self.parse_script_info_to_dict(script.get_info(), script.get_actions().count())
+        info = self.parse_script_info_to_dict(script.get_info(), script.get_actions())
         config = self.parse_script_config_to_dict(script.get_config())
         return {
             self.root: {
@@ -67,7 +77,7 @@ class ScriptDataParser(ScriptDataParserProtocol):
         json_data = self.parse_to_dict(script)
         return json.dumps(json_data, indent=self.indent)
     
-    def parse_to_script(self, data, ignore_actions=False) -> ScriptData:
+    def parse_to_script(self, data, ignore_actions=False, columnar=False) -> ScriptData:
         if isinstance(data, str):
             try:
                 data = json.loads(data)
@@ -87,31 +97,98 @@ class ScriptDataParser(ScriptDataParserProtocol):
                 raise ValueError(f"Bad script json, key '{key}' not found")
             return contents[key]
         
-        actions = ScriptActions([]) if ignore_actions else self.actions_parser.parse_to_actions(get_value(JSON_ACTIONS))
+        if ignore_actions:
+            summary = self.parse_json_to_script_summary(get_value(JSON_INFO), get_value(JSON_CONFIGURATION))
+            return ScriptData(ScriptActions([]), summary)
+        
+        actions = self.actions_parser.parse_to_actions(get_value(JSON_ACTIONS), columnar=columnar)
         info = self.parse_json_to_script_info(get_value(JSON_INFO))
         config = self.parse_json_to_script_config(get_value(JSON_CONFIGURATION))
         summary = ScriptSummary(info, config)
         script = ScriptData(actions, summary)
         return script
     
-    def parse_script_info_to_dict(self, info: ScriptInfo, count: int) -> dict:
+    # Parses only the info and configuration, from the start of a script json
+    # The actions are written last, so the summary is usually found in the first few hundred bytes
+    # Returns None if the text ends before the summary, or if the actions come first and have to be parsed too
+    def parse_to_summary(self, text: str) -> ScriptSummary:
+        decoder = json.JSONDecoder()
+        index = 0
+        
+        def skip_whitespace():
+            nonlocal index
+            
+            while index < len(text) and text[index] in WHITESPACE:
+                index += 1
+        
+        # Returns False at the end of the text
+        def expect(characters) -> bool:
+            nonlocal index
+            skip_whitespace()
+            
+            if index >= len(text):
+                return False
+            
+            if text[index] not in characters:
+                raise ValueError("Bad script json")
+            
+            index += 1
+            return True
+        
+        def decode():
+            nonlocal index
+            skip_whitespace()
+            value, index = decoder.raw_decode(text, index)
+            return value
+        
+        values = {}
+        
+        try:
+            if not expect('{'):
+                return None
+            
+            if decode() != self.root:
+                raise ValueError("Bad script json, no root")
+            
+            if not expect(':') or not expect('{'):
+                return None
+            
+            while JSON_INFO not in values or JSON_CONFIGURATION not in values:
+                key = decode()
+                
+                if not expect(':'):
+                    return None
+                
+                if key != JSON_INFO and key != JSON_CONFIGURATION:
+                    return None
+                
+                values[key] = decode()
+                
+                if not expect(',}'):
+                    return None
+        except json.JSONDecodeError:
+            # Incomplete text
+            return None
+        
+        return self.parse_json_to_script_summary(values[JSON_INFO], values[JSON_CONFIGURATION])
+    
+    def parse_script_info_to_dict(self, info: ScriptInfo, actions: ScriptActions) -> dict:
         return {
             JSON_VERSION: info.version,
             JSON_NAME: info.name,
             JSON_DESCRIPTION: info.description,
             JSON_CDATE: info.date_created,
             JSON_MDATE: info.date_modified,
-            JSON_EVENT_COUNT: count
+            JSON_EVENT_COUNT: actions.count(),
+            JSON_DURATION: actions.duration()
         }
     
     def parse_json_to_script_info(self, data: dict) -> ScriptInfo:
-        info = ScriptInfo()
-        info.version = data[JSON_VERSION]
-        info.name = data[JSON_NAME]
-        info.description = data[JSON_DESCRIPTION]
-        info.date_created = data[JSON_CDATE]
-        info.date_modified = data[JSON_MDATE]
-        return info
+        return ScriptInfo(version=data[JSON_VERSION],
+                          name=data[JSON_NAME],
+                          description=data[JSON_DESCRIPTION],
+                          date_created=data[JSON_CDATE],
+                          date_modified=data[JSON_MDATE])
     
     def parse_script_config_to_dict(self, config: ScriptConfiguration) -> dict:
         return {
@@ -122,10 +199,15 @@ class ScriptDataParser(ScriptDataParserProtocol):
         }
     
     def parse_json_to_script_config(self, data: dict) -> ScriptConfiguration:
-        config = ScriptConfiguration()
-        config.repeat_count = data[JSON_REPEAT_COUNT]
-        config.repeat_forever = data[JSON_REPEAT_FOREVER]
-        config.notify_on_start = data[JSON_NOTIFY_START]
-        config.notify_on_end = data[JSON_NOTIFY_END]
-        return config
+        return ScriptConfiguration(repeat_count=data[JSON_REPEAT_COUNT],
+                                   repeat_forever=data[JSON_REPEAT_FOREVER],
+                                   notify_on_start=data[JSON_NOTIFY_START],
+                                   notify_on_end=data[JSON_NOTIFY_END])
+    
+    # Summary with the event count and duration of the header, they are missing in older scripts
+    def parse_json_to_script_summary(self, info: dict, config: dict) -> ScriptSummary:
+        result = ScriptSummary(self.parse_json_to_script_info(info), self.parse_json_to_script_config(config))
+        result.event_count = info.get(JSON_EVENT_COUNT)
+        result.duration = info.get(JSON_DURATION)
+        return result
 
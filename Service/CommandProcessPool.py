@@ -0,0 +1,205 @@
+import enum
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+from typing import Protocol
+from kink import inject, di
+from Utilities.Clock import ClockProtocol, seconds_to_ns, ns_to_seconds
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+
+MAX_RUNNING_PROCESSES = 4
+DEFAULT_TIMEOUT = None # In seconds, None = no limit
+MAX_LOGGED_OUTPUT_LENGTH = 4096
+
+
+class CommandProcessState(enum.IntEnum):
+    PENDING = 0
+    RUNNING = 1
+    FINISHED = 2
+
+
+class CommandProcess:
+    
+    # - Init
+    
+    def __init__(self, command: str, directory: str, timeout):
+        self.command = command
+        self.directory = directory
+        self.timeout = timeout
+        self.state = CommandProcessState.PENDING
+        self.process = None
+        self.output_file = None
+        self.start_time = 0
+        self.exit_code = None
+        self.output = ''
+        self.timed_out = False
+    
+    # - Properties
+    
+    def get_state(self) -> CommandProcessState: return self.state
+    def get_exit_code(self): return self.exit_code
+    def get_output(self) -> str: return self.output
+    def is_timed_out(self) -> bool: return self.timed_out
+    
+    def is_running(self) -> bool:
+        return self.state != CommandProcessState.FINISHED
+
+
+class CommandProcessPoolProtocol(Protocol):
+    def launch(self, command: str, directory: str, timeout=None) -> CommandProcess: return None
+    def update(self): pass
+    def terminate(self, process: CommandProcess): pass
+
+
+# Runs shell commands in child processes, without blocking the caller
+# Each process gets its own working directory; update() polls for completion and starts pending processes
+@inject(alias=CommandProcessPoolProtocol)
+class CommandProcessPool(CommandProcessPoolProtocol):
+    
+    # - Init
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.max_running = MAX_RUNNING_PROCESSES
+        self.default_timeout = DEFAULT_TIMEOUT
+        self.pending = []
+        self.running = []
+        self.clock = di[ClockProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+    
+    # - Properties
+    
+    def get_max_running(self) -> int: return self.max_running
+    def set_max_running(self, value): self.max_running = value
+    def get_default_timeout(self): return self.default_timeout
+    def set_default_timeout(self, value): self.default_timeout = value
+    
+    def running_count(self) -> int:
+        with self.lock:
+            result = len(self.running)
+        
+        return result
+    
+    def pending_count(self) -> int:
+        with self.lock:
+            result = len(self.pending)
+        
+        return result
+    
+    # - Actions
+    
+    def launch(self, command: str, directory: str, timeout=None) -> CommandProcess:
+        timeout = timeout if timeout is not None else self.default_timeout
+        process = CommandProcess(command, directory, timeout)
+        
+        with self.lock:
+            self.pending.append(process)
+        
+        self.update()
+        
+        return process
+    
+    def update(self):
+        with self.lock:
+            for process in self.running.copy():
+                self._poll(process)
+            
+            while len(self.pending) > 0 and len(self.running) < self.max_running:
+                self._start(self.pending.pop(0))
+    
+    def terminate(self, process: CommandProcess):
+        with self.lock:
+            if process in self.pending:
+                self.pending.remove(process)
+                self._finish(process, None)
+            elif process in self.running:
+                self.logger.warning(f"terminating command '{process.command}'")
+                self._kill(process)
+                self._finish(process, process.process.returncode)
+    
+    # - Helpers
+    
+    def _start(self, process: CommandProcess):
+        process.output_file = tempfile.TemporaryFile()
+        process.start_time = self.clock.now_ns()
+        
+        # The command runs in its own process group, so the processes started by the shell can be killed with it
+        if os.name == 'posix':
+            group_options = {'start_new_session': True}
+        else:
+            group_options = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        
+        try:
+            process.process = subprocess.Popen(process.command,
+                                               shell=True,
+                                               cwd=process.directory,
+                                               stdout=process.output_file,
+                                               stderr=subprocess.STDOUT,
+                                               **group_options)
+        except Exception as error:
+            self.logger.error(f"command '{process.command}' failed to start, error: {error}")
+            self._finish(process, None)
+            return
+        
+        process.state = CommandProcessState.RUNNING
+        self.running.append(process)
+    
+    def _poll(self, process: CommandProcess):
+        exit_code = process.process.poll()
+        
+        if exit_code is not None:
+            self._finish(process, exit_code)
+            return
+        
+        if process.timeout is None:
+            return
+        
+        if self.clock.now_ns() - process.start_time >= seconds_to_ns(process.timeout):
+            self.logger.warning(f"command '{process.command}' timed out after {process.timeout}s")
+            process.timed_out = True
+            self._kill(process)
+            self._finish(process, process.process.returncode)
+    
+    # Kills the shell and every process it started, killing only the shell would leave pipelines and
+    # sub-commands running
+    def _kill(self, process: CommandProcess):
+        if os.name == 'posix':
+            try:
+                os.killpg(process.process.pid, signal.SIGKILL) # The group id is the shell pid (new session)
+            except ProcessLookupError:
+                pass # Every process of the group already exited
+        else:
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            process.process.kill()
+        
+        process.process.wait()
+    
+    def _finish(self, process: CommandProcess, exit_code):
+        if process in self.running:
+            self.running.remove(process)
+        
+        process.state = CommandProcessState.FINISHED
+        process.exit_code = exit_code
+        
+        if process.output_file is not None:
+            process.output_file.seek(0)
+            process.output = process.output_file.read().decode('utf-8', errors='replace')
+            process.output_file.close()
+            process.output_file = None
+        
+        # A command that failed to start never ran, its error is already logged
+        if process.process is not None:
+            duration = ns_to_seconds(self.clock.now_ns() - process.start_time)
+            self.logger.info(f"command '{process.command}' exited with code {exit_code} after {duration:.3f}s")
+        
+        output = process.output.strip()
+        
+        if len(output) > 0:
+            if len(output) > MAX_LOGGED_OUTPUT_LENGTH:
+                output = f'{output[:MAX_LOGGED_OUTPUT_LENGTH]}...'
+            
+            self.logger.info(f"command '{process.command}' output:\n{output}")
@@ -5,19 +5,25 @@ from pynput import mouse
 from Model.KeyPressType import KeyPressType
 from Model.KeyboardInputEvent import KeystrokeEvent
 from Model.MouseInputEvent import MouseMoveEvent, MouseClickEvent, MouseScrollEvent
+from Utilities.Clock import ClockProtocol
 from Utilities.Point import Point
-from Utilities.Logger import LoggerProtocol
+from Utilities.Logger import LoggerProtocol, VerboseFlag
+from Utilities.LogSink import LogSubsystem
+from Utilities.RingBuffer import RingBuffer
 
 
 # Docs:
 # https://pynput.readthedocs.io/en/latest/keyboard.html
 # https://pynput.readthedocs.io/en/latest/mouse.html
 # Records keyboard strokes
+# Events are stamped with the clock in the listener thread, before any queuing
+# They are delivered to the callbacks on the main thread, where get_capture_time() is the stamp of the
+# delivered event, or when a buffer is set, pushed directly from the listener thread as (capture time in ns, event)
 @inject(use_factory=True)
 class KeyboardEventMonitor(QObject):
     
     # Signal automatically binds to every unique instance
-    signal_main = pyqtSignal(KeystrokeEvent, name='KeyboardEventMonitor.emit_event_on_main')
+    signal_main = pyqtSignal(object, KeystrokeEvent, name='KeyboardEventMonitor.emit_event_on_main')
     
     # - Init
     
@@ -28,12 +34,19 @@ class KeyboardEventMonitor(QObject):
         self.signal_main.connect(self.emit_event_on_main)
         self.on_press_callback = None
         self.on_release_callback = None
-        self.logger = di[LoggerProtocol]
+        self.buffer = None
+        self.capture_time = 0
+        self.clock = di[ClockProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.RECORDER)
+        self.verbose = VerboseFlag(self.logger) # The callbacks run for every event
     
     # - Properties
     
     def get_listener(self) -> KeyboardListener: return self.listener
     def set_listener(self, listener): self.listener = listener
+    def get_capture_time(self) -> int: return self.capture_time
+    def get_buffer(self) -> RingBuffer: return self.buffer
+    def set_buffer(self, buffer): self.buffer = buffer
     def get_on_press_callback(self): return self.on_press_callback
     def set_on_press_callback(self, callback): self.on_press_callback = callback
     def get_on_release_callback(self): return self.on_release_callback
@@ -91,21 +104,35 @@ class KeyboardEventMonitor(QObject):
     
     def on_press(self, key):
         if not self.running: return False
-        self.logger.verbose_info(f"{key} pressed")
+        capture_time = self.clock.now_ns()
         
-        self.signal_main.emit(KeystrokeEvent(KeyPressType.PRESS, key))
+        if self.verbose:
+            self.logger.verbose_info('%s pressed', key)
+        
+        self.emit_event(capture_time, KeystrokeEvent(KeyPressType.PRESS, key))
         
         return self.running
     
     def on_release(self, key):
         if not self.running: return False
-        self.logger.verbose_info(f"{key} released")
+        capture_time = self.clock.now_ns()
+        
+        if self.verbose:
+            self.logger.verbose_info('%s released', key)
         
-        self.signal_main.emit(KeystrokeEvent(KeyPressType.RELEASE, key))
+        self.emit_event(capture_time, KeystrokeEvent(KeyPressType.RELEASE, key))
         
         return self.running
     
-    def emit_event_on_main(self, value):
+    def emit_event(self, capture_time, event):
+        if self.buffer is not None:
+            self.buffer.push((capture_time, event))
+        else:
+            self.signal_main.emit(capture_time, event)
+    
+    def emit_event_on_main(self, capture_time, value):
+        self.capture_time = capture_time
+        
         if value.press == KeyPressType.PRESS:
             self.on_press_callback(value)
         else:
@@ -113,13 +140,14 @@ class KeyboardEventMonitor(QObject):
 
 
 # Record mouse movement
+# Same delivery as KeyboardEventMonitor: main thread callbacks, or the buffer when set
 @inject(use_factory=True)
 class MouseEventMonitor(QObject):
     
     # Signal automatically binds to every unique instance
-    signal_main_move = pyqtSignal(MouseMoveEvent, name='MouseEventMonitor.emit_event_on_main_move')
-    signal_main_click = pyqtSignal(MouseClickEvent, name='MouseEventMonitor.emit_event_on_main_click')
-    signal_main_scroll = pyqtSignal(MouseScrollEvent, name='MouseEventMonitor.emit_event_on_main_scroll')
+    signal_main_move = pyqtSignal(object, MouseMoveEvent, name='MouseEventMonitor.emit_event_on_main_move')
+    signal_main_click = pyqtSignal(object, MouseClickEvent, name='MouseEventMonitor.emit_event_on_main_click')
+    signal_main_scroll = pyqtSignal(object, MouseScrollEvent, name='MouseEventMonitor.emit_event_on_main_scroll')
     
     # - Init
     
@@ -137,12 +165,19 @@ class MouseEventMonitor(QObject):
         self.signal_main_click.connect(self.emit_event_on_main_click)
         self.signal_main_scroll.connect(self.emit_event_on_main_scroll)
         
-        self.logger = di[LoggerProtocol]
+        self.buffer = None
+        self.capture_time = 0
+        self.clock = di[ClockProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.RECORDER)
+        self.verbose = VerboseFlag(self.logger) # The callbacks run for every event
     
     # - Properties
     
     def get_listener(self) -> mouse.Listener: return self.listener
     def set_listener(self, listener): self.listener = listener
+    def get_capture_time(self) -> int: return self.capture_time
+    def get_buffer(self) -> RingBuffer: return self.buffer
+    def set_buffer(self, buffer): self.buffer = buffer
     def get_on_move_callback(self): return self.on_move_callback
     def set_on_move_callback(self, callback): self.on_move_callback = callback
     def get_on_press_callback(self): return self.on_press_callback
@@ -195,29 +230,51 @@ class MouseEventMonitor(QObject):
     
     def on_move(self, x, y) -> bool:
         if not self.running: return False
-        self.logger.verbose_info(f"({x}, {y}) moved")
+        capture_time = self.clock.now_ns()
+        
+        if self.verbose:
+            self.logger.verbose_info('(%s, %s) moved', x, y)
         
-        self.signal_main_move.emit(MouseMoveEvent(Point(x, y)))
+        event = MouseMoveEvent(Point(x, y))
+        
+        if self.buffer is not None:
+            self.buffer.push((capture_time, event))
+        else:
+            self.signal_main_move.emit(capture_time, event)
         
         return self.running
     
     def on_click(self, x, y, key, is_pressed) -> bool:
         if not self.running: return False
+        capture_time = self.clock.now_ns()
         
         press = KeyPressType.PRESS if is_pressed else KeyPressType.RELEASE
         
-        self.logger.verbose_info(f"{key} {press.name}")
+        if self.verbose:
+            self.logger.verbose_info('%s %s', key, press.name)
+        
+        event = MouseClickEvent(press, key, Point(x, y))
         
-        self.signal_main_click.emit(MouseClickEvent(press, key, Point(x, y)))
+        if self.buffer is not None:
+            self.buffer.push((capture_time, event))
+        else:
+            self.signal_main_click.emit(capture_time, event)
         
         return self.running
     
     def on_scroll(self, x, y, dx, dy) -> bool:
         if not self.running: return False
+        capture_time = self.clock.now_ns()
         
-        self.logger.verbose_info(f"scrolled by ({x}, {y}) by ({dx}, {dy})")
+        if self.verbose:
+            self.logger.verbose_info('scrolled by (%s, %s) by (%s, %s)', x, y, dx, dy)
         
-        self.signal_main_scroll.emit(MouseScrollEvent(Point(x, y), Point(dx, dy)))
+        event = MouseScrollEvent(Point(x, y), Point(dx, dy))
+        
+        if self.buffer is not None:
+            self.buffer.push((capture_time, event))
+        else:
+            self.signal_main_scroll.emit(capture_time, event)
         
         return self.running
     
@@ -228,15 +285,19 @@ class MouseEventMonitor(QObject):
         
         self.listener = mouse.Listener(on_move=self.on_move, on_click=self.on_click, on_scroll=self.on_scroll)
     
-    def emit_event_on_main_move(self, event):
+    def emit_event_on_main_move(self, capture_time, event):
+        self.capture_time = capture_time
         self.on_move_callback(event)
     
-    def emit_event_on_main_click(self, event):
+    def emit_event_on_main_click(self, capture_time, event):
+        self.capture_time = capture_time
+        
         if event.press == KeyPressType.PRESS:
             self.on_press_callback(event)
         else:
             self.on_release_callback(event)
     
-    def emit_event_on_main_scroll(self, event):
+    def emit_event_on_main_scroll(self, capture_time, event):
+        self.capture_time = capture_time
         self.on_scroll_callback(event)
 
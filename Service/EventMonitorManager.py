@@ -1,52 +1,131 @@
 import threading
-import time
+from operator import itemgetter
+from typing import Protocol
 from PyQt5.QtCore import QThread
 from kink import di
+from Model.KeyboardInputEvent import KeystrokeEvent
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionColumns import ScriptActionColumns
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Parser.ScriptActionTypeParser import ScriptActionTypeParserProtocol
 from Service.EventMonitor import MouseEventMonitor, KeyboardEventMonitor
+from Service.RecordingJournal import RecordingJournal
+from Service.RecordingFilter import RecordingFilter, RecordingFilterOptions, RecordingFilterStats
+from Utilities.Clock import ClockProtocol, ns_to_seconds
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+from Utilities.RingBuffer import RingBuffer
 
+DRAIN_INTERVAL = 0.01 # Time (in seconds) between two reads of the recorded events
+RING_BUFFER_CAPACITY = 1 << 16 # Events per listener, when full new events are dropped
+RECENT_EVENTS_LIMIT = 1 << 15 # Events kept in memory when recording to a journal
 
+
+class EventMonitorDelegate(Protocol):
+    def recording_finished(self): pass
+
+
+# The listener threads push their events to one ring buffer each, the worker drains them in batches
+# Mouse moves pass through the recording filter, the recorded paths are simplified when the worker ends
+# With a journal, every drained batch is also appended to it and only the latest events stay in memory
 class EventMonitorWorker(QThread):
     
     # - Init
     
-    def __init__(self):
+    def __init__(self, filter_options: RecordingFilterOptions = RecordingFilterOptions(), journal: RecordingJournal = None):
         super(EventMonitorWorker, self).__init__()
         
         self.lock = threading.Lock()
         
-        self.events = []
+        self.events = ScriptActionColumns() # Recordings can be long, the events are stored in the compact form
+        self.events_offset = 0 # Recorded events no longer in memory, they are in the journal
+        self.events_generation = 0 # Changed when the recorded events are replaced, not when they are appended or trimmed
+        self.journal = journal
+        self.journaled_count = 0
         self.start_time = 0
         self.filter_keys = []
+        self.stop_event = threading.Event()
+        self.recording_filter = RecordingFilter(filter_options)
         
+        self.keyboard_buffer = RingBuffer(RING_BUFFER_CAPACITY)
         self.keyboard_monitor = di[KeyboardEventMonitor]
         self.keyboard_monitor.setup(self.on_keyboard_press, self.on_keyboard_release)
+        self.keyboard_monitor.set_buffer(self.keyboard_buffer)
         
+        self.mouse_buffer = RingBuffer(RING_BUFFER_CAPACITY)
         self.mouse_monitor = di[MouseEventMonitor]
         self.mouse_monitor.setup(self.on_mouse_move, self.on_mouse_press, self.on_mouse_release, self.on_mouse_scroll)
+        self.mouse_monitor.set_buffer(self.mouse_buffer)
         
-        self.logger = di[LoggerProtocol]
+        self.type_parser = di[ScriptActionTypeParserProtocol]
+        self.clock = di[ClockProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.RECORDER)
     
     # - Properties
     
-    def get_events(self) -> []:
+    def get_actions(self) -> ScriptActions:
+        if self.journal is not None:
+            # Once stopped, the journal is complete when the worker finishes
+            if self.stop_event.is_set():
+                self.wait()
+            
+            return self.journal.read_actions()
+        
+        with self.lock:
+            result = ScriptActions(self.events.copy())
+        
+        return result
+    
+    def set_actions(self, actions: ScriptActions):
+        with self.lock:
+            self.events = ScriptActionColumns(actions.data)
+            self.events_offset = 0
+            self.events_generation += 1
+    
+    def get_events_generation(self) -> int:
         with self.lock:
-            result = self.events.copy()
+            result = self.events_generation
         
         return result
     
-    def set_events(self, events):
+    # Actions recorded after the first index actions, the ones no longer in memory are skipped
+    def get_actions_since(self, index) -> ScriptActions:
         with self.lock:
-            self.events = events
+            result = ScriptActions(self.events[max(index - self.events_offset, 0):])
+        
+        return result
+    
+    def get_dropped_count(self) -> int:
+        return self.keyboard_buffer.get_dropped_count() + self.mouse_buffer.get_dropped_count()
+    
+    def get_filter_stats(self) -> RecordingFilterStats:
+        return self.recording_filter.get_stats()
     
     # - Actions
     
     def run(self):
         self.logger.info('EventMonitorWorker started')
-        self.start_time = time.time()
+        
+        if self.journal is not None:
+            self.journal.open()
+        
+        self.start_time = self.clock.now_ns()
         self.mouse_monitor.start()
         self.keyboard_monitor.start()
-        self.keyboard_monitor.join()
+        
+        while not self.stop_event.wait(DRAIN_INTERVAL):
+            self.drain()
+        
+        # Events captured right before stopping
+        self.drain()
+        self.finish_recording()
+        
+        dropped_count = self.get_dropped_count()
+        
+        if dropped_count > 0:
+            self.logger.warning(f'EventMonitorWorker dropped {dropped_count} event(s), the buffers were full')
+        
         self.logger.info('EventMonitorWorker exited')
     
     def stop(self):
@@ -54,39 +133,141 @@ class EventMonitorWorker(QThread):
         self.mouse_monitor.reset()
         self.keyboard_monitor.stop()
         self.keyboard_monitor.reset()
+        self.stop_event.set()
+    
+    def drain(self):
+        mouse_events = self.mouse_buffer.drain()
+        keyboard_events = self.keyboard_buffer.drain()
+        
+        if len(keyboard_events) == 0:
+            batch = mouse_events
+        elif len(mouse_events) == 0:
+            batch = keyboard_events
+        else:
+            batch = mouse_events + keyboard_events
+            batch.sort(key=itemgetter(0))
+        
+        if len(batch) == 0:
+            return
+        
+        with self.lock:
+            for capture_time, event in batch:
+                if isinstance(event, KeystrokeEvent) and event.key in self.filter_keys:
+                    continue
+                
+                event.set_time(ns_to_seconds(capture_time - self.start_time))
+                self.store(event)
+        
+        if self.journal is not None:
+            self.write_journal()
+    
+    # Keeps the last held back move and simplifies the recorded mouse paths
+    def finish_recording(self):
+        with self.lock:
+            held_move = self.recording_filter.release_held_move()
+            
+            if held_move is not None:
+                self.events.append_event(held_move, ScriptActionType.MOUSE_MOVE)
+            
+            if self.journal is None:
+                simplified = self.recording_filter.simplify(self.events)
+                
+                if simplified is not self.events:
+                    self.events = simplified
+                    self.events_generation += 1
+        
+        if self.journal is not None:
+            self.finish_journal()
+        
+        if self.recording_filter.get_options().is_enabled():
+            self.logger.info(f'EventMonitorWorker {self.recording_filter.get_stats().description()}')
+    
+    # Lock must be held
+    def store(self, event):
+        if isinstance(event, MouseMoveEvent):
+            if not self.recording_filter.accepts_move(event):
+                return
+        else:
+            held_move = self.recording_filter.release_held_move()
+            
+            if held_move is not None:
+                self.events.append_event(held_move, ScriptActionType.MOUSE_MOVE)
+        
+        self.events.append_event(event, self.type_parser.type_for_input_event(event))
+    
+    # Appends the events recorded since the last write, the older events are dropped from memory
+    def write_journal(self):
+        with self.lock:
+            actions = self.events[self.journaled_count - self.events_offset:]
+            self.journaled_count += len(actions)
+            
+            if len(self.events) > 2 * RECENT_EVENTS_LIMIT:
+                removed_count = len(self.events) - RECENT_EVENTS_LIMIT
+                self.events = self.events.select(range(removed_count, len(self.events)))
+                self.events_offset += removed_count
+        
+        self.journal.append(actions)
+    
+    def finish_journal(self):
+        self.write_journal()
+        self.journal.close()
+        
+        if self.recording_filter.get_options().tolerance <= 0:
+            return
+        
+        # The whole recording is needed to simplify the paths, it is loaded once in the compact form
+        columns = self.journal.read_actions().data
+        simplified = self.recording_filter.simplify(columns)
+        
+        if simplified is columns:
+            return
+        
+        self.journal.rewrite(ScriptActions(simplified))
+        
+        with self.lock:
+            count = len(simplified)
+            first = max(count - RECENT_EVENTS_LIMIT, 0)
+            self.events = simplified.select(range(first, count))
+            self.events_offset = first
+            self.journaled_count = count
+            self.events_generation += 1
     
     def elapsed_time(self) -> float:
-        return time.time() - self.start_time
+        return ns_to_seconds(self.elapsed_time_ns())
+    
+    def elapsed_time_ns(self) -> int:
+        return self.clock.now_ns() - self.start_time
+    
+    # Events delivered on the main thread are timed by their capture time, not by when they are delivered
+    def record(self, event, capture_time):
+        event.set_time(ns_to_seconds(capture_time - self.start_time))
+        
+        with self.lock:
+            self.store(event)
     
     def on_mouse_move(self, event):
-        event.set_time(self.elapsed_time())
-        self.events.append(event)
+        self.record(event, self.mouse_monitor.get_capture_time())
     
     def on_mouse_press(self, event):
-        event.set_time(self.elapsed_time())
-        self.events.append(event)
+        self.record(event, self.mouse_monitor.get_capture_time())
     
     def on_mouse_release(self, event):
-        event.set_time(self.elapsed_time())
-        self.events.append(event)
+        self.record(event, self.mouse_monitor.get_capture_time())
     
     def on_mouse_scroll(self, event):
-        event.set_time(self.elapsed_time())
-        self.events.append(event)
+        self.record(event, self.mouse_monitor.get_capture_time())
     
     def on_keyboard_press(self, event):
         if event.key in self.filter_keys:
             return
         
-        event.set_time(self.elapsed_time())
-        self.events.append(event)
+        self.record(event, self.keyboard_monitor.get_capture_time())
     
     def on_keyboard_release(self, event):
         if event.key in self.filter_keys:
             return
         
-        event.set_time(self.elapsed_time())
-        self.events.append(event)
+        self.record(event, self.keyboard_monitor.get_capture_time())
 
 
 class EventMonitorManager:
@@ -94,23 +275,48 @@ class EventMonitorManager:
     # - Init
     
     def __init__(self):
+        self.delegate = None
         self.running = False
         self.worker = None
         self.events = []
         self.filter_keys = []
-        self.logger = di[LoggerProtocol]
+        self.filter_options = RecordingFilterOptions()
+        self.journal = None
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.RECORDER)
     
     # - Properties
     
+    def get_delegate(self) -> EventMonitorDelegate: return self.delegate
+    def set_delegate(self, delegate): self.delegate = delegate
+    def get_filter_options(self) -> RecordingFilterOptions: return self.filter_options
+    def set_filter_options(self, options): self.filter_options = options
+    def get_journal(self) -> RecordingJournal: return self.journal
+    def set_journal(self, journal): self.journal = journal
     def is_running(self) -> bool: return self.running
     
-    def get_events(self) -> []:
+    def get_actions(self) -> ScriptActions:
+        assert self.worker is not None
+        return self.worker.get_actions()
+    
+    def get_actions_since(self, index) -> ScriptActions:
+        assert self.worker is not None
+        return self.worker.get_actions_since(index)
+    
+    def set_actions(self, actions: ScriptActions):
         assert self.worker is not None
-        return self.worker.get_events()
+        self.worker.set_actions(actions)
     
-    def set_events(self, events):
+    def get_events_generation(self) -> int:
         assert self.worker is not None
-        self.worker.set_events(events)
+        return self.worker.get_events_generation()
+    
+    def get_dropped_count(self) -> int:
+        assert self.worker is not None
+        return self.worker.get_dropped_count()
+    
+    def get_filter_stats(self) -> RecordingFilterStats:
+        assert self.worker is not None
+        return self.worker.get_filter_stats()
     
     # - Actions
     
@@ -120,7 +326,7 @@ class EventMonitorManager:
         self.logger.info('EventMonitorManager start')
         
         self.running = True
-        worker = EventMonitorWorker()
+        worker = EventMonitorWorker(self.filter_options, self.journal)
         worker.filter_keys = self.filter_keys
         worker.finished.connect(self.on_stop)
         self.worker = worker
@@ -131,7 +337,15 @@ class EventMonitorManager:
         self.logger.info('EventMonitorManager stop')
         self.worker.stop()
     
+    # Blocks until the last recorded events are stored
+    def wait(self):
+        assert self.worker is not None
+        self.worker.wait()
+    
     def on_stop(self):
         assert self.running
         self.logger.info('EventMonitorManager on stop')
         self.running = False
+        
+        if self.delegate is not None:
+            self.delegate.recording_finished()
@@ -7,11 +7,16 @@ from Model.InputEvent import InputEvent
 from Model.KeyPressType import KeyPressType
 from Model.KeyboardInputEvent import KeystrokeEvent
 from Model.MouseInputEvent import MouseMoveEvent, MouseClickEvent, MouseScrollEvent
-from Utilities.Logger import LoggerProtocol
+from Utilities.Logger import LoggerProtocol, VerboseFlag
+from Utilities.LogSink import LogSubsystem
 
 
+# simulate dispatches on the event type, the other methods are called directly by the compiled scripts
 class KeyboardEventSimulatorProtocol(Protocol):
     def simulate(self, event: InputEvent): pass
+    def press(self, key): pass
+    def release(self, key): pass
+    def click(self, key): pass
 
 
 @inject(alias=KeyboardEventSimulatorProtocol)
@@ -21,7 +26,8 @@ class KeyboardEventSimulator(KeyboardEventSimulatorProtocol):
     
     def __init__(self):
         self.keyboard = KController()
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+        self.verbose = VerboseFlag(self.logger) # Every simulated event is logged
     
     # - Actions
     
@@ -37,25 +43,38 @@ class KeyboardEventSimulator(KeyboardEventSimulatorProtocol):
             assert False
     
     def click(self, key):
-        self.logger.verbose_info(f"KeyboardEventSimulator: click {key}")
+        if self.verbose:
+            self.logger.verbose_info('KeyboardEventSimulator: click %s', key)
+        
         self.keyboard.tap(key)
     
     def press(self, key):
-        self.logger.verbose_info(f"KeyboardEventSimulator: press {key}")
+        if self.verbose:
+            self.logger.verbose_info('KeyboardEventSimulator: press %s', key)
+        
         self.keyboard.press(key)
     
     def release(self, key):
-        self.logger.verbose_info(f"KeyboardEventSimulator: release {key}")
+        if self.verbose:
+            self.logger.verbose_info('KeyboardEventSimulator: release %s', key)
+        
         self.keyboard.release(key)
     
     def type_character(self, key):
-        self.logger.verbose_info(f"KeyboardEventSimulator: type {key}")
+        if self.verbose:
+            self.logger.verbose_info('KeyboardEventSimulator: type %s', key)
+        
         self.keyboard.press(key)
         self.keyboard.release(key)
 
 
 class MouseEventSimulatorProtocol(Protocol):
     def simulate(self, event: InputEvent): pass
+    def move_to(self, x, y): pass
+    def press(self, key): pass
+    def release(self, key): pass
+    def click(self, key): pass
+    def scroll(self, position, offset): pass
 
 
 @inject(alias=MouseEventSimulatorProtocol)
@@ -65,7 +84,8 @@ class MouseEventSimulator:
     
     def __init__(self):
         self.mouse = MController()
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+        self.verbose = VerboseFlag(self.logger) # Every simulated event is logged
     
     # - Actions
     
@@ -85,26 +105,41 @@ class MouseEventSimulator:
             assert False
     
     def move(self, point):
-        self.logger.verbose_info(f"MouseEventSimulator: move to ({point.x},{point.y})")
-        self.mouse.position = (point.x, point.y)
+        self.move_to(point.x, point.y)
+    
+    def move_to(self, x, y):
+        if self.verbose:
+            self.logger.verbose_info('MouseEventSimulator: move to (%s,%s)', x, y)
+        
+        self.mouse.position = (x, y)
     
     def offset(self, offset):
-        self.logger.verbose_info(f"MouseEventSimulator: offset by ({offset.x},{offset.y})")
+        if self.verbose:
+            self.logger.verbose_info('MouseEventSimulator: offset by (%s,%s)', offset.x, offset.y)
+        
         self.mouse.move(offset[0], offset[1])
     
     def click(self, key):
-        self.logger.verbose_info(f"MouseEventSimulator: click {key}")
+        if self.verbose:
+            self.logger.verbose_info('MouseEventSimulator: click %s', key)
+        
         self.mouse.click(key)
     
     def press(self, key):
-        self.logger.verbose_info(f"MouseEventSimulator: click {key}")
+        if self.verbose:
+            self.logger.verbose_info('MouseEventSimulator: click %s', key)
+        
         self.mouse.press(key)
     
     def release(self, key):
-        self.logger.verbose_info(f"MouseEventSimulator: click {key}")
+        if self.verbose:
+            self.logger.verbose_info('MouseEventSimulator: click %s', key)
+        
         self.mouse.release(key)
     
     def scroll(self, position, offset):
-        self.logger.verbose_info(f"MouseEventSimulator: scroll by ({offset.x},{offset.y}) @ ({position.x},{position.y})")
+        if self.verbose:
+            self.logger.verbose_info('MouseEventSimulator: scroll by (%s,%s) @ (%s,%s)', offset.x, offset.y, position.x, position.y)
+        
         self.mouse.move(position.x, position.y)
         self.mouse.scroll(offset.x, offset.y)  # TODO: not working ATM
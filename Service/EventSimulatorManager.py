@@ -2,8 +2,15 @@ from typing import Protocol
 from kink import di
 from Model.ScriptData import ScriptData
 from Parser.ScriptActionParser import ScriptActionParserProtocol
-from Service.Work.ScriptSimulationWorker import ScriptSimulationWorker, ScriptSimulationWorkerState
+from Service.SettingsManager import SettingsManagerProtocol, SettingsManagerField
+from Service.Work.PlaybackTiming import PlaybackTimingSummary
+from Service.Work.ScriptSimulation import ScriptSimulation, ScriptSimulationState
+from Service.Work.ScriptSimulationWorker import ScriptSimulationWorker
+from Utilities import Path as PathUtils
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+
+TIMING_REPORT_DIRECTORY_NAME = 'reports' # In the scripts directory
 
 
 class EventSimulatorDelegate(Protocol):
@@ -19,14 +26,17 @@ class EventSimulatorManager:
         self.running = False
         self.script_data = script_data
         self.worker = None
+        self.simulation = None
         self.parser = di[ScriptActionParserProtocol]
-        self.logger = di[LoggerProtocol]
+        self.settings = di[SettingsManagerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
     
     # - Properties
     
     def get_delegate(self) -> EventSimulatorDelegate: return self.delegate
     def set_delegate(self, delegate): self.delegate = delegate
     def get_worker(self) -> ScriptSimulationWorker: return self.worker
+    def get_simulation(self) -> ScriptSimulation: return self.simulation
     
     def is_running(self) -> bool:
         return self.running
@@ -34,7 +44,7 @@ class EventSimulatorManager:
     # - Actions
     
     def is_paused(self) -> bool:
-        return self.worker.state() == ScriptSimulationWorkerState.PAUSED
+        return self.simulation.state() == ScriptSimulationState.PAUSED
     
     def start(self):
         assert self.delegate is not None
@@ -47,38 +57,49 @@ class EventSimulatorManager:
         worker.delegate = self
         worker.finished.connect(self.on_end)
         self.worker = worker
+        self.simulation = worker.get_simulation()
+        
+        if self.settings.field_value(SettingsManagerField.PLAYBACK_TIMING_REPORT):
+            scripts_directory = self.settings.field_value(SettingsManagerField.SCRIPTS_PATH)
+            report_directory = PathUtils.combine_paths(scripts_directory, TIMING_REPORT_DIRECTORY_NAME)
+            self.simulation.set_report_directory(report_directory.absolute)
+        
         worker.start()
     
     def cancel(self):
         assert self.running
         self.logger.info('EventSimulatorManager cancel')
-        self.worker.cancel()
+        self.simulation.cancel()
     
     def pause_script(self, sender):
         assert self.running
         self.logger.info('EventSimulatorManager pause')
-        self.worker.pause()
+        self.simulation.pause()
     
     def resume_script(self, sender):
         assert self.running
         self.logger.info('EventSimulatorManager resume')
-        self.worker.resume()
+        self.simulation.resume()
     
     def on_start(self): pass
     
     def on_end(self):
         self.running = False
         
-        if not self.worker.is_cancelled():
+        if not self.simulation.is_cancelled():
             self.logger.info('EventSimulatorManager on end')
             self.delegate.stop_script(sender=self)
         else:
             self.logger.info('EventSimulatorManager on cancel')
     
     def current_action_index(self) -> int:
-        return self.worker.current_action_index()
+        return self.simulation.current_action_index()
     
     def progress_fraction(self) -> float:
-        current = self.worker.elapsed_time()
-        duration = self.worker.duration()
+        current = self.simulation.elapsed_time()
+        duration = self.simulation.duration()
         return current / duration if duration > 0 else 1
+    
+    # Live lateness percentiles and throughput of the running script
+    def timing_summary(self) -> PlaybackTimingSummary:
+        return self.simulation.timing_summary() if self.simulation is not None else PlaybackTimingSummary()
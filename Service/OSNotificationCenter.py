@@ -1,24 +1,134 @@
+import collections
+import threading
 from typing import Protocol
 from kink import inject, di
 from plyer import notification
 
+from Utilities.Clock import ClockProtocol, ns_to_seconds
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 
 DURATION = 5 # 5 sec
+MIN_INTERVAL = 1 # Minimum time (in seconds) between two notifications
+MAX_PENDING_NOTIFICATIONS = 4 # When full, the oldest pending notification is dropped
 
 
 class OSNotificationCenterProtocol(Protocol):
     def show(self, title, message): assert False
+    def flush(self, timeout=None): pass
 
 
+# Notifications are shown by a background dispatcher, so show() never blocks the caller
+# Pending notifications with the same title and message are merged, so a repeated message is shown once
+# flush() waits for the pending notifications, before exiting a process that showed some
 @inject(alias=OSNotificationCenterProtocol)
 class OSNotificationCenter(OSNotificationCenterProtocol):
     
     def __init__(self):
         super(OSNotificationCenter, self).__init__()
-        self.logger = di[LoggerProtocol]
+        self.condition = threading.Condition()
+        self.pending = collections.deque()
+        self.dispatcher = None
+        self.dispatching = False
+        self.last_dispatch_time = None
+        self.min_interval = MIN_INTERVAL
+        self.max_pending = MAX_PENDING_NOTIFICATIONS
+        self.shown_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.clock = di[ClockProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+    
+    # - Properties
+    
+    def get_min_interval(self) -> float: return self.min_interval
+    def set_min_interval(self, value): self.min_interval = value
+    def get_max_pending(self) -> int: return self.max_pending
+    def set_max_pending(self, value): self.max_pending = value
+    
+    def get_shown_count(self) -> int:
+        with self.condition:
+            result = self.shown_count
+        
+        return result
+    
+    def get_coalesced_count(self) -> int:
+        with self.condition:
+            result = self.coalesced_count
+        
+        return result
+    
+    def get_dropped_count(self) -> int:
+        with self.condition:
+            result = self.dropped_count
+        
+        return result
+    
+    # - Actions
     
     def show(self, title, message):
         self.logger.info(f'OSNotificationCenter: show notification {title} - {message}')
-        notification.notify(title=title, message=message, timeout=DURATION)
-
+        
+        with self.condition:
+            self.start_dispatcher()
+            
+            if (title, message) in self.pending:
+                self.coalesced_count += 1
+                return
+            
+            if len(self.pending) >= self.max_pending:
+                dropped_title, dropped_message = self.pending.popleft()
+                self.dropped_count += 1
+                self.logger.warning(f'OSNotificationCenter: dropped notification {dropped_title} - {dropped_message}')
+            
+            self.pending.append((title, message))
+            self.condition.notify_all()
+    
+    # Waits until the pending notifications are shown, returns False on timeout (in seconds)
+    def flush(self, timeout=None) -> bool:
+        with self.condition:
+            result = self.condition.wait_for(lambda: len(self.pending) == 0 and not self.dispatching, timeout)
+        
+        return result
+    
+    # - Helpers
+    
+    def start_dispatcher(self):
+        if self.dispatcher is None:
+            self.dispatcher = threading.Thread(target=self.run_dispatcher, name='OSNotificationCenter.dispatcher', daemon=True)
+            self.dispatcher.start()
+    
+    def run_dispatcher(self):
+        while True:
+            with self.condition:
+                while len(self.pending) == 0:
+                    self.condition.wait()
+                
+                # Rate limit, notifications received in the meantime are merged or dropped
+                while True:
+                    delay = self.time_until_next_dispatch()
+                    
+                    if delay <= 0:
+                        break
+                    
+                    self.condition.wait(delay)
+                
+                title, message = self.pending.popleft()
+                self.dispatching = True
+                self.last_dispatch_time = self.clock.now_ns()
+                self.shown_count += 1
+            
+            try:
+                notification.notify(title=title, message=message, timeout=DURATION)
+            except Exception as error:
+                self.logger.error(f'OSNotificationCenter: failed to show notification, error: {error}')
+            
+            with self.condition:
+                self.dispatching = False
+                self.condition.notify_all()
+    
+    def time_until_next_dispatch(self) -> float:
+        if self.last_dispatch_time is None:
+            return 0
+        
+        return self.min_interval - ns_to_seconds(self.clock.now_ns() - self.last_dispatch_time)
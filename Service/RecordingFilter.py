@@ -0,0 +1,179 @@
+import math
+from dataclasses import dataclass
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES
+from Model.ScriptActionType import ScriptActionType
+
+MOUSE_MOVE_CODE = TYPE_CODES[ScriptActionType.MOUSE_MOVE]
+
+
+@dataclass(frozen=True, slots=True)
+class RecordingFilterOptions:
+    min_interval: float = 0 # Seconds between two recorded mouse moves
+    min_distance: float = 0 # Pixels between two recorded mouse moves
+    tolerance: float = 0 # Pixels a simplified mouse path may deviate from the kept moves
+    
+    def is_enabled(self) -> bool:
+        return self.min_interval > 0 or self.min_distance > 0 or self.tolerance > 0
+
+
+@dataclass(slots=True)
+class RecordingFilterStats:
+    received_moves: int = 0
+    dropped_by_interval: int = 0
+    dropped_by_distance: int = 0
+    dropped_by_simplification: int = 0
+    
+    def dropped_count(self) -> int:
+        return self.dropped_by_interval + self.dropped_by_distance + self.dropped_by_simplification
+    
+    def description(self) -> str:
+        return (f'{self.dropped_count()} of {self.received_moves} mouse moves dropped '
+                f'(interval: {self.dropped_by_interval}, distance: {self.dropped_by_distance}, '
+                f'simplification: {self.dropped_by_simplification})')
+
+
+# Reduces the recorded mouse moves, other events are never dropped
+# While recording, moves that are too close in time or distance to the last kept move are dropped
+# The last dropped move is held back and kept when a non move event follows, so the cursor still
+# arrives where the user clicked or typed
+# When recording ends, every run of moves is simplified with Ramer-Douglas-Peucker
+class RecordingFilter:
+    
+    # - Init
+    
+    def __init__(self, options: RecordingFilterOptions = RecordingFilterOptions()):
+        self.options = options
+        self.stats = RecordingFilterStats()
+        self.last_move = None
+        self.held_move = None
+        self.held_by_interval = False
+    
+    # - Properties
+    
+    def get_options(self) -> RecordingFilterOptions: return self.options
+    def get_stats(self) -> RecordingFilterStats: return self.stats
+    
+    # - Actions
+    
+    # Returns False if the move should be dropped, the event time must already be set
+    def accepts_move(self, event: MouseMoveEvent) -> bool:
+        self.stats.received_moves += 1
+        last_move = self.last_move
+        
+        if last_move is not None:
+            if event.time() - last_move.time() < self.options.min_interval:
+                self.stats.dropped_by_interval += 1
+                self.hold(event, by_interval=True)
+                return False
+            
+            if distance(event.point, last_move.point) < self.options.min_distance:
+                self.stats.dropped_by_distance += 1
+                self.hold(event, by_interval=False)
+                return False
+        
+        self.last_move = event
+        self.held_move = None
+        return True
+    
+    # The last dropped move, if it was not followed by a kept one
+    # Call before recording a non move event and when recording ends
+    def release_held_move(self) -> MouseMoveEvent:
+        result = self.held_move
+        
+        if result is not None:
+            # Kept after all
+            if self.held_by_interval:
+                self.stats.dropped_by_interval -= 1
+            else:
+                self.stats.dropped_by_distance -= 1
+            
+            self.held_move = None
+            self.last_move = result
+        
+        return result
+    
+    def simplify(self, columns: ScriptActionColumns) -> ScriptActionColumns:
+        if self.options.tolerance <= 0:
+            return columns
+        
+        types = columns.types
+        count = len(columns)
+        kept = []
+        index = 0
+        
+        while index < count:
+            if types[index] != MOUSE_MOVE_CODE:
+                kept.append(index)
+                index += 1
+                continue
+            
+            end = index
+            
+            while end + 1 < count and types[end + 1] == MOUSE_MOVE_CODE:
+                end += 1
+            
+            kept.extend(simplified_path(columns.xs, columns.ys, index, end, self.options.tolerance))
+            index = end + 1
+        
+        if len(kept) == count:
+            return columns
+        
+        self.stats.dropped_by_simplification += count - len(kept)
+        return columns.select(kept)
+    
+    # - Helpers
+    
+    def hold(self, event: MouseMoveEvent, by_interval: bool):
+        self.held_move = event
+        self.held_by_interval = by_interval
+
+
+def distance(a, b) -> float:
+    return math.hypot(a.x - b.x, a.y - b.y)
+
+
+# Ramer-Douglas-Peucker over the points start...end (inclusive), returns the kept indices in order
+# Every dropped point is within tolerance of the path through the kept points
+def simplified_path(xs, ys, start, end, tolerance) -> [int]:
+    if end - start < 2:
+        return list(range(start, end + 1))
+    
+    keep = {start, end}
+    ranges = [(start, end)]
+    
+    while len(ranges) > 0:
+        first, last = ranges.pop()
+        
+        if last - first < 2:
+            continue
+        
+        max_distance = -1
+        max_index = first
+        
+        for index in range(first + 1, last):
+            value = segment_distance(xs[index], ys[index], xs[first], ys[first], xs[last], ys[last])
+            
+            if value > max_distance:
+                max_distance = value
+                max_index = index
+        
+        if max_distance > tolerance:
+            keep.add(max_index)
+            ranges.append((first, max_index))
+            ranges.append((max_index, last))
+    
+    return sorted(keep)
+
+
+# Distance from (x, y) to the segment (ax, ay) - (bx, by)
+def segment_distance(x, y, ax, ay, bx, by) -> float:
+    dx = bx - ax
+    dy = by - ay
+    length_squared = dx * dx + dy * dy
+    
+    if length_squared == 0:
+        return math.hypot(x - ax, y - ay)
+    
+    t = max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / length_squared))
+    return math.hypot(x - (ax + t * dx), y - (ay + t * dy))
@@ -0,0 +1,173 @@
+import json
+import os
+import queue
+import threading
+import time
+from kink import di
+from Model.ScriptActionColumns import ScriptActionColumns
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Model.ScriptSummary import ScriptSummary
+from Parser.ScriptActionParser import ScriptActionParserProtocol
+from Service.ScriptStorage import ScriptStorage
+from Utilities.Logger import LoggerProtocol
+from Utilities import Path as PathUtils
+from Utilities.LogSink import LogSubsystem
+from Utilities.Path import Path
+
+JOURNAL_DIRECTORY = 'recordings'
+JOURNAL_FILE_FORMAT = 'jsonl'
+MAX_QUEUED_BATCHES = 64 # When full, appending blocks until a batch is written
+
+
+# Append only JSON Lines file, one action per line
+# Batches are written by a background thread and flushed after every batch,
+# so a crash loses at most the batches that were still queued
+# Every recording has its own journal, one left behind by an interrupted recording is never replaced
+class RecordingJournal:
+    
+    # - Init
+    
+    def __init__(self, path: Path = None):
+        self.path = path if path is not None else new_journal_path(Path(JOURNAL_DIRECTORY))
+        self.batches = queue.Queue(maxsize=MAX_QUEUED_BATCHES)
+        self.writer = None
+        self.written_count = 0
+        self.failed = False
+        self.parser = di[ScriptActionParserProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.RECORDER)
+    
+    # - Properties
+    
+    def get_path(self) -> Path: return self.path
+    def get_written_count(self) -> int: return self.written_count
+    
+    def is_open(self) -> bool:
+        return self.writer is not None
+    
+    # - Actions
+    
+    # Starts a new journal, fails if the file already exists
+    def open(self):
+        assert self.writer is None
+        
+        self.logger.info(f"RecordingJournal open '{self.path.absolute}'")
+        
+        directory = os.path.dirname(self.path.absolute)
+        
+        if len(directory) > 0:
+            os.makedirs(directory, exist_ok=True)
+        
+        open(self.path.absolute, 'x', encoding='utf-8').close()
+        self.written_count = 0
+        self.failed = False
+        self.writer = threading.Thread(target=self.run_writer, name='RecordingJournal.writer', daemon=True)
+        self.writer.start()
+    
+    def append(self, actions: list):
+        assert self.writer is not None
+        
+        if len(actions) > 0:
+            self.batches.put(actions)
+    
+    # Blocks until every appended batch is written
+    def close(self):
+        assert self.writer is not None
+        
+        self.batches.put(None)
+        self.writer.join()
+        self.writer = None
+        
+        self.logger.info(f"RecordingJournal closed, {self.written_count} action(s) written")
+    
+    # Replaces the contents of a closed journal
+    def rewrite(self, actions: ScriptActions):
+        assert self.writer is None
+        
+        temporary_path = f'{self.path.absolute}.tmp'
+        
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            file.write(self.lines(actions.data))
+        
+        os.replace(temporary_path, self.path.absolute)
+        self.written_count = actions.count()
+    
+    def read_actions(self) -> ScriptActions:
+        return read_journal(self.path)
+    
+    # Converts the journal to a regular script file
+    def finalize(self, file_path: Path, summary: ScriptSummary):
+        assert self.writer is None
+        
+        script = ScriptData(self.read_actions(), summary)
+        ScriptStorage(file_path).write_script_data_to_file(script)
+    
+    def remove(self):
+        assert self.writer is None
+        
+        if os.path.isfile(self.path.absolute):
+            os.remove(self.path.absolute)
+    
+    # - Helpers
+    
+    def lines(self, actions) -> str:
+        return ''.join(json.dumps(self.parser.parse_to_json(action)) + '\n' for action in actions)
+    
+    def run_writer(self):
+        with open(self.path.absolute, 'a', encoding='utf-8') as file:
+            while True:
+                actions = self.batches.get()
+                
+                if actions is None:
+                    break
+                
+                if self.failed:
+                    continue
+                
+                try:
+                    file.write(self.lines(actions))
+                    file.flush()
+                    self.written_count += len(actions)
+                except Exception as error:
+                    self.failed = True
+                    self.logger.error(f"RecordingJournal write failed, error: {error}")
+
+
+# Journals of the recordings that were not saved, oldest first
+def unfinalized_journals(directory: Path = Path(JOURNAL_DIRECTORY)) -> [Path]:
+    if not os.path.isdir(directory.absolute):
+        return []
+    
+    return sorted(PathUtils.directory_file_list(directory, JOURNAL_FILE_FORMAT), key=lambda path: os.path.getmtime(path.absolute))
+
+
+# Named after the time the recording started
+def new_journal_path(directory: Path) -> Path:
+    name = time.strftime('recording-%Y%m%d-%H%M%S')
+    result = PathUtils.combine_paths(directory, f'{name}.{JOURNAL_FILE_FORMAT}')
+    number = 1
+    
+    while os.path.exists(result.absolute):
+        number += 1
+        result = PathUtils.combine_paths(directory, f'{name}-{number}.{JOURNAL_FILE_FORMAT}')
+    
+    return result
+
+
+# Reads a journal, including one left behind by an interrupted recording
+def read_journal(path: Path) -> ScriptActions:
+    parser = di[ScriptActionParserProtocol]
+    result = ScriptActionColumns()
+    
+    with open(path.absolute, 'r', encoding='utf-8') as file:
+        for number, line in enumerate(file):
+            if len(line.strip()) == 0:
+                continue
+            
+            try:
+                parser.parse_to_columns(json.loads(line), result)
+            except ValueError as error:
+                # The last line may be incomplete if the recording was interrupted
+                di[LoggerProtocol].for_subsystem(LogSubsystem.RECORDER).warning(f"RecordingJournal skipped line {number + 1}, error: {error}")
+    
+    return ScriptActions(result)
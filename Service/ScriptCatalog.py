@@ -0,0 +1,263 @@
+import enum
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from kink import di
+from Model.ScriptCatalogEntry import ScriptCatalogEntry
+from Model.ScriptActions import ScriptActions
+from Parser.ScriptDataParser import ScriptDataParserProtocol, JSON_INFO, JSON_CONFIGURATION, JSON_EVENT_COUNT, JSON_DURATION
+from Service.ScriptStorage import ScriptStorage, SCRIPT_FILE_FORMATS
+from Utilities import Path as PathUtils
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+from Utilities.Path import Path
+
+CATALOG_FILE_NAME = '.catalog' # Not a script file format, so it's never listed as a script
+CATALOG_VERSION = 1
+MAX_READ_WORKERS = min(8, os.cpu_count() or 1) # Threads reading the changed scripts
+PROGRESS_INTERVAL = 0.1 # Time (in seconds) between publications of the entries read so far
+
+KEY_VERSION = 'version'
+KEY_SCRIPTS = 'scripts'
+KEY_MODIFIED_TIME = 'modified-time'
+KEY_FILE_SIZE = 'file-size'
+
+
+class ScriptCatalogSort(enum.IntEnum):
+    NAME = 0
+    DURATION = 1
+    EVENT_COUNT = 2
+    MODIFIED_TIME = 3
+    
+    def title(self) -> str:
+        match self:
+            case ScriptCatalogSort.NAME: return 'Name'
+            case ScriptCatalogSort.DURATION: return 'Longest'
+            case ScriptCatalogSort.EVENT_COUNT: return 'Most events'
+            case ScriptCatalogSort.MODIFIED_TIME: return 'Recently modified'
+    
+    def key(self, entry: ScriptCatalogEntry):
+        match self:
+            case ScriptCatalogSort.NAME: return entry.name().lower()
+            case ScriptCatalogSort.DURATION: return -entry.duration
+            case ScriptCatalogSort.EVENT_COUNT: return -entry.event_count
+            case ScriptCatalogSort.MODIFIED_TIME: return -entry.modified_time
+
+
+# Index of the summaries of the scripts in a directory, stored in the directory itself
+# Only the files whose modification time or size changed since the last update are read again, by a pool of threads
+# update() can be called from a background thread, query() from any thread
+# While updating, the entries read so far are published every PROGRESS_INTERVAL, and on_progress is called
+# Setting cancel_event stops the update, the entries read until then are kept and saved
+class ScriptCatalog:
+    
+    # - Init
+    
+    def __init__(self, directory: Path, file_formats=SCRIPT_FILE_FORMATS):
+        self.directory = directory
+        self.file_formats = file_formats
+        self.path = PathUtils.combine_paths(directory, CATALOG_FILE_NAME)
+        self.entries = {} # By file name, replaced as a whole by update()
+        self.loaded = False
+        self.parser = di[ScriptDataParserProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.STORAGE)
+    
+    # - Properties
+    
+    def get_directory(self) -> Path: return self.directory
+    def get_path(self) -> Path: return self.path
+    
+    def count(self) -> int:
+        return len(self.entries)
+    
+    # Entries whose name or file name contain the filter text (case insensitive), sorted
+    def query(self, filter_text='', sort=ScriptCatalogSort.NAME) -> [ScriptCatalogEntry]:
+        text = filter_text.strip().lower()
+        result = [entry for entry in self.entries.values()
+                  if len(text) == 0 or text in entry.name().lower() or text in entry.file_name.lower()]
+        result.sort(key=lambda entry: (sort.key(entry), entry.file_name))
+        return result
+    
+    # - Actions
+    
+    # Brings the catalog up to date with the directory, returns the number of files read
+    def update(self, on_progress=None, cancel_event=None) -> int:
+        if not self.loaded:
+            self.load()
+        
+        entries = {}
+        changed_files = []
+        
+        for file_path in PathUtils.directory_file_list(self.directory, self.file_formats):
+            stat = self.reuse_entry(entries, file_path)
+            
+            if stat is not None:
+                changed_files.append((file_path, stat))
+        
+        read_count = self.read_entries(entries, changed_files, on_progress, cancel_event)
+        self.replace_entries(entries, read_count)
+        return read_count
+    
+    # Brings only the given files up to date, for changes reported by a directory watcher
+    # Returns the number of files read
+    def update_files(self, file_names, on_progress=None, cancel_event=None) -> int:
+        if not self.loaded:
+            self.load()
+        
+        entries = dict(self.entries)
+        changed_files = []
+        
+        for file_name in file_names:
+            entries.pop(file_name, None)
+            
+            if not PathUtils.filter_file_format(file_name, self.file_formats):
+                continue
+            
+            file_path = PathUtils.combine_paths(self.directory, file_name)
+            stat = self.reuse_entry(entries, file_path)
+            
+            if stat is not None:
+                changed_files.append((file_path, stat))
+        
+        read_count = self.read_entries(entries, changed_files, on_progress, cancel_event)
+        self.replace_entries(entries, read_count)
+        return read_count
+    
+    def load(self):
+        self.loaded = True
+        
+        if not os.path.isfile(self.path.absolute):
+            return
+        
+        try:
+            with open(self.path.absolute, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            
+            if data[KEY_VERSION] != CATALOG_VERSION:
+                raise ValueError(f'unsupported version {data[KEY_VERSION]}')
+            
+            self.entries = {file_name: self.parse_entry(file_name, values) for file_name, values in data[KEY_SCRIPTS].items()}
+        except Exception as error:
+            # Rebuilt by the next update
+            self.logger.warning(f"ScriptCatalog ignored '{self.path.absolute}', error: {error}")
+            self.entries = {}
+    
+    def save(self):
+        data = {
+            KEY_VERSION: CATALOG_VERSION,
+            KEY_SCRIPTS: {file_name: self.entry_to_dict(entry) for file_name, entry in self.entries.items()}
+        }
+        
+        temporary_path = f'{self.path.absolute}.tmp'
+        
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+            
+            os.replace(temporary_path, self.path.absolute)
+        except OSError as error:
+            self.logger.error(f"ScriptCatalog failed to write '{self.path.absolute}', error: {error}")
+    
+    # - Helpers
+    
+    # Adds the current entry of the file to entries
+    # Returns the file stat if the file changed and has to be read, None otherwise
+    def reuse_entry(self, entries: dict, file_path: Path):
+        file_name = file_path.last_component()
+        
+        try:
+            stat = os.stat(file_path.absolute)
+        except OSError:
+            return None # Removed
+        
+        entry = self.entries.get(file_name)
+        
+        if entry is not None and entry.is_valid_for(stat.st_mtime_ns, stat.st_size):
+            entries[file_name] = entry
+            return None
+        
+        return stat
+    
+    # Reads the changed files concurrently and adds their entries, returns the number of files read
+    def read_entries(self, entries: dict, changed_files: list, on_progress, cancel_event) -> int:
+        if len(changed_files) == 0:
+            return 0
+        
+        read_count = 0
+        progress_time = time.monotonic()
+        executor = ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(changed_files)),
+                                      thread_name_prefix='ScriptCatalog')
+        
+        try:
+            futures = [executor.submit(self.read_entry, file_path, stat) for file_path, stat in changed_files]
+            
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    self.logger.info(f'ScriptCatalog update cancelled, {read_count} of {len(changed_files)} read')
+                    break
+                
+                try:
+                    entry = future.result()
+                except Exception:
+                    continue # Not a valid script, the error is logged by the storage
+                
+                entries[entry.file_name] = entry
+                read_count += 1
+                
+                if on_progress is not None and time.monotonic() - progress_time >= PROGRESS_INTERVAL:
+                    progress_time = time.monotonic()
+                    self.entries = dict(entries)
+                    on_progress()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        return read_count
+    
+    def replace_entries(self, entries: dict, read_count: int):
+        changed = read_count > 0 or entries.keys() != self.entries.keys()
+        self.entries = entries
+        
+        if changed:
+            self.save()
+        
+        self.logger.info(f'ScriptCatalog updated, {len(entries)} script(s), {read_count} read')
+    
+    def read_entry(self, file_path: Path, stat) -> ScriptCatalogEntry:
+        storage = ScriptStorage(file_path)
+        summary = storage.read_script_summary_from_file()
+        
+        if summary.has_stats():
+            event_count = summary.get_event_count()
+            duration = summary.get_duration()
+        else:
+            # Written before the header had the event count and duration, read once
+            actions = storage.read_script_data_from_file(columnar=True).get_actions()
+            event_count = actions.count()
+            duration = actions.duration()
+            summary.event_count = event_count
+            summary.duration = duration
+        
+        return ScriptCatalogEntry(file_path.last_component(), stat.st_mtime_ns, stat.st_size, summary, event_count, duration)
+    
+    # Same info and configuration keys as the script formats
+    def entry_to_dict(self, entry: ScriptCatalogEntry) -> dict:
+        info = self.parser.parse_script_info_to_dict(entry.summary.get_info(), ScriptActions([]))
+        info[JSON_EVENT_COUNT] = entry.event_count
+        info[JSON_DURATION] = entry.duration
+        return {
+            KEY_MODIFIED_TIME: entry.modified_time,
+            KEY_FILE_SIZE: entry.file_size,
+            JSON_INFO: info,
+            JSON_CONFIGURATION: self.parser.parse_script_config_to_dict(entry.summary.get_config())
+        }
+    
+    def parse_entry(self, file_name: str, values: dict) -> ScriptCatalogEntry:
+        summary = self.parser.parse_json_to_script_summary(values[JSON_INFO], values[JSON_CONFIGURATION])
+        summary.set_file_path(PathUtils.combine_paths(self.directory, file_name))
+        
+        if not summary.has_stats():
+            raise ValueError(f"Bad catalog entry '{file_name}', no event count or duration")
+        
+        return ScriptCatalogEntry(file_name, values[KEY_MODIFIED_TIME], values[KEY_FILE_SIZE], summary,
+                                  summary.get_event_count(), summary.get_duration())
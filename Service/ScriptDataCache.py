@@ -0,0 +1,48 @@
+import os
+import threading
+from typing import Protocol
+from kink import inject
+from Model.ScriptData import ScriptData
+from Service.ScriptStorage import ScriptStorage
+from Utilities.Path import Path
+
+
+class ScriptDataCacheProtocol(Protocol):
+    def read_script_data(self, path: Path) -> ScriptData: return None
+    def clear(self): pass
+
+
+# Parsed scripts, keyed by path and modification time
+# The returned scripts are shared, they must not be modified
+@inject(alias=ScriptDataCacheProtocol)
+class ScriptDataCache(ScriptDataCacheProtocol):
+    
+    # - Init
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+    
+    # - Actions
+    
+    def read_script_data(self, path: Path) -> ScriptData:
+        key = path.absolute
+        modified_time = os.stat(key).st_mtime_ns
+        
+        with self.lock:
+            entry = self.entries.get(key)
+        
+        if entry is not None and entry[0] == modified_time:
+            return entry[1]
+        
+        # Cached scripts are kept for the lifetime of the app, so they are stored in the compact form
+        result = ScriptStorage(path).read_script_data_from_file(columnar=True)
+        
+        with self.lock:
+            self.entries[key] = (modified_time, result)
+        
+        return result
+    
+    def clear(self):
+        with self.lock:
+            self.entries = {}
@@ -0,0 +1,167 @@
+import os
+import time
+from typing import Protocol
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher
+from kink import di
+from Model.ScriptDirectoryChanges import ScriptDirectoryChanges, compare_scans
+from Service.ScriptStorage import SCRIPT_FILE_FORMATS
+from Utilities import Path as PathUtils
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+from Utilities.Path import Path
+
+DEBOUNCE_INTERVAL = 300 # Quiet time (in ms) after the last change before the directory is scanned
+DEBOUNCE_MAX_DELAY = 2 # Time (in seconds) after the first change when the directory is scanned even if changes continue
+POLL_INTERVAL = 2000 # Time (in ms) between scans when the directory can't be watched
+MAX_WATCHED_FILES = 4096 # Files watched for changes in place, beyond that the directory is polled too
+
+
+class ScriptDirectoryWatcherDelegate(Protocol):
+    def on_scripts_changed(self, sender, changes: ScriptDirectoryChanges): pass
+
+
+# Reports the script files added, modified and removed in a directory
+# Uses the system file watcher (inotify on Linux), or polls the directory when it's not available
+# Bursts of changes, like many files copied at once, are reported together after a single scan
+class ScriptDirectoryWatcher(QObject):
+    
+    # - Init
+    
+    def __init__(self, directory: Path, file_formats=SCRIPT_FILE_FORMATS):
+        super(ScriptDirectoryWatcher, self).__init__()
+        self.delegate = None
+        self.directory = directory
+        self.file_formats = file_formats
+        self.running = False
+        self.watcher = None
+        self.scan_result = {} # File name: (modification time in ns, size)
+        self.first_change_time = 0
+        
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(DEBOUNCE_INTERVAL)
+        self.debounce_timer.timeout.connect(self.on_scan)
+        
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(False)
+        self.poll_timer.setInterval(POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.on_scan)
+        
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.STORAGE)
+    
+    # - Properties
+    
+    def get_delegate(self) -> ScriptDirectoryWatcherDelegate: return self.delegate
+    def set_delegate(self, delegate): self.delegate = delegate
+    def get_directory(self) -> Path: return self.directory
+    
+    def is_running(self) -> bool:
+        return self.running
+    
+    def is_polling(self) -> bool:
+        return self.poll_timer.isActive()
+    
+    # - Actions
+    
+    def start(self):
+        assert not self.running
+        
+        self.running = True
+        self.scan_result = self.scan()
+        
+        watcher = QFileSystemWatcher(self)
+        
+        if watcher.addPath(self.directory.absolute):
+            watcher.directoryChanged.connect(self.on_change)
+            watcher.fileChanged.connect(self.on_change)
+            self.watcher = watcher
+            self.update_watched_files()
+            self.logger.info(f"ScriptDirectoryWatcher watching '{self.directory.absolute}'")
+        else:
+            watcher.deleteLater()
+            self.poll_timer.start()
+            self.logger.warning(f"ScriptDirectoryWatcher can't watch '{self.directory.absolute}', polling")
+    
+    def stop(self):
+        assert self.running
+        
+        self.logger.info('ScriptDirectoryWatcher stop')
+        
+        self.running = False
+        self.debounce_timer.stop()
+        self.poll_timer.stop()
+        
+        if self.watcher is not None:
+            self.watcher.deleteLater()
+            self.watcher = None
+    
+    def on_change(self, path):
+        if not self.running:
+            return
+        
+        # Restarting the timer delays the scan until the burst ends, but not for longer than the max delay
+        if not self.debounce_timer.isActive():
+            self.first_change_time = time.monotonic()
+            self.debounce_timer.start()
+        elif time.monotonic() - self.first_change_time < DEBOUNCE_MAX_DELAY:
+            self.debounce_timer.start()
+    
+    def on_scan(self):
+        if not self.running:
+            return
+        
+        scan_result = self.scan()
+        changes = compare_scans(self.scan_result, scan_result)
+        self.scan_result = scan_result
+        
+        if self.watcher is not None:
+            self.update_watched_files()
+        
+        if changes.is_empty():
+            return
+        
+        self.logger.info(f'ScriptDirectoryWatcher {len(changes.added)} added, {len(changes.modified)} modified, '
+                         f'{len(changes.removed)} removed')
+        
+        if self.delegate is not None:
+            self.delegate.on_scripts_changed(self, changes)
+    
+    # - Helpers
+    
+    def scan(self) -> dict:
+        result = {}
+        
+        try:
+            file_paths = PathUtils.directory_file_list(self.directory, self.file_formats)
+        except OSError as error:
+            self.logger.error(f"ScriptDirectoryWatcher failed to list '{self.directory.absolute}', error: {error}")
+            return result
+        
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path.absolute)
+            except OSError:
+                continue # Removed while listing
+            
+            result[file_path.last_component()] = (stat.st_mtime_ns, stat.st_size)
+        
+        return result
+    
+    # Files are watched too, a file written in place doesn't change the directory
+    def update_watched_files(self):
+        watched = set(self.watcher.files())
+        wanted = set()
+        
+        for file_name in sorted(self.scan_result.keys())[:MAX_WATCHED_FILES]:
+            wanted.add(PathUtils.combine_paths(self.directory, file_name).absolute)
+        
+        if len(watched - wanted) > 0:
+            self.watcher.removePaths(list(watched - wanted))
+        
+        if len(wanted - watched) > 0:
+            self.watcher.addPaths(list(wanted - watched))
+        
+        if len(self.scan_result) > MAX_WATCHED_FILES and not self.poll_timer.isActive():
+            self.poll_timer.start()
+        elif len(self.scan_result) <= MAX_WATCHED_FILES and self.poll_timer.isActive():
+            self.poll_timer.stop()
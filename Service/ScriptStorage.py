@@ -1,11 +1,25 @@
+import codecs
 from kink import di
 from Model.ScriptData import ScriptData
 from Model.ScriptSummary import ScriptSummary
+from Parser.ScriptBinaryParser import ScriptBinaryParserProtocol, is_binary_script, binary_summary_size
 from Parser.ScriptDataParser import ScriptDataParserProtocol
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 from Utilities.Path import Path
 
+JSON_FILE_FORMAT = 'json'
+BINARY_FILE_FORMAT = 'mky'
+SCRIPT_FILE_FORMATS = (JSON_FILE_FORMAT, BINARY_FILE_FORMAT)
+SUMMARY_CHUNK_SIZE = 4096 # Bytes read at a time when looking for the summary of a script
+SUMMARY_MAX_SIZE = 1024 * 1024 # Bytes read before giving up and reading the whole script
 
+
+def is_binary_path(path: Path) -> bool:
+    return path.absolute.endswith(f'.{BINARY_FILE_FORMAT}')
+
+
+# Scripts are written in the format given by the file extension, and read in the format found in the file
 class ScriptStorage:
     
     # - Init
@@ -13,7 +27,8 @@ class ScriptStorage:
     def __init__(self, path: Path):
         self.file_path = path
         self.script_data_parser = di[ScriptDataParserProtocol]
-        self.logger = di[LoggerProtocol]
+        self.script_binary_parser = di[ScriptBinaryParserProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.STORAGE)
     
     # - Properties
     
@@ -26,27 +41,34 @@ class ScriptStorage:
         path = self.file_path.absolute
         
         self.logger.info(f"write data to \'{path}\'")
-
-        result = self.script_data_parser.parse_to_json(script)
-        file = open(path, permissions, encoding=encoding)
-        file.write(result)
-        file.close()
+        
+        if is_binary_path(self.file_path):
+            with open(path, f'{permissions}b') as file:
+                file.write(self.script_binary_parser.parse_to_bytes(script))
+        else:
+            result = self.script_data_parser.parse_to_json(script)
+            file = open(path, permissions, encoding=encoding)
+            file.write(result)
+            file.close()
         
         self.logger.info(f"data written {path}")
     
-    def read_script_data_from_file(self, permissions='r', encoding="utf-8", ignore_actions=False) -> ScriptData:
+    def read_script_data_from_file(self, permissions='r', encoding="utf-8", ignore_actions=False, columnar=False) -> ScriptData:
         path = self.file_path.absolute
         
         self.logger.info(f"read data from \'{path}\'...")
         
-        file = open(path, permissions, encoding=encoding)
+        file = open(path, f'{permissions}b')
         file_contents = file.read()
         
         try:
             if len(file_contents) == 0:
                 raise ValueError("empty file")
             
-            result = self.script_data_parser.parse_to_script(file_contents, ignore_actions=ignore_actions)
+            if is_binary_script(file_contents):
+                result = self.script_binary_parser.parse_to_script(file_contents, ignore_actions=ignore_actions, columnar=columnar)
+            else:
+                result = self.script_data_parser.parse_to_script(file_contents.decode(encoding), ignore_actions=ignore_actions, columnar=columnar)
         except Exception as error:
             self.logger.error(f"reading failed, error: {error}")
             file.close()
@@ -60,6 +82,56 @@ class ScriptStorage:
         
         return result
     
+    # Reads only the start of the file, the actions are not read
     def read_script_summary_from_file(self, permissions='r', encoding="utf-8") -> ScriptSummary:
-        script = self.read_script_data_from_file(permissions=permissions, encoding=encoding, ignore_actions=True)
-        return script.get_summary()
+        path = self.file_path.absolute
+        
+        with open(path, f'{permissions}b') as file:
+            data = file.read(SUMMARY_CHUNK_SIZE)
+            
+            try:
+                if len(data) == 0:
+                    raise ValueError("empty file")
+                
+                if is_binary_script(data):
+                    size = binary_summary_size(data)
+                    
+                    if size > len(data):
+                        data += file.read(size - len(data))
+                    
+                    result = self.script_binary_parser.parse_to_script(data, ignore_actions=True).get_summary()
+                else:
+                    result = self.read_json_summary(file, data, encoding)
+            except Exception as error:
+                self.logger.error(f"reading summary of '{path}' failed, error: {error}")
+                raise error
+        
+        if result is None:
+            # The summary is not at the start of the file
+            return self.read_script_data_from_file(permissions=permissions, encoding=encoding, ignore_actions=True).get_summary()
+        
+        result.set_file_path(self.file_path)
+        return result
+    
+    # - Helpers
+    
+    # Reads more of the file until the summary is found
+    # Returns None if the end of the file or SUMMARY_MAX_SIZE is reached first
+    def read_json_summary(self, file, data: bytes, encoding) -> ScriptSummary:
+        decoder = codecs.getincrementaldecoder(encoding)()
+        text = decoder.decode(data)
+        size = len(data)
+        
+        while True:
+            result = self.script_data_parser.parse_to_summary(text)
+            
+            if result is not None:
+                return result
+            
+            data = file.read(SUMMARY_CHUNK_SIZE)
+            size += len(data)
+            
+            if len(data) == 0 or size > SUMMARY_MAX_SIZE:
+                return None
+            
+            text += decoder.decode(data)
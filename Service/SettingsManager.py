@@ -9,11 +9,18 @@ from pynput.keyboard import Key as KeyboardKey
 from pynput.keyboard import KeyCode as KeyboardKeyCode
 from Parser.KeyboardKeyParser import key_to_string, string_to_key
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 from Utilities.Path import Path
 
 VERSION = '1.0'
 SCRIPTS_DEFAULT_DIR = 'scripts'
 SCRIPT_FILE_FORMAT = 'json'
+RECORD_MOVE_INTERVAL = '0' # Seconds, 0 = every mouse move is recorded
+RECORD_MOVE_DISTANCE = '0' # Pixels, 0 = every mouse move is recorded
+RECORD_PATH_TOLERANCE = '0' # Pixels, 0 = the mouse paths are not simplified
+RECORD_TO_JOURNAL = 'false'
+PLAYBACK_TIMING_REPORT = 'false'
+COMMAND_TIMEOUT = '0' # Seconds, 0 = no limit
 
 ROOT = 'settings'
 KEY_VERSION = 'version'
@@ -30,6 +37,12 @@ class SettingsManagerField(enum.StrEnum):
     RECORD_HOTKEY = 'record'
     SCRIPTS_PATH = 'scripts-path'
     SCRIPTS_FILE_FORMAT = 'scripts-file-format'
+    RECORD_MOVE_INTERVAL = 'record-move-interval'
+    RECORD_MOVE_DISTANCE = 'record-move-distance'
+    RECORD_PATH_TOLERANCE = 'record-path-tolerance'
+    RECORD_TO_JOURNAL = 'record-to-journal'
+    PLAYBACK_TIMING_REPORT = 'playback-timing-report'
+    COMMAND_TIMEOUT = 'command-timeout'
     
     def is_hotkey(self) -> bool:
         return (self == SettingsManagerField.PLAY_HOTKEY or
@@ -38,6 +51,27 @@ class SettingsManagerField(enum.StrEnum):
     
     def is_path(self) -> bool:
         return self == SettingsManagerField.SCRIPTS_PATH
+    
+    def is_number(self) -> bool:
+        return (self == SettingsManagerField.RECORD_MOVE_INTERVAL or
+                self == SettingsManagerField.RECORD_MOVE_DISTANCE or
+                self == SettingsManagerField.RECORD_PATH_TOLERANCE or
+                self == SettingsManagerField.COMMAND_TIMEOUT)
+    
+    def is_flag(self) -> bool:
+        return (self == SettingsManagerField.RECORD_TO_JOURNAL or
+                self == SettingsManagerField.PLAYBACK_TIMING_REPORT)
+
+
+# Used when a settings file was written before the field existed
+DEFAULT_CONFIG_VALUES = {
+    SettingsManagerField.RECORD_MOVE_INTERVAL: RECORD_MOVE_INTERVAL,
+    SettingsManagerField.RECORD_MOVE_DISTANCE: RECORD_MOVE_DISTANCE,
+    SettingsManagerField.RECORD_PATH_TOLERANCE: RECORD_PATH_TOLERANCE,
+    SettingsManagerField.RECORD_TO_JOURNAL: RECORD_TO_JOURNAL,
+    SettingsManagerField.PLAYBACK_TIMING_REPORT: PLAYBACK_TIMING_REPORT,
+    SettingsManagerField.COMMAND_TIMEOUT: COMMAND_TIMEOUT
+}
 
 
 @dataclass
@@ -117,7 +151,7 @@ class SettingsManager:
     def __init__(self):
         self.path = Path('settings.json')
         self.values = SettingsManagerValues({}, {}, {})
-        self.logger = di[LoggerProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.STORAGE)
         self.indent = DEFAULT_INDENT
         
         success = False
@@ -141,9 +175,9 @@ class SettingsManager:
     def get_config(self) -> {}: return self.values.config # other string values
     
     def field_value(self, key: SettingsManagerField):
-        assert key in self.values.all_values
+        assert key in self.values.all_values or key in DEFAULT_CONFIG_VALUES
         
-        result = self.values.all_values[key]
+        result = self.values.all_values.get(key, DEFAULT_CONFIG_VALUES.get(key))
         
         if key.is_hotkey():
             result = string_to_key(result)
@@ -151,6 +185,16 @@ class SettingsManager:
         if key.is_path():
             result = Path(result)
         
+        if key.is_number():
+            try:
+                result = float(result)
+            except ValueError:
+                self.logger.warning(f"Bad settings value for {key}: {result}")
+                result = float(DEFAULT_CONFIG_VALUES[key])
+        
+        if key.is_flag():
+            result = result == 'true'
+        
         return result
     
     def set_field_value(self, key: SettingsManagerField, value):
@@ -179,6 +223,12 @@ class SettingsManager:
         self.set_field_value(SettingsManagerField.RECORD_HOTKEY, KeyboardKey.esc)
         self.set_field_value(SettingsManagerField.SCRIPTS_PATH, SCRIPTS_DEFAULT_DIR)
         self.set_field_value(SettingsManagerField.SCRIPTS_FILE_FORMAT, SCRIPT_FILE_FORMAT)
+        self.set_field_value(SettingsManagerField.RECORD_MOVE_INTERVAL, RECORD_MOVE_INTERVAL)
+        self.set_field_value(SettingsManagerField.RECORD_MOVE_DISTANCE, RECORD_MOVE_DISTANCE)
+        self.set_field_value(SettingsManagerField.RECORD_PATH_TOLERANCE, RECORD_PATH_TOLERANCE)
+        self.set_field_value(SettingsManagerField.RECORD_TO_JOURNAL, RECORD_TO_JOURNAL)
+        self.set_field_value(SettingsManagerField.PLAYBACK_TIMING_REPORT, PLAYBACK_TIMING_REPORT)
+        self.set_field_value(SettingsManagerField.COMMAND_TIMEOUT, COMMAND_TIMEOUT)
     
     def write_to_file(self, permissions='w', encoding="utf-8"):
         self.logger.info(f"write settings to \'{self.path.absolute}\'")
@@ -0,0 +1,181 @@
+import enum
+import queue
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Protocol
+from kink import inject, di
+from mss import mss
+from mss import tools as mss_tools
+from Utilities.Clock import ClockProtocol, ns_to_seconds
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+from Utilities.Path import Path
+
+MAX_QUEUED_FRAMES = 8 # When full, capturing blocks until a frame is encoded
+ENCODER_COUNT = 1
+PNG_COMPRESSION_LEVEL = 1 # 0-9, lower is faster
+PRIMARY_MONITOR = 1
+
+
+class SnapshotFormat(enum.StrEnum):
+    PNG = 'png'
+    BMP = 'bmp'
+    RAW = 'raw' # BGRA pixels, no header
+
+
+@dataclass
+class SnapshotRegion:
+    left: int
+    top: int
+    width: int
+    height: int
+
+
+@dataclass
+class SnapshotFrame:
+    image: object # mss ScreenShot
+    path: str
+    image_format: SnapshotFormat
+    capture_time: int # ns
+
+
+class SnapshotServiceProtocol(Protocol):
+    def file_extension(self) -> str: return ''
+    def capture(self, path: Path, region: SnapshotRegion = None): pass
+    def flush(self): pass
+
+
+# Takes screenshots on the caller's thread and hands the raw frames to background encoders
+@inject(alias=SnapshotServiceProtocol)
+class SnapshotService(SnapshotServiceProtocol):
+    
+    # - Init
+    
+    def __init__(self):
+        self.image_format = SnapshotFormat.PNG
+        self.png_compression_level = PNG_COMPRESSION_LEVEL
+        self.frames = queue.Queue(maxsize=MAX_QUEUED_FRAMES)
+        self.grabbers = threading.local() # mss instances cannot be shared between threads
+        self.encoders = []
+        self.lock = threading.Lock()
+        self.encoded_count = 0
+        self.failed_count = 0
+        self.last_encode_latency = 0
+        self.total_encode_latency = 0
+        self.clock = di[ClockProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+    
+    # - Properties
+    
+    def get_image_format(self) -> SnapshotFormat: return self.image_format
+    def set_image_format(self, value): self.image_format = SnapshotFormat(value)
+    def get_png_compression_level(self) -> int: return self.png_compression_level
+    def set_png_compression_level(self, value): self.png_compression_level = value
+    
+    def file_extension(self) -> str:
+        return f'.{self.image_format.value}'
+    
+    def queue_depth(self) -> int:
+        return self.frames.qsize()
+    
+    def get_encoded_count(self) -> int:
+        with self.lock:
+            result = self.encoded_count
+        
+        return result
+    
+    # Time (in seconds) from capture until the file is written
+    def get_last_encode_latency(self) -> float:
+        with self.lock:
+            result = ns_to_seconds(self.last_encode_latency)
+        
+        return result
+    
+    def get_average_encode_latency(self) -> float:
+        with self.lock:
+            result = ns_to_seconds(self.total_encode_latency // self.encoded_count) if self.encoded_count > 0 else 0
+        
+        return result
+    
+    # - Actions
+    
+    def capture(self, path: Path, region: SnapshotRegion = None):
+        grabber = self.grabber()
+        
+        if region is not None:
+            monitor = {'left': region.left, 'top': region.top, 'width': region.width, 'height': region.height}
+        else:
+            monitor = grabber.monitors[PRIMARY_MONITOR]
+        
+        frame = SnapshotFrame(grabber.grab(monitor), path.absolute, self.image_format, self.clock.now_ns())
+        
+        self.start_encoders()
+        
+        if self.frames.full():
+            self.logger.warning('SnapshotService: encoder queue is full, waiting')
+        
+        self.frames.put(frame)
+    
+    # Blocks until all captured frames are written
+    def flush(self):
+        self.frames.join()
+    
+    # - Helpers
+    
+    def grabber(self):
+        if not hasattr(self.grabbers, 'value'):
+            self.grabbers.value = mss()
+        
+        return self.grabbers.value
+    
+    def start_encoders(self):
+        with self.lock:
+            while len(self.encoders) < ENCODER_COUNT:
+                encoder = threading.Thread(target=self.run_encoder, name='SnapshotService.encoder', daemon=True)
+                self.encoders.append(encoder)
+                encoder.start()
+    
+    def run_encoder(self):
+        while True:
+            frame = self.frames.get()
+            
+            try:
+                self.encode(frame)
+                latency = self.clock.now_ns() - frame.capture_time
+                
+                with self.lock:
+                    self.encoded_count += 1
+                    self.last_encode_latency = latency
+                    self.total_encode_latency += latency
+                
+                self.logger.info(f"snapshot saved to '{frame.path}' in {ns_to_seconds(latency):.3f}s")
+            except Exception as error:
+                with self.lock:
+                    self.failed_count += 1
+                
+                self.logger.error(f"snapshot failed, error: {error}")
+            finally:
+                self.frames.task_done()
+    
+    def encode(self, frame: SnapshotFrame):
+        image = frame.image
+        
+        match frame.image_format:
+            case SnapshotFormat.PNG:
+                mss_tools.to_png(image.rgb, image.size, level=self.png_compression_level, output=frame.path)
+            case SnapshotFormat.BMP:
+                with open(frame.path, 'wb') as file:
+                    file.write(bmp_header(image.width, image.height))
+                    file.write(image.raw)
+            case SnapshotFormat.RAW:
+                with open(frame.path, 'wb') as file:
+                    file.write(image.raw)
+
+
+# 32-bit BGRA bitmap, stored top-down (negative height) so the raw frame can be written as is
+def bmp_header(width: int, height: int) -> bytes:
+    pixels_size = width * height * 4
+    file_header = struct.pack('<2sIHHI', b'BM', 14 + 40 + pixels_size, 0, 0, 14 + 40)
+    info_header = struct.pack('<IiiHHIIiiII', 40, width, -height, 1, 32, 0, pixels_size, 2835, 2835, 0, 0)
+    return file_header + info_header
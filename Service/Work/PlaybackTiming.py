@@ -0,0 +1,246 @@
+import os
+from array import array
+from dataclasses import dataclass
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Utilities.Clock import ClockProtocol, ns_to_seconds
+from Utilities.Path import Path
+
+SUB_BUCKETS_BITS = 2 # 4 buckets per power of two, values are reported within 25%
+SUB_BUCKETS = 1 << SUB_BUCKETS_BITS
+BUCKET_COUNT = 40 * SUB_BUCKETS # Up to 2^40 us, about 12 days
+LATEST_ACTIONS_COUNT = 10
+
+
+# Histogram of durations in ns, with microsecond resolution and log scaled buckets
+# Recording is O(1) and allocation free, percentiles are estimated from the bucket bounds
+class LatencyHistogram:
+    
+    # - Init
+    
+    def __init__(self):
+        self.counts = array('Q', bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0
+        self.max_value = 0
+    
+    # - Properties
+    
+    def average(self) -> int:
+        return self.total // self.count if self.count > 0 else 0
+    
+    # Upper bound (in ns) of the bucket holding the given percentile (0-100) of the values
+    def percentile(self, value) -> int:
+        if self.count == 0:
+            return 0
+        
+        rank = max(1, -(-self.count * value // 100))
+        total = 0
+        
+        for index, count in enumerate(self.counts):
+            total += count
+            
+            if total >= rank:
+                return min(bucket_upper_bound(index), self.max_value)
+        
+        return self.max_value
+    
+    # (lower bound ns, upper bound ns, count) of every non empty bucket
+    def buckets(self) -> [tuple]:
+        return [(bucket_lower_bound(index), bucket_upper_bound(index), count) for index, count in enumerate(self.counts) if count > 0]
+    
+    # - Actions
+    
+    def record(self, value: int):
+        value = max(0, value)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        
+        if value > self.max_value:
+            self.max_value = value
+
+
+def bucket_index(value_ns: int) -> int:
+    microseconds = value_ns // 1000
+    
+    if microseconds < SUB_BUCKETS:
+        return microseconds
+    
+    exponent = microseconds.bit_length() - 1
+    sub_bucket = (microseconds >> (exponent - SUB_BUCKETS_BITS)) & (SUB_BUCKETS - 1)
+    return min((exponent - SUB_BUCKETS_BITS + 1) * SUB_BUCKETS + sub_bucket, BUCKET_COUNT - 1)
+
+
+def bucket_lower_bound(index) -> int:
+    if index < SUB_BUCKETS:
+        return index * 1000
+    
+    exponent = index // SUB_BUCKETS + SUB_BUCKETS_BITS - 1
+    sub_bucket = index % SUB_BUCKETS
+    return ((SUB_BUCKETS + sub_bucket) << (exponent - SUB_BUCKETS_BITS)) * 1000
+
+
+def bucket_upper_bound(index) -> int:
+    return bucket_lower_bound(index + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class PlaybackTimingSummary:
+    fired_count: int = 0
+    lateness_p50: float = 0 # Seconds
+    lateness_p95: float = 0
+    lateness_p99: float = 0
+    lateness_max: float = 0
+    throughput: float = 0 # Actions per second, pauses excluded
+
+
+# Scheduled vs actual fire time of every action of the root script
+# The per action arrays are allocated once per script and overwritten by every repeat,
+# the histograms include all repeats
+class PlaybackTimingRecorder:
+    
+    # - Init
+    
+    def __init__(self, timeline: ScriptActionTimeline, clock: ClockProtocol):
+        count = timeline.count()
+        self.timeline = timeline
+        self.clock = clock
+        self.lateness = array('q', bytes(8 * count)) # ns, actual fire time - scheduled time
+        self.durations = array('q', bytes(8 * count)) # ns, time spent in execute
+        self.fired = array('B', bytes(count))
+        self.lateness_histogram = LatencyHistogram()
+        self.fired_count = 0
+        self.run_count = 0
+        self.start_time = 0
+        self.end_time = 0
+        self.pause_start_time = 0
+        self.pause_time = 0
+    
+    # - Properties
+    
+    def get_run_count(self) -> int: return self.run_count
+    def get_lateness_histogram(self) -> LatencyHistogram: return self.lateness_histogram
+    
+    # Total time (in seconds) spent paused by the user
+    def get_pause_time(self) -> float:
+        return ns_to_seconds(self.pause_time)
+    
+    # Time (in seconds) since the first run started, pauses excluded
+    def active_time(self) -> float:
+        if self.start_time == 0:
+            return 0
+        
+        end_time = self.end_time if self.end_time != 0 else self.clock.now_ns()
+        paused = self.pause_time + (end_time - self.pause_start_time if self.pause_start_time != 0 else 0)
+        return ns_to_seconds(end_time - self.start_time - paused)
+    
+    def summary(self) -> PlaybackTimingSummary:
+        histogram = self.lateness_histogram
+        active_time = self.active_time()
+        
+        return PlaybackTimingSummary(fired_count=self.fired_count,
+                                     lateness_p50=ns_to_seconds(histogram.percentile(50)),
+                                     lateness_p95=ns_to_seconds(histogram.percentile(95)),
+                                     lateness_p99=ns_to_seconds(histogram.percentile(99)),
+                                     lateness_max=ns_to_seconds(histogram.max_value),
+                                     throughput=self.fired_count / active_time if active_time > 0 else 0)
+    
+    # - Actions
+    
+    def begin_run(self):
+        if self.start_time == 0:
+            self.start_time = self.clock.now_ns()
+        
+        self.run_count += 1
+        
+        self.fired = array('B', bytes(len(self.fired)))
+    
+    def end(self):
+        if self.pause_start_time != 0:
+            self.resume()
+        
+        self.end_time = self.clock.now_ns()
+    
+    def pause(self):
+        if self.pause_start_time == 0:
+            self.pause_start_time = self.clock.now_ns()
+    
+    def resume(self):
+        if self.pause_start_time != 0:
+            self.pause_time += self.clock.now_ns() - self.pause_start_time
+            self.pause_start_time = 0
+    
+    def record(self, index: int, lateness: int, duration: int):
+        self.lateness[index] = lateness
+        self.durations[index] = duration
+        self.fired[index] = 1
+        self.lateness_histogram.record(lateness)
+        self.fired_count += 1
+    
+    def write_report(self, path: Path, title: str, load_time: float, nested_count: int):
+        directory = os.path.dirname(path.absolute)
+        
+        if len(directory) > 0 and not os.path.isdir(directory):
+            os.makedirs(directory)
+        
+        with open(path.absolute, 'w', encoding='utf-8') as file:
+            file.write(self.report(title, load_time, nested_count))
+    
+    # - Helpers
+    
+    def report(self, title: str, load_time: float, nested_count: int) -> str:
+        summary = self.summary()
+        lines = [f'Playback report: {title}',
+                 '',
+                 f'Runs: {self.run_count}',
+                 f'Actions fired: {summary.fired_count}',
+                 f'Active time: {self.active_time():.3f}s',
+                 f'Pause time: {self.get_pause_time():.3f}s',
+                 f'Load time: {load_time:.3f}s ({nested_count} nested script(s))',
+                 f'Throughput: {summary.throughput:.1f} actions/s',
+                 '',
+                 'Lateness (scheduled vs actual fire time)',
+                 f'p50: {format_ms(summary.lateness_p50)}',
+                 f'p95: {format_ms(summary.lateness_p95)}',
+                 f'p99: {format_ms(summary.lateness_p99)}',
+                 f'max: {format_ms(summary.lateness_max)}',
+                 '',
+                 'Lateness histogram']
+        
+        for lower_bound, upper_bound, count in self.lateness_histogram.buckets():
+            range_text = f'{format_ms(ns_to_seconds(lower_bound))} - {format_ms(ns_to_seconds(upper_bound))}'
+            lines.append(f'{range_text:>24}: {count}')
+        
+        fired_indices = [index for index in range(len(self.fired)) if self.fired[index] != 0]
+        types = {}
+        
+        for index in fired_indices:
+            action_type = self.timeline.action_type(index)
+            values = types.setdefault(action_type, [0, 0, 0, 0]) # count, total duration, max duration, max lateness
+            values[0] += 1
+            values[1] += self.durations[index]
+            values[2] = max(values[2], self.durations[index])
+            values[3] = max(values[3], self.lateness[index])
+        
+        lines.append('')
+        lines.append('Actions by type, last run (count, average duration, max duration, max lateness)')
+        
+        for action_type, values in sorted(types.items(), key=lambda item: item[1][2], reverse=True):
+            average = ns_to_seconds(values[1] // values[0])
+            lines.append(f'{action_type.value}: {values[0]}, {format_ms(average)}, '
+                         f'{format_ms(ns_to_seconds(values[2]))}, {format_ms(ns_to_seconds(values[3]))}')
+        
+        latest = sorted(fired_indices, key=lambda index: self.lateness[index], reverse=True)[:LATEST_ACTIONS_COUNT]
+        
+        lines.append('')
+        lines.append('Most late actions, last run (index, type, lateness, duration)')
+        
+        for index in latest:
+            lines.append(f'{index}, {self.timeline.action_type(index).value}, '
+                         f'{format_ms(ns_to_seconds(self.lateness[index]))}, {format_ms(ns_to_seconds(self.durations[index]))}')
+        
+        return '\n'.join(lines) + '\n'
+
+
+def format_ms(seconds: float) -> str:
+    return f'{seconds * 1000:.3f}ms'
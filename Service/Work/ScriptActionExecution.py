@@ -9,6 +9,10 @@ class ScriptActionExecution(Protocol):
     
     def pause(self): pass
     def resume(self): pass
+    def cancel(self): pass
     
     # Returns the result of is_running().
     def update(self) -> bool: pass
+    
+    # Seconds until the execution has work to do, None when it has to be polled.
+    def time_until_next_action(self): return None
@@ -1,45 +1,121 @@
+import os
 from typing import Protocol, Any
 from kink import di, inject
 from Model.ScriptAction import ScriptAction
+from Model.ScriptActionColumns import ScriptActionColumns, INPUT_ACTION_TYPES
+from Model.ScriptActionTimeline import ScriptActionTimeline
 from Model.ScriptCommandAction import ScriptCommandAction
 from Model.ScriptInputEventAction import ScriptInputEventAction
 from Model.ScriptMessageAction import ScriptMessageAction
 from Model.ScriptRunAction import ScriptRunAction, NOOPScriptRunAction
 from Model.ScriptSnapshotAction import ScriptSnapshotAction
-from Service.ScriptStorage import ScriptStorage
+from Service.CommandProcessPool import CommandProcessPoolProtocol
+from Service.EventSimulator import MouseEventSimulatorProtocol, KeyboardEventSimulatorProtocol
+from Service.OSNotificationCenter import OSNotificationCenterProtocol
+from Service.ScriptDataCache import ScriptDataCacheProtocol
 from Service.SettingsManager import SettingsManagerField, SettingsManagerProtocol
+from Service.SnapshotService import SnapshotServiceProtocol
 from Service.Work.ScriptActionExecutionCluster import ScriptActionMessageExecution, ScriptActionScriptExecution, \
-    ScriptActionKeyExecution, ScriptSnapshotExecution, ScriptNOOPExecution, ScriptCommandExecution
+    ScriptActionKeyExecution, ScriptSnapshotExecution, ScriptNOOPExecution, ScriptCommandExecution, \
+    ScriptColumnsKeyExecution, ScriptColumnsMouseExecution
+from Service.Work.ScriptExecutionPlan import ScriptExecutionPlan
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+from Utilities.Path import Path
+
+
+def script_key(script_path: Path) -> str:
+    return os.path.abspath(script_path.absolute) if script_path is not None else ''
 
 
 class ScriptActionExecutionBuilderProtocol(Protocol):
     def build(self, action: ScriptAction) -> Any: return None
+    def compile(self, script_path: Path, timeline: ScriptActionTimeline) -> ScriptExecutionPlan: return None
+    def compile_file(self, script_path: Path) -> ScriptExecutionPlan: return None
+    def compiled_script_count(self) -> int: return 0
 
 
 @inject(use_factory=True, alias=ScriptActionExecutionBuilderProtocol)
 class ScriptActionExecutionBuilder(ScriptActionExecutionBuilderProtocol):
     
     def __init__(self):
+        # Dependencies are resolved once per builder, not once per action
         settings = di[SettingsManagerProtocol]
         self.working_dir = settings.field_value(SettingsManagerField.SCRIPTS_PATH)
+        self.command_timeout = settings.field_value(SettingsManagerField.COMMAND_TIMEOUT)
+        self.mouse_simulator = di[MouseEventSimulatorProtocol]
+        self.keyboard_simulator = di[KeyboardEventSimulatorProtocol]
+        self.notification_center = di[OSNotificationCenterProtocol]
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+        self.process_pool = di[CommandProcessPoolProtocol]
+        self.script_cache = di[ScriptDataCacheProtocol]
+        self.snapshot_service = di[SnapshotServiceProtocol]
+        self.noop_execution = ScriptNOOPExecution()
+        self.plans = {} # Compiled nested scripts, by path
+        self.compile_stack = [] # Paths of the scripts being compiled, used to detect cycles
     
     def build(self, action: ScriptAction) -> Any:
         if isinstance(action, ScriptInputEventAction):
-            result = ScriptActionKeyExecution(action)
+            simulator = self.keyboard_simulator if action.action_type().is_keyboard() else self.mouse_simulator
+            result = ScriptActionKeyExecution(action, simulator)
         else:
             if isinstance(action, ScriptMessageAction):
-                result = ScriptActionMessageExecution(action)
+                result = ScriptActionMessageExecution(action, self.notification_center, self.logger)
             elif isinstance(action, NOOPScriptRunAction):
-                result = ScriptNOOPExecution()
+                result = self.noop_execution
             elif isinstance(action, ScriptRunAction):
-                script_file_path = action.path
-                script_data = ScriptStorage(script_file_path).read_script_data_from_file()
-                result = ScriptActionScriptExecution(script_file_path, script_data.get_actions(), self)
+                # Nested scripts are loaded and compiled up front
+                result = ScriptActionScriptExecution(action.path, self.compile_file(action.path), self)
             elif isinstance(action, ScriptSnapshotAction):
-                result = ScriptSnapshotExecution(action)
+                result = ScriptSnapshotExecution(action, self.working_dir, self.snapshot_service, self.logger)
             elif isinstance(action, ScriptCommandAction):
-                result = ScriptCommandExecution(action)
+                result = ScriptCommandExecution(action, self.process_pool, self.command_timeout, self.logger)
             else:
                 assert False # ScriptAction implement: not implemented
         
         return result
+    
+    def compile(self, script_path: Path, timeline: ScriptActionTimeline) -> ScriptExecutionPlan:
+        key = script_key(script_path)
+        
+        # One script cannot call another, that is already being run
+        if key in self.compile_stack:
+            cycle = ' -> '.join(self.compile_stack[self.compile_stack.index(key):] + [key])
+            raise ValueError(f"script cycle detected: {cycle}")
+        
+        if timeline.count() == 0:
+            raise ValueError(f"script '{key}' has no actions")
+        
+        self.compile_stack.append(key)
+        
+        # Nested scripts are compiled here
+        # The input events of columnar timelines are executed from the columns, their actions are never materialized
+        try:
+            if timeline.is_columnar():
+                steps = {index: self.build(timeline.action(index)) for index in timeline.other_indices()}
+                input_steps = self.build_input_steps(timeline.columns())
+            else:
+                steps = {index: self.build(timeline.action(index)) for index in range(timeline.count())}
+                input_steps = ()
+        finally:
+            self.compile_stack.pop()
+        
+        return ScriptExecutionPlan(timeline, steps, input_steps)
+    
+    def compile_file(self, script_path: Path) -> ScriptExecutionPlan:
+        key = script_key(script_path)
+        
+        if key not in self.plans:
+            script_data = self.script_cache.read_script_data(script_path)
+            self.plans[key] = self.compile(script_path, ScriptActionTimeline(script_data.get_actions()))
+        
+        return self.plans[key]
+    
+    def compiled_script_count(self) -> int:
+        return len(self.plans)
+    
+    # One key and one mouse step for the columns, by type code
+    def build_input_steps(self, columns: ScriptActionColumns) -> tuple:
+        key_step = ScriptColumnsKeyExecution(columns, self.keyboard_simulator)
+        mouse_step = ScriptColumnsMouseExecution(columns, self.mouse_simulator)
+        return tuple(key_step if action_type.is_keyboard() else mouse_step for action_type in INPUT_ACTION_TYPES)
@@ -1,22 +1,19 @@
-import os
 from datetime import datetime
-import time
 from kink import di
 from Model.ScriptAction import ScriptAction
-from Model.ScriptActions import ScriptActions
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES, coordinate
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Model.ScriptActionType import ScriptActionType
 from Model.ScriptCommandAction import ScriptCommandAction
 from Model.ScriptInputEventAction import ScriptInputEventAction
 from Model.ScriptMessageAction import ScriptMessageAction
 from Model.ScriptSnapshotAction import ScriptSnapshotAction
-from Service.EventSimulator import MouseEventSimulator, KeyboardEventSimulator, MouseEventSimulatorProtocol, \
-    KeyboardEventSimulatorProtocol
-from Service.OSNotificationCenter import OSNotificationCenterProtocol
-from Service.SettingsManager import SettingsManagerProtocol, SettingsManagerField
 from Service.Work.ScriptActionExecution import ScriptActionExecution
-from Utilities import Path
+from Utilities.Path import Path
+from Utilities.Clock import ClockProtocol, ns_to_seconds, seconds_to_ns
 from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
 from Utilities.Timer import Timer
-from mss import mss
 
 
 def current_short_date():
@@ -58,12 +55,11 @@ class ScriptActionKeyExecution(ScriptActionExecution):
     
     # - Init
     
-    def __init__(self, action: ScriptAction):
+    def __init__(self, action: ScriptAction, simulator): # simulator: Mouse/KeyboardEventSimulatorProtocol
         assert isinstance(action, ScriptInputEventAction)
         self.action = action
-        self.mouse_simulator = di[MouseEventSimulatorProtocol]
-        self.keyboard_simulator = di[KeyboardEventSimulatorProtocol]
-        self.logger = di[LoggerProtocol]
+        self.event = action.get_event()
+        self.simulator = simulator
     
     # - Properties
     
@@ -73,12 +69,88 @@ class ScriptActionKeyExecution(ScriptActionExecution):
     # - Actions
     
     def execute(self, parent=None):
-        event = self.action.get_event()
+        self.simulator.simulate(self.event)
+    
+    def pause(self):
+        pass
+    
+    def resume(self):
+        pass
+    
+    def update(self):
+        return self.is_running()
+
+
+# Executes the keyboard event at index of the columns, with no action or event object
+# One per compiled script, reused for every keyboard event: the plan sets index before returning it
+class ScriptColumnsKeyExecution(ScriptActionExecution):
+    
+    # - Init
+    
+    def __init__(self, columns: ScriptActionColumns, simulator): # simulator: KeyboardEventSimulatorProtocol
+        self.columns = columns
+        self.index = 0
+        self.simulator = simulator
+        self.functions = {TYPE_CODES[ScriptActionType.KEYBOARD_PRESS]: simulator.press,
+                          TYPE_CODES[ScriptActionType.KEYBOARD_RELEASE]: simulator.release,
+                          TYPE_CODES[ScriptActionType.KEYBOARD_CLICK]: simulator.click}
+    
+    # - Properties
+    
+    def is_running(self) -> bool:
+        return False
+    
+    # - Actions
+    
+    def execute(self, parent=None):
+        columns = self.columns
+        index = self.index
+        self.functions[columns.types[index]](columns.key_table[columns.keys[index]])
+    
+    def pause(self):
+        pass
+    
+    def resume(self):
+        pass
+    
+    def update(self):
+        return False
+
+
+# Executes the mouse event at index of the columns, reused like ScriptColumnsKeyExecution
+class ScriptColumnsMouseExecution(ScriptActionExecution):
+    
+    MOVE_CODE = TYPE_CODES[ScriptActionType.MOUSE_MOVE]
+    SCROLL_CODE = TYPE_CODES[ScriptActionType.MOUSE_SCROLL]
+    
+    # - Init
+    
+    def __init__(self, columns: ScriptActionColumns, simulator): # simulator: MouseEventSimulatorProtocol
+        self.columns = columns
+        self.index = 0
+        self.simulator = simulator
+        self.functions = {TYPE_CODES[ScriptActionType.MOUSE_PRESS]: simulator.press,
+                          TYPE_CODES[ScriptActionType.MOUSE_RELEASE]: simulator.release,
+                          TYPE_CODES[ScriptActionType.MOUSE_CLICK]: simulator.click}
+    
+    # - Properties
+    
+    def is_running(self) -> bool:
+        return False
+    
+    # - Actions
+    
+    def execute(self, parent=None):
+        columns = self.columns
+        index = self.index
+        code = columns.types[index]
         
-        if self.action.action_type().is_keyboard():
-            self.keyboard_simulator.simulate(event)
+        if code == ScriptColumnsMouseExecution.MOVE_CODE:
+            self.simulator.move_to(coordinate(columns.xs[index]), coordinate(columns.ys[index]))
+        elif code == ScriptColumnsMouseExecution.SCROLL_CODE:
+            self.simulator.scroll(columns.point(columns.xs, columns.ys, index), columns.point(columns.dxs, columns.dys, index))
         else:
-            self.mouse_simulator.simulate(event)
+            self.functions[code](columns.key_table[columns.keys[index]])
     
     def pause(self):
         pass
@@ -87,18 +159,18 @@ class ScriptActionKeyExecution(ScriptActionExecution):
         pass
     
     def update(self):
-        return self.is_running()
+        return False
 
 
 class ScriptActionMessageExecution(ScriptActionExecution):
     
     # - Init
     
-    def __init__(self, action: ScriptAction):
+    def __init__(self, action: ScriptAction, notification_center, logger): # notification_center: OSNotificationCenterProtocol
         assert isinstance(action, ScriptMessageAction)
         self.action = action
-        self.notification_center = di[OSNotificationCenterProtocol]
-        self.logger = di[LoggerProtocol]
+        self.notification_center = notification_center
+        self.logger = logger
     
     # - Properties
     
@@ -129,21 +201,26 @@ class ScriptActionScriptExecution(ScriptActionExecution):
     
     # - Init
     
-    def __init__(self, script_path: Path, actions: ScriptActions, builder): # builder: ScriptActionExecutionBuilderProtocol
-        assert actions.count() > 0
+    def __init__(self, script_path: Path, plan, builder): # plan: ScriptExecutionPlan, builder: ScriptActionExecutionBuilderProtocol
+        assert plan.count() > 0
         self.parent = None
         self.current_execution = None
         self.script_path = script_path
-        self.actions = actions.copy()
+        self.plan = plan
+        self.cursor = 0
+        self.clock = di[ClockProtocol]
         self.start_time = 0
-        self.timer = Timer()
-        self.duration_time = actions.duration()
+        self.timer = Timer(self.clock)
         self.builder = builder
-        self.original_action_count = actions.count()
-        self.logger = di[LoggerProtocol]
+        self.timing = None
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
     
     # - Properties
     
+    # Records the fire time of every action of this script, nested script actions are not recorded
+    def get_timing(self): return self.timing # PlaybackTimingRecorder
+    def set_timing(self, timing): self.timing = timing
+    
     def get_parent(self) -> ScriptActionExecution:
         return self.parent
     
@@ -156,33 +233,47 @@ class ScriptActionScriptExecution(ScriptActionExecution):
     def set_current_execution(self, current_execution):
         self.current_execution = current_execution
     
+    def get_timeline(self) -> ScriptActionTimeline:
+        return self.plan.get_timeline()
+    
     def is_running(self) -> bool:
-        return self.actions.count() > 0
+        return self.cursor < self.plan.count()
     
     def elapsed_time(self) -> float:
         return self.timer.elapsed_time()
     
     def time_elapsed_since_start(self) -> float:
-        return time.time() - self.start_time
+        return ns_to_seconds(self.clock.now_ns() - self.start_time)
     
     def duration(self) -> float:
-        return self.duration_time
+        return self.plan.duration()
     
     def current_action_index(self) -> int:
-        return self.original_action_count - self.actions.count()
+        return self.cursor
+    
+    def time_until_next_action(self):
+        if not self.is_running():
+            return 0
+        
+        # Async action in progress
+        if self.current_execution is not None:
+            return self.current_execution.time_until_next_action()
+        
+        due_time = self.plan.time_ns(self.cursor)
+        return ns_to_seconds(max(0, due_time - self.timer.elapsed_time_ns()))
     
     # - Actions
     
     def execute(self, parent=None):
         # Note that the script configuration is ignored
         # The script configuration is applied only for the root script
-        current_script = parent
+        # Script cycles are rejected when the plan is compiled
         
-        while current_script is not None and isinstance(current_script, ScriptActionScriptExecution):
-            assert current_script.script_path != self.script_path  # One script cannot call another
-            current_script = current_script.parent
+        # The same execution is reused when the script is run again
+        self.restart()
         
         self.parent = parent
+        self.start_time = self.clock.now_ns()
         self.timer.start()
     
     def pause(self):
@@ -203,8 +294,32 @@ class ScriptActionScriptExecution(ScriptActionExecution):
         if self.current_execution is not None:
             self.current_execution.resume()
     
+    def cancel(self):
+        if self.current_execution is not None:
+            self.current_execution.cancel()
+    
+    # Moves the cursor to the given action, the timer continues from the time of that action
+    def seek(self, index):
+        assert 0 <= index <= self.plan.count()
+        
+        self.cursor = index
+        self.current_execution = None
+        
+        if index < self.plan.count():
+            self.timer.seek(self.plan.time_ns(index))
+        else:
+            self.timer.seek(seconds_to_ns(self.plan.duration()))
+    
+    def restart(self):
+        if self.timer.is_running():
+            self.timer.stop()
+        
+        self.timer.reset()
+        self.cursor = 0
+        self.current_execution = None
+    
     def update(self):
-        if self.actions.count() == 0:
+        if not self.is_running():
             return False
         
         # Update current action
@@ -223,15 +338,22 @@ class ScriptActionScriptExecution(ScriptActionExecution):
     # - Helpers
     
     def execute_next_action(self) -> bool:
-        if self.actions.count() == 0:
+        if not self.is_running():
             return False
         
-        next_action = self.actions.data[0]
+        due_time = self.plan.time_ns(self.cursor)
+        elapsed_time = self.timer.elapsed_time_ns()
         
         # If it's time, execute the action
-        if next_action.time() <= self.elapsed_time():
-            self.current_execution = self.builder.build(next_action)
-            self.current_execution.execute(parent=self)
+        if due_time <= elapsed_time:
+            self.current_execution = self.plan.step(self.cursor)
+            
+            if self.timing is None:
+                self.current_execution.execute(parent=self)
+            else:
+                fire_time = self.clock.now_ns()
+                self.current_execution.execute(parent=self)
+                self.timing.record(self.cursor, elapsed_time - due_time, self.clock.now_ns() - fire_time)
             
             if self.current_execution.update():
                 self.timer.pause()  # The timer has to be paused while the async action is running
@@ -244,11 +366,11 @@ class ScriptActionScriptExecution(ScriptActionExecution):
             return False
     
     def go_to_next_action(self):
-        assert self.actions.count() > 0
-        self.actions.data.pop(0)
+        assert self.is_running()
+        self.cursor += 1
         self.current_execution = None
         
-        if self.actions.count() == 0:
+        if not self.is_running():
             self.timer.stop()
         elif self.timer.is_paused():
             self.timer.resume()
@@ -256,23 +378,21 @@ class ScriptActionScriptExecution(ScriptActionExecution):
 
 class ScriptSnapshotExecution(ScriptActionExecution):
     
-    FORMAT = '.png'
     FOLDER = 'snapshots'
     DATE_SPECIFIER = '{YY.MM.dd}'
     TIME_SPECIFIER = '{HH-MM-ss}'
     
     # - Init
     
-    def __init__(self, action: ScriptAction):
+    def __init__(self, action: ScriptAction, base_path: Path, snapshot_service, logger):
         assert isinstance(action, ScriptSnapshotAction)
         self.action = action
         
         self.file_name = action.file_name()
         
-        self.logger = di[LoggerProtocol]
-
-        settings = di[SettingsManagerProtocol]
-        self.base_path = settings.field_value(SettingsManagerField.SCRIPTS_PATH)
+        self.snapshot_service = snapshot_service
+        self.logger = logger
+        self.base_path = base_path
     
     # - Properties
     
@@ -290,8 +410,10 @@ class ScriptSnapshotExecution(ScriptActionExecution):
             date = current_short_time()
             name = name.replace(ScriptSnapshotExecution.TIME_SPECIFIER, date)
         
-        if not name.endswith(ScriptSnapshotExecution.FORMAT):
-            name = f'{name}{ScriptSnapshotExecution.FORMAT}'
+        extension = self.snapshot_service.file_extension()
+        
+        if not name.endswith(extension):
+            name = f'{name}{extension}'
         
         path = self.base_path.copy()
         
@@ -302,13 +424,14 @@ class ScriptSnapshotExecution(ScriptActionExecution):
     # - Actions
     
     def execute(self, parent=None):
-        with mss() as sct:
-            path = self.formatted_path()
-            self.logger.info(f"taking snapshot and saving it to '{path.absolute}'")
-            try:
-                sct.shot(output=path.absolute)
-            except Exception as error:
-                self.logger.error(f"snapshot failed, error: {error}")
+        path = self.formatted_path()
+        self.logger.info(f"taking snapshot and saving it to '{path.absolute}'")
+        
+        # Only the capture happens here, the image is encoded and written in the background
+        try:
+            self.snapshot_service.capture(path)
+        except Exception as error:
+            self.logger.error(f"snapshot failed, error: {error}")
     
     def pause(self):
         pass
@@ -324,24 +447,27 @@ class ScriptCommandExecution(ScriptActionExecution):
     
     # - Init
     
-    def __init__(self, action: ScriptAction):
+    # default_timeout in seconds, used when the action has none, 0 = no limit
+    def __init__(self, action: ScriptAction, process_pool, default_timeout, logger): # process_pool: CommandProcessPoolProtocol
         assert isinstance(action, ScriptCommandAction)
         self.action = action
         self.directory = action.directory().absolute
         self.command = action.command()
-        self.logger = di[LoggerProtocol]
+        self.timeout = action.timeout() if action.timeout() > 0 else default_timeout
+        self.process_pool = process_pool
+        self.process = None
+        self.logger = logger
     
     # - Properties
     
     def is_running(self) -> bool:
-        return False
+        return self.process is not None and self.process.is_running()
     
     # - Actions
     
     def execute(self, parent=None):
         self.logger.info(f"run command '{self.command}' @ {self.directory}")
-        os.chdir(self.directory)
-        os.system(self.command) # TODO: run this in update? So it doesnt block the caller
+        self.process = self.process_pool.launch(self.command, self.directory, self.timeout if self.timeout > 0 else None)
     
     def pause(self):
         pass
@@ -349,6 +475,12 @@ class ScriptCommandExecution(ScriptActionExecution):
     def resume(self):
         pass
     
+    def cancel(self):
+        if self.is_running():
+            self.process_pool.terminate(self.process)
+    
     def update(self):
+        if self.is_running():
+            self.process_pool.update()
+        
         return self.is_running()
-
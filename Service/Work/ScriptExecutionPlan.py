@@ -0,0 +1,43 @@
+from array import array
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Service.Work.ScriptActionExecution import ScriptActionExecution
+from Utilities.Clock import seconds_to_ns
+
+
+# Compiled form of a script: the due times resolved in ns, and the executions of the actions
+# The executions are prebuilt by index, except the input events of columnar timelines, which are executed by
+# one reusable step per simulator (input_steps, by type code) reading the shared columns at the step index
+# Built once per script and reused across repeats and nested runs
+class ScriptExecutionPlan:
+    
+    # - Init
+    
+    def __init__(self, timeline: ScriptActionTimeline, steps: dict, input_steps: tuple = ()):
+        self.timeline = timeline
+        self.steps = steps
+        self.input_steps = input_steps
+        self.types = timeline.columns().types if timeline.is_columnar() else None
+        self.due_times = array('q', (seconds_to_ns(timeline.time(index)) for index in range(timeline.count())))
+    
+    # - Properties
+    
+    def get_timeline(self) -> ScriptActionTimeline:
+        return self.timeline
+    
+    def count(self) -> int:
+        return len(self.due_times)
+    
+    def step(self, index) -> ScriptActionExecution:
+        result = self.steps.get(index)
+        
+        if result is None:
+            result = self.input_steps[self.types[index]]
+            result.index = index
+        
+        return result
+    
+    def time_ns(self, index) -> int:
+        return self.due_times[index]
+    
+    def duration(self) -> float:
+        return self.timeline.duration()
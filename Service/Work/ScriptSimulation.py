@@ -0,0 +1,355 @@
+import enum
+import threading
+from kink import di
+from Model.ScriptConfiguration import ScriptConfiguration
+from Model.ScriptData import ScriptData
+from Model.ScriptInfo import ScriptInfo
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Parser.ScriptActionParser import ScriptActionParserProtocol
+from Service.OSNotificationCenter import OSNotificationCenterProtocol
+from Service.SnapshotService import SnapshotServiceProtocol
+from Service.Work.ScriptActionExecutionBuilder import ScriptActionExecutionBuilderProtocol
+from Service.Work.ScriptActionExecutionCluster import ScriptActionScriptExecution
+from Service.Work.PlaybackTiming import PlaybackTimingRecorder, PlaybackTimingSummary
+from Utilities.Clock import ClockProtocol, ns_to_seconds
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogSubsystem
+from Utilities.Path import Path
+
+
+NOTIFICATION_TITLE = 'Monkeying'
+WAIT_INTERVAL = 2 # Time to wait (in ms) when idle
+SPIN_INTERVAL = 1 # Time (in ms) before a deadline during which the simulation spins instead of sleeping
+REPORT_DIRECTORY = None # Directory of the timing report of every run, None = no report
+
+
+class ScriptSimulationState(enum.IntEnum):
+    IDLE = 0
+    RUNNING = 1
+    PAUSED = 2
+    FINISHED = 3
+
+
+# Loads and runs a script on the calling thread, pause/resume/seek/cancel can be called from any thread
+# Does not depend on Qt, so scripts can be run without the GUI
+# Time passes only through the clock, so a FakeClock can drive the whole run
+class ScriptSimulation:
+    
+    # - Init
+    
+    def __init__(self, script_data: ScriptData):
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        
+        self.spin_interval = SPIN_INTERVAL
+        
+        self._state = ScriptSimulationState.IDLE
+        self._cancelled = False
+        self._error = None
+        
+        self.script_data = script_data.copy()
+        self.script_path = script_data.get_file_path()
+        self.timeline = ScriptActionTimeline(self.script_data.get_actions())
+        self.action_parser = di[ScriptActionParserProtocol]
+        
+        self.execution_count = 0
+        
+        if self.script_config().repeat_forever:
+            self.execution_limit = None
+        else:
+            self.execution_limit = 1 + self.script_config().repeat_count
+        
+        # The script and its nested scripts are loaded when the simulation runs
+        self.builder = di[ScriptActionExecutionBuilderProtocol]
+        self.plan = None
+        self.current_execution = None
+        
+        self.clock = di[ClockProtocol]
+        self.load_time = 0
+        self.run_time = 0
+        self.timing = None
+        self.report_directory = REPORT_DIRECTORY
+        
+        self.logger = di[LoggerProtocol].for_subsystem(LogSubsystem.SIMULATOR)
+    
+    # - Properties
+    
+    def script_info(self) -> ScriptInfo:
+        return self.script_data.get_info()
+    
+    def script_config(self) -> ScriptConfiguration:
+        return self.script_data.get_config()
+    
+    def get_spin_interval(self) -> float: return self.spin_interval
+    def set_spin_interval(self, value): self.spin_interval = value
+    def get_report_directory(self) -> str: return self.report_directory
+    def set_report_directory(self, value): self.report_directory = value
+    def get_timing(self) -> PlaybackTimingRecorder: return self.timing
+    
+    def state(self) -> ScriptSimulationState:
+        with self.lock:
+            result = self._state
+        
+        return result
+    
+    def current_action_index(self) -> int:
+        with self.lock:
+            result = self.current_execution.current_action_index() if self.current_execution is not None else 0
+        
+        return result
+    
+    def is_cancelled(self):
+        with self.lock:
+            result = self._cancelled
+        
+        return result
+    
+    def get_error(self) -> Exception:
+        with self.lock:
+            result = self._error
+        
+        return result
+    
+    def elapsed_time(self) -> float:
+        if self.state() == ScriptSimulationState.FINISHED:
+            return self.duration()
+        
+        if self.current_execution is None:
+            return 0
+        
+        return self.current_execution.elapsed_time()
+    
+    def time_elapsed_since_start(self) -> float:
+        if self.current_execution is None:
+            return 0
+        
+        return self.current_execution.time_elapsed_since_start()
+    
+    def duration(self) -> float:
+        return self.timeline.duration()
+    
+    # Time (in seconds) spent loading and compiling the script and its nested scripts
+    def get_load_time(self) -> float:
+        return self.load_time
+    
+    # Time (in seconds) spent running the script, excluding the load time
+    def get_run_time(self) -> float:
+        return self.run_time
+    
+    # Lateness and throughput so far, empty until the script is loaded
+    def timing_summary(self) -> PlaybackTimingSummary:
+        with self.lock:
+            result = self.timing.summary() if self.timing is not None else PlaybackTimingSummary()
+        
+        return result
+    
+    def report_path(self) -> Path:
+        name = self.script_path.stem() if self.script_path is not None and not self.script_path.is_empty() else 'untitled'
+        result = Path(self.report_directory)
+        result.append_to_end(f'{name}.txt')
+        return result
+    
+    def build_execution_script(self) -> ScriptActionScriptExecution:
+        return ScriptActionScriptExecution(self.script_path, self.plan, self.builder)
+    
+    def notification_center(self) -> OSNotificationCenterProtocol:
+        return di[OSNotificationCenterProtocol]
+    
+    # - Actions
+    
+    def run(self):
+        assert self._state is ScriptSimulationState.IDLE
+        
+        self.logger.info('ScriptSimulation started')
+        
+        if not self.load():
+            return
+        
+        with self.lock:
+            # Cancelled while loading
+            if self._state == ScriptSimulationState.FINISHED:
+                return
+            
+            if self._state == ScriptSimulationState.IDLE:
+                self._state = ScriptSimulationState.RUNNING
+            
+            self.execution_count += 1
+        
+        run_start_time = self.clock.now_ns()
+        
+        self.show_start_notification()
+        
+        with self.lock:
+            self.timing.begin_run()
+            self.current_execution.execute(None)
+            
+            # Paused while loading
+            if self._state == ScriptSimulationState.PAUSED:
+                self.current_execution.pause()
+                self.timing.pause()
+        
+        while self.state() != ScriptSimulationState.FINISHED:
+            with self.condition:
+                # Wait forever while paused until resumed
+                while self._state == ScriptSimulationState.PAUSED:
+                    self.clock.wait(self.condition)
+                
+                if self._state == ScriptSimulationState.FINISHED:
+                    break
+                
+                running = self.current_execution.update()
+            
+            if not running:
+                self.mark_as_finished()
+            else:
+                self.wait_for_next_action()
+        
+        self.run_time = ns_to_seconds(self.clock.now_ns() - run_start_time)
+        
+        with self.lock:
+            self.timing.end()
+        
+        self.report_timing()
+        
+        # Snapshots are written in the background, wait for them before reporting the end
+        di[SnapshotServiceProtocol].flush()
+        
+        self.show_end_notification()
+        
+        if not self.is_cancelled():
+            self.logger.info(f'ScriptSimulation ended, run time {self.run_time:.3f}s')
+        else:
+            self.logger.info(f'ScriptSimulation cancelled, run time {self.run_time:.3f}s')
+    
+    # Loads the nested scripts and compiles the execution plan, returns False on failure
+    def load(self) -> bool:
+        load_start_time = self.clock.now_ns()
+        
+        try:
+            plan = self.builder.compile(self.script_path, self.timeline)
+        except Exception as error:
+            self.logger.error(f'ScriptSimulation failed to load script, error: {error}')
+            
+            with self.lock:
+                self._error = error
+                self._state = ScriptSimulationState.FINISHED
+            
+            return False
+        
+        with self.lock:
+            self.plan = plan
+            self.timing = PlaybackTimingRecorder(self.timeline, self.clock)
+            self.current_execution = self.build_execution_script()
+            self.current_execution.set_timing(self.timing)
+        
+        self.load_time = ns_to_seconds(self.clock.now_ns() - load_start_time)
+        
+        nested_count = self.builder.compiled_script_count()
+        self.logger.info(f'ScriptSimulation loaded script and {nested_count} nested script(s) in {self.load_time:.3f}s')
+        
+        return True
+    
+    def cancel(self):
+        with self.condition:
+            if self.current_execution is not None and self.current_execution.is_running():
+                self.current_execution.pause()
+                self.current_execution.cancel()
+            
+            self._state = ScriptSimulationState.FINISHED
+            self._cancelled = True
+            self.condition.notify_all()
+    
+    def pause(self):
+        with self.condition:
+            if self.current_execution is not None and self.current_execution.is_running():
+                self.current_execution.pause()
+            
+            if self.timing is not None:
+                self.timing.pause()
+            
+            self._state = ScriptSimulationState.PAUSED
+            self.condition.notify_all()
+    
+    def resume(self):
+        with self.condition:
+            if self.current_execution is not None:
+                self.current_execution.resume()
+            
+            if self.timing is not None:
+                self.timing.resume()
+            
+            if self._state == ScriptSimulationState.PAUSED:
+                self._state = ScriptSimulationState.RUNNING
+            
+            self.condition.notify_all()
+    
+    # Continues from the action at index of the root script, the actions before it are skipped
+    def seek(self, index):
+        with self.condition:
+            if self.current_execution is not None and self._state != ScriptSimulationState.FINISHED:
+                self.current_execution.seek(index)
+            
+            self.condition.notify_all()
+    
+    # Blocks until the next action is due, or until the simulation is paused, resumed or cancelled.
+    # The last spin_interval ms before a deadline are spent spinning, to keep the timing jitter low.
+    def wait_for_next_action(self):
+        with self.condition:
+            if self._state != ScriptSimulationState.RUNNING:
+                return
+            
+            delay = self.current_execution.time_until_next_action()
+            
+            # Async action in progress, poll it
+            if delay is None:
+                delay = WAIT_INTERVAL / 1000
+            
+            spin_interval = self.spin_interval / 1000
+            
+            if delay > spin_interval:
+                self.clock.wait(self.condition, delay - spin_interval)
+                return
+        
+        # Spin, but let other threads (pause/cancel) grab the lock
+        self.clock.spin(delay)
+    
+    def mark_as_finished(self):
+        with self.lock:
+            # None = repeat forever
+            if self.execution_limit is not None and self.execution_count >= self.execution_limit:
+                self._state = ScriptSimulationState.FINISHED
+            else:
+                self.execution_count += 1
+                start_time = self.current_execution.start_time
+                self.timing.begin_run()
+                self.current_execution.execute(self)
+                self.current_execution.start_time = start_time
+    
+    def report_timing(self):
+        summary = self.timing.summary()
+        
+        self.logger.info('ScriptSimulation fired %d action(s), %.1f/s, lateness p50 %.3fms, p95 %.3fms, p99 %.3fms, max %.3fms',
+                         summary.fired_count, summary.throughput, summary.lateness_p50 * 1000, summary.lateness_p95 * 1000,
+                         summary.lateness_p99 * 1000, summary.lateness_max * 1000)
+        
+        if self.report_directory is None:
+            return
+        
+        path = self.report_path()
+        
+        try:
+            self.timing.write_report(path, self.script_info().name, self.load_time, self.builder.compiled_script_count())
+        except Exception as error:
+            self.logger.error(f"ScriptSimulation failed to write timing report '{path.absolute}', error: {error}")
+    
+    def show_start_notification(self):
+        if not self.script_config().notify_on_start:
+            return
+        
+        self.notification_center().show(NOTIFICATION_TITLE, f'{self.script_info().name} started')
+    
+    def show_end_notification(self):
+        if not self.script_config().notify_on_end:
+            return
+        
+        self.notification_center().show(NOTIFICATION_TITLE, f'{self.script_info().name} ended')
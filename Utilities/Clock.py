@@ -0,0 +1,97 @@
+import time
+from typing import Protocol
+from kink import inject
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+
+def seconds_to_ns(value) -> int:
+    return int(round(value * NANOSECONDS_PER_SECOND))
+
+
+def ns_to_seconds(value: int) -> float:
+    return value / NANOSECONDS_PER_SECOND
+
+
+# wait and spin are the only ways the playback lets time pass, so a FakeClock can drive it
+# wait is called with the condition held, and returns early when the condition is notified
+class ClockProtocol(Protocol):
+    def now_ns(self) -> int: return 0
+    def wait(self, condition, seconds=None): pass
+    def spin(self, seconds): pass
+
+
+# Monotonic, high resolution clock; unaffected by NTP slews or DST changes
+@inject(alias=ClockProtocol)
+class MonotonicClock(ClockProtocol):
+    
+    def now_ns(self) -> int:
+        return time.perf_counter_ns()
+    
+    # seconds = None waits until notified
+    def wait(self, condition, seconds=None):
+        condition.wait(seconds)
+    
+    # Called repeatedly until a deadline seconds away, lets other threads run
+    def spin(self, seconds):
+        time.sleep(0)
+
+
+# Manually driven clock, for deterministic playback and recording
+# Waiting and spinning advance the time instead of blocking, the callbacks scheduled with call_at run
+# when the time reaches them, from the waiting thread, like another thread calling pause or resume
+class FakeClock(ClockProtocol):
+    
+    # - Init
+    
+    def __init__(self, start_ns=0):
+        self.current_ns = start_ns
+        self.callbacks = [] # (time in ns, order, callback), sorted
+    
+    # - Properties
+    
+    def now_ns(self) -> int:
+        return self.current_ns
+    
+    def set_now_ns(self, value: int):
+        self.current_ns = value
+    
+    # - Actions
+    
+    def advance(self, seconds):
+        self.advance_ns(seconds_to_ns(seconds))
+    
+    def advance_ns(self, value: int):
+        self.advance_to(self.current_ns + value)
+    
+    def call_at(self, seconds, callback):
+        self.callbacks.append((seconds_to_ns(seconds), len(self.callbacks), callback))
+        self.callbacks.sort(key=lambda item: item[:2])
+    
+    # Like Condition.wait, the condition is released while the time passes
+    # Returns at the first callback, as if it notified the condition
+    def wait(self, condition, seconds=None):
+        assert seconds is not None or len(self.callbacks) > 0, 'FakeClock: waiting forever'
+        end_ns = self.current_ns + seconds_to_ns(seconds) if seconds is not None else None
+        condition.release()
+        
+        try:
+            self.advance_to(end_ns, stop_after_callback=True)
+        finally:
+            condition.acquire()
+    
+    def spin(self, seconds):
+        self.advance(seconds)
+    
+    # Runs the callbacks due until end_ns, in order; end_ns = None runs until the first callback
+    def advance_to(self, end_ns, stop_after_callback=False):
+        while len(self.callbacks) > 0 and (end_ns is None or self.callbacks[0][0] <= end_ns):
+            callback_ns, _, callback = self.callbacks.pop(0)
+            self.current_ns = max(self.current_ns, callback_ns)
+            callback()
+            
+            if stop_after_callback:
+                return
+        
+        if end_ns is not None:
+            self.current_ns = max(self.current_ns, end_ns)
@@ -0,0 +1,175 @@
+import enum
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+from Utilities.Path import Path
+
+DEFAULT_MAX_FILE_SIZE = 5 * 1024 * 1024 # Bytes, when exceeded the file is rotated
+DEFAULT_BACKUP_COUNT = 3 # Rotated files kept, as name.1 (newest) ... name.N (oldest)
+
+
+class LogLevel(enum.IntEnum):
+    VERBOSE = 10
+    DEBUG = 20
+    INFO = 30
+    WARNING = 40
+    ERROR = 50
+    
+    def tag(self) -> str:
+        match self:
+            case LogLevel.WARNING: return 'WARN|'
+            case LogLevel.ERROR: return 'ERROR|'
+            case _: return ''
+
+
+class LogSubsystem(enum.StrEnum):
+    GENERAL = 'general'
+    RECORDER = 'recorder'
+    SIMULATOR = 'simulator'
+    STORAGE = 'storage'
+    UI = 'ui'
+
+
+@dataclass(slots=True)
+class LogRecord:
+    time: float # Seconds since the epoch
+    level: LogLevel
+    subsystem: LogSubsystem
+    thread: str
+    message: str
+
+
+class LogSinkProtocol(Protocol):
+    def write(self, record: LogRecord): pass
+    def flush(self): pass
+    def close(self): pass
+
+
+# Formats the date and time part once per second, only the milliseconds are formatted per record
+class LogTimeFormat:
+    
+    # - Init
+    
+    def __init__(self):
+        self.second = -1
+        self.prefix = ''
+    
+    # - Actions
+    
+    def format(self, value: float) -> str:
+        second = int(value)
+        
+        if second != self.second:
+            self.prefix = datetime.fromtimestamp(second).strftime('%Y.%m.%d %H:%M:%S')
+            self.second = second
+        
+        return f'{self.prefix}.{int((value - second) * 1000):03d}'
+
+
+# 2024.01.01 12:00:00.000|thread.main|recorder|WARN| message
+def text_line(record: LogRecord, time_format: LogTimeFormat, show_thread: bool) -> str:
+    thread = f'|{record.thread}' if show_thread else ''
+    subsystem = f'|{record.subsystem}' if record.subsystem != LogSubsystem.GENERAL else ''
+    return f'{time_format.format(record.time)}{thread}{subsystem}|{record.level.tag()} {record.message}'
+
+
+class StdoutLogSink(LogSinkProtocol):
+    
+    # - Init
+    
+    def __init__(self, show_thread=True):
+        self.show_thread = show_thread
+        self.time_format = LogTimeFormat()
+    
+    # - Actions
+    
+    def write(self, record: LogRecord):
+        print(text_line(record, self.time_format, self.show_thread))
+    
+    def flush(self): pass
+    def close(self): pass
+
+
+# Appends text lines to a file, which is rotated when it gets too large
+# Writes are buffered, call flush() to write them to the file
+class RotatingFileLogSink(LogSinkProtocol):
+    
+    # - Init
+    
+    def __init__(self, path: Path, max_size=DEFAULT_MAX_FILE_SIZE, backup_count=DEFAULT_BACKUP_COUNT, show_thread=True):
+        self.path = path
+        self.max_size = max_size
+        self.backup_count = backup_count
+        self.show_thread = show_thread
+        self.time_format = LogTimeFormat()
+        self.file = None
+        self.size = 0
+    
+    # - Properties
+    
+    def get_path(self) -> Path: return self.path
+    
+    # - Actions
+    
+    def write(self, record: LogRecord):
+        line = self.format(record) + '\n'
+        
+        if self.file is None:
+            self.open()
+        elif self.size + len(line) > self.max_size:
+            self.rotate()
+        
+        self.file.write(line)
+        self.size += len(line)
+    
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+    
+    # - Helpers
+    
+    def format(self, record: LogRecord) -> str:
+        return text_line(record, self.time_format, self.show_thread)
+    
+    def open(self):
+        directory = os.path.dirname(self.path.absolute)
+        
+        if len(directory) > 0 and not os.path.isdir(directory):
+            os.makedirs(directory)
+        
+        self.file = open(self.path.absolute, 'a', encoding='utf-8')
+        self.size = self.file.tell()
+    
+    # name.N-1 -> name.N ... name -> name.1
+    def rotate(self):
+        self.close()
+        path = self.path.absolute
+        
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.isfile(f'{path}.{index}'):
+                    os.replace(f'{path}.{index}', f'{path}.{index + 1}')
+            
+            os.replace(path, f'{path}.1')
+        else:
+            os.remove(path)
+        
+        self.open()
+
+
+# One JSON object per line, for tools that read the logs of unattended runs
+class JSONLinesLogSink(RotatingFileLogSink):
+    
+    def format(self, record: LogRecord) -> str:
+        return json.dumps({'time': round(record.time, 3),
+                           'level': record.level.name.lower(),
+                           'subsystem': record.subsystem.value,
+                           'thread': record.thread,
+                           'message': record.message})
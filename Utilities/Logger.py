@@ -1,8 +1,13 @@
+import queue
 import threading
+import time
 from typing import Protocol
 from kink import inject
 from datetime import datetime
-from Utilities.Threading import current_thread_is_main
+from Utilities.LogSink import LogLevel, LogRecord, LogSinkProtocol, LogSubsystem, StdoutLogSink
+
+MAX_QUEUED_RECORDS = 4096 # Asynchronous output only, when full new records are dropped
+MAX_BATCH_SIZE = 256 # Records written by the background writer before the sinks are flushed
 
 
 def current_date():
@@ -21,6 +26,10 @@ def current_short_time():
     return datetime.today().strftime('%H:%M:%S')
 
 
+# Not imported from Utilities.Threading, which depends on Qt
+def current_thread_is_main(): return threading.current_thread() is threading.main_thread()
+
+
 def get_current_thread_name():
     return 'main' if current_thread_is_main() else threading.get_ident()
 
@@ -29,45 +38,305 @@ def get_current_thread_description():
     return f'thread.{get_current_thread_name()}'
 
 
+# Message text, built only when the message is written
+# message can be a string with %-style args, or a callable that returns the text
+def format_message(message, args) -> str:
+    if callable(message):
+        return str(message())
+    
+    if len(args) > 0:
+        return message % args
+    
+    return str(message)
+
+
+# Messages are formatted only when they are written, pass %-style args or a callable instead of an f-string:
+# logger.verbose_info('%s moved', point) or logger.verbose_info(lambda: describe(point))
+# Hot paths should also check a VerboseFlag instead of calling verbose_info for every event
+# for_subsystem returns a logger whose records are filtered by the level of that subsystem
 class LoggerProtocol(Protocol):
-    def info(self, message): pass
-    def warning(self, message): pass
-    def error(self, message): pass
-    def verbose_info(self, message): pass
-    def debug(self, message): pass
+    def info(self, message, *args): pass
+    def warning(self, message, *args): pass
+    def error(self, message, *args): pass
+    def verbose_info(self, message, *args): pass
+    def debug(self, message, *args): pass
+    def is_verbose(self) -> bool: return False
+    def is_debug(self) -> bool: return False
+    def get_level_generation(self) -> int: return 0
+    def for_subsystem(self, subsystem: LogSubsystem): return self
+    def flush(self): pass
 
 
+# Writes the records to every sink, directly or from a background writer thread
+# Levels and sampling are set per subsystem, subsystems without a level use the default level
 @inject(alias=LoggerProtocol)
 class Logger:
     
     DEBUG = True
     VERBOSE = False
     SHOW_THREAD = True
+    ASYNCHRONOUS = False # Records are written by a background thread, so logging never waits for the sinks
+    
+    # - Init
     
     def __init__(self):
-        self.verbose_mode = Logger.VERBOSE
-        self.debug_mode = Logger.DEBUG
-        self.show_thread = Logger.SHOW_THREAD
-    
-    def info(self, message):
-        timestamp = current_date()
-        thread = f'|{get_current_thread_description()}' if self.show_thread else ''
-        print(f'{timestamp}{thread}| {message}')
-    
-    def warning(self, message):
-        timestamp = current_date()
-        thread = f'|{get_current_thread_description()}' if self.show_thread else ''
-        print(f'{timestamp}{thread}|WARN| {message}')
-    
-    def error(self, message):
-        timestamp = current_date()
-        thread = f'|{get_current_thread_description()}' if self.show_thread else ''
-        print(f'{timestamp}{thread}|ERROR| {message}')
-    
-    def verbose_info(self, message):
-        if self.verbose_mode:
-            self.info(message)
-    
-    def debug(self, message):
-        if self.debug_mode:
-            self.info(message)
+        self.default_level = LogLevel.VERBOSE if Logger.VERBOSE else LogLevel.DEBUG if Logger.DEBUG else LogLevel.INFO
+        self.levels = {}
+        self.level_generation = 0 # Changed by every set_level, for the cached level checks
+        self.sample_intervals = {} # Subsystem: only every n-th verbose or debug record is written
+        self.sample_counters = {}
+        self.sinks = [StdoutLogSink(show_thread=Logger.SHOW_THREAD)]
+        self.lock = threading.Lock()
+        self.records = None
+        self.writer = None
+        self.dropped_count = 0
+        self.set_asynchronous(Logger.ASYNCHRONOUS)
+    
+    # - Properties
+    
+    def is_verbose(self) -> bool: return self.is_enabled(LogLevel.VERBOSE, LogSubsystem.GENERAL)
+    def is_debug(self) -> bool: return self.is_enabled(LogLevel.DEBUG, LogSubsystem.GENERAL)
+    def get_level_generation(self) -> int: return self.level_generation
+    def get_dropped_count(self) -> int: return self.dropped_count
+    def get_sinks(self) -> [LogSinkProtocol]: return list(self.sinks)
+    
+    def is_enabled(self, level: LogLevel, subsystem: LogSubsystem) -> bool:
+        return level >= self.levels.get(subsystem, self.default_level)
+    
+    def level(self, subsystem: LogSubsystem) -> LogLevel:
+        return self.levels.get(subsystem, self.default_level)
+    
+    def set_level(self, level: LogLevel, subsystem: LogSubsystem = None):
+        if subsystem is None:
+            self.default_level = level
+        else:
+            self.levels[subsystem] = level
+        
+        self.level_generation += 1
+    
+    def set_sampling(self, subsystem: LogSubsystem, interval: int):
+        assert interval >= 1
+        self.sample_intervals[subsystem] = interval
+        self.sample_counters[subsystem] = 0
+    
+    def add_sink(self, sink: LogSinkProtocol):
+        with self.lock:
+            self.sinks = self.sinks + [sink]
+    
+    def remove_sink(self, sink: LogSinkProtocol):
+        with self.lock:
+            self.sinks = [value for value in self.sinks if value is not sink]
+        
+        sink.close()
+    
+    # Disabling stops the writer once the queued records are written, the next records are written directly
+    def set_asynchronous(self, value: bool):
+        if value and self.records is None:
+            self.records = queue.Queue(maxsize=MAX_QUEUED_RECORDS)
+        elif not value and self.records is not None:
+            records = self.records
+            self.records = None
+            self.stop_writer(records)
+    
+    def for_subsystem(self, subsystem: LogSubsystem):
+        return SubsystemLogger(self, subsystem)
+    
+    # - Actions
+    
+    def info(self, message, *args):
+        self.log(LogLevel.INFO, LogSubsystem.GENERAL, message, args)
+    
+    def warning(self, message, *args):
+        self.log(LogLevel.WARNING, LogSubsystem.GENERAL, message, args)
+    
+    def error(self, message, *args):
+        self.log(LogLevel.ERROR, LogSubsystem.GENERAL, message, args)
+    
+    def verbose_info(self, message, *args):
+        self.log(LogLevel.VERBOSE, LogSubsystem.GENERAL, message, args)
+    
+    def debug(self, message, *args):
+        self.log(LogLevel.DEBUG, LogSubsystem.GENERAL, message, args)
+    
+    def log(self, level: LogLevel, subsystem: LogSubsystem, message, args):
+        if not self.is_enabled(level, subsystem):
+            return
+        
+        if level < LogLevel.INFO and not self.sample(subsystem):
+            return
+        
+        record = LogRecord(time.time(), level, subsystem, get_current_thread_description(), format_message(message, args))
+        records = self.records
+        
+        if records is None:
+            with self.lock:
+                self.write([record])
+            return
+        
+        self.start_writer(records)
+        
+        try:
+            records.put_nowait(record)
+        except queue.Full:
+            self.dropped_count += 1
+    
+    # Blocks until the queued records are written
+    def flush(self):
+        records = self.records
+        
+        if records is not None:
+            records.join()
+        else:
+            with self.lock:
+                for sink in self.sinks:
+                    sink.flush()
+    
+    def close(self):
+        self.flush()
+        
+        with self.lock:
+            for sink in self.sinks:
+                sink.close()
+    
+    # - Helpers
+    
+    def sample(self, subsystem: LogSubsystem) -> bool:
+        interval = self.sample_intervals.get(subsystem)
+        
+        if interval is None:
+            return True
+        
+        count = self.sample_counters[subsystem]
+        self.sample_counters[subsystem] = count + 1
+        return count % interval == 0
+    
+    # Lock must be held
+    def write(self, records: [LogRecord]):
+        for sink in self.sinks:
+            try:
+                for record in records:
+                    sink.write(record)
+                
+                sink.flush()
+            except Exception as error:
+                print(f'Logger: sink {type(sink).__name__} failed, error: {error}')
+    
+    def start_writer(self, records: queue.Queue):
+        if self.writer is not None:
+            return
+        
+        with self.lock:
+            # Not for a queue replaced while logging
+            if self.writer is None and records is self.records:
+                self.writer = threading.Thread(target=self.run_writer, args=(records,), name='Logger.writer', daemon=True)
+                self.writer.start()
+    
+    # The records queued after the writer exits are written directly
+    def stop_writer(self, records: queue.Queue):
+        writer = self.writer
+        
+        if writer is not None:
+            records.put(None)
+            writer.join()
+            self.writer = None
+        
+        remaining = []
+        
+        while True:
+            try:
+                remaining.append(records.get_nowait())
+            except queue.Empty:
+                break
+        
+        with self.lock:
+            self.write(remaining)
+        
+        for _ in remaining:
+            records.task_done()
+    
+    # Exits when it gets None
+    def run_writer(self, records: queue.Queue):
+        while True:
+            batch = []
+            record = records.get()
+            
+            while record is not None:
+                batch.append(record)
+                
+                if len(batch) == MAX_BATCH_SIZE:
+                    break
+                
+                try:
+                    record = records.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if len(batch) > 0:
+                with self.lock:
+                    self.write(batch)
+            
+            for _ in batch:
+                records.task_done()
+            
+            if record is None:
+                records.task_done()
+                return
+
+
+# Logger of one subsystem, shares the sinks of the main logger
+class SubsystemLogger:
+    
+    # - Init
+    
+    def __init__(self, logger: Logger, subsystem: LogSubsystem):
+        self.logger = logger
+        self.subsystem = subsystem
+    
+    # - Properties
+    
+    def get_subsystem(self) -> LogSubsystem: return self.subsystem
+    def is_verbose(self) -> bool: return self.logger.is_enabled(LogLevel.VERBOSE, self.subsystem)
+    def is_debug(self) -> bool: return self.logger.is_enabled(LogLevel.DEBUG, self.subsystem)
+    def get_level_generation(self) -> int: return self.logger.get_level_generation()
+    
+    def for_subsystem(self, subsystem: LogSubsystem):
+        return self.logger.for_subsystem(subsystem)
+    
+    # - Actions
+    
+    def info(self, message, *args):
+        self.logger.log(LogLevel.INFO, self.subsystem, message, args)
+    
+    def warning(self, message, *args):
+        self.logger.log(LogLevel.WARNING, self.subsystem, message, args)
+    
+    def error(self, message, *args):
+        self.logger.log(LogLevel.ERROR, self.subsystem, message, args)
+    
+    def verbose_info(self, message, *args):
+        self.logger.log(LogLevel.VERBOSE, self.subsystem, message, args)
+    
+    def debug(self, message, *args):
+        self.logger.log(LogLevel.DEBUG, self.subsystem, message, args)
+    
+    def flush(self):
+        self.logger.flush()
+
+
+# is_verbose() of a logger for hot paths, read again only after a level changed: if self.verbose: ...
+class VerboseFlag:
+    __slots__ = ('logger', 'generation', 'value')
+    
+    def __init__(self, logger: LoggerProtocol):
+        self.logger = logger
+        self.generation = logger.get_level_generation()
+        self.value = logger.is_verbose()
+    
+    def __bool__(self) -> bool:
+        generation = self.logger.get_level_generation()
+        
+        if generation != self.generation:
+            self.generation = generation
+            self.value = self.logger.is_verbose()
+        
+        return self.value
@@ -67,7 +67,11 @@ def combine_paths(first, second):
     return Path(first + system_file_separator() + second)
 
 
+# file_format can be a single format, or a tuple of formats
 def filter_file_format(name, file_format) -> bool:
+    if isinstance(file_format, tuple):
+        return any(filter_file_format(name, value) for value in file_format)
+    
     return len(name) > len(file_format) + 1 and name.endswith(f'.{file_format}')
 
 
@@ -0,0 +1,65 @@
+DEFAULT_CAPACITY = 1 << 16
+
+
+# Fixed size queue for exactly one producer thread and one consumer thread
+# No locks: the producer only moves write_index and the consumer only moves read_index
+# When full, new items are dropped and counted
+class RingBuffer:
+    
+    # - Init
+    
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        assert capacity > 0 and capacity & (capacity - 1) == 0 # Power of two
+        self.slots = [None] * capacity
+        self.mask = capacity - 1
+        self.write_index = 0
+        self.read_index = 0
+        self.pushed_count = 0
+        self.dropped_count = 0
+    
+    # - Properties
+    
+    def capacity(self) -> int:
+        return self.mask + 1
+    
+    def size(self) -> int:
+        return self.write_index - self.read_index
+    
+    def is_empty(self) -> bool:
+        return self.write_index == self.read_index
+    
+    def get_pushed_count(self) -> int: return self.pushed_count
+    def get_dropped_count(self) -> int: return self.dropped_count
+    
+    # - Actions
+    
+    # Producer side
+    def push(self, item) -> bool:
+        index = self.write_index
+        
+        if index - self.read_index > self.mask:
+            self.dropped_count += 1
+            return False
+        
+        self.slots[index & self.mask] = item
+        self.write_index = index + 1 # Publish only after the slot is written
+        self.pushed_count += 1
+        return True
+    
+    # Consumer side, returns up to max_count items in insertion order
+    def drain(self, max_count=None) -> list:
+        start = self.read_index
+        end = self.write_index
+        
+        if max_count is not None:
+            end = min(end, start + max_count)
+        
+        result = []
+        
+        for index in range(start, end):
+            slot = index & self.mask
+            result.append(self.slots[slot])
+            self.slots[slot] = None
+        
+        self.read_index = end
+        return result
@@ -1,11 +1,13 @@
-import time
+from kink import di
+from Utilities.Clock import ClockProtocol, ns_to_seconds
 
 
 class Timer:
     
     # - Init
     
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock if clock is not None else di[ClockProtocol]
         self.running = False
         self.paused = False
         self.start_time = 0
@@ -13,6 +15,8 @@ class Timer:
     
     # - Properties
     
+    def get_clock(self) -> ClockProtocol: return self.clock
+    
     def is_running(self) -> bool:
         return self.running
     
@@ -20,37 +24,47 @@ class Timer:
         return self.paused
     
     def elapsed_time(self) -> float:
+        return ns_to_seconds(self.elapsed_time_ns())
+    
+    def elapsed_time_ns(self) -> int:
         if not self.is_running() or self.is_paused():
             return self.bonus_elapsed_time
         
-        return (time.time() - self.start_time) + self.bonus_elapsed_time
+        return (self.clock.now_ns() - self.start_time) + self.bonus_elapsed_time
     
     # - Actions
     
     def start(self):
         assert not self.is_running()
         self.running = True
-        self.start_time = time.time()
+        self.start_time = self.clock.now_ns()
         self.paused = False
         self.bonus_elapsed_time = 0
     
     def pause(self):
         assert self.running
         assert not self.paused
-        self.bonus_elapsed_time = self.elapsed_time()
+        self.bonus_elapsed_time = self.elapsed_time_ns()
         self.paused = True
-
+    
     def resume(self):
         assert self.running
         assert self.paused
         self.paused = False
-        self.start_time = time.time()
+        self.start_time = self.clock.now_ns()
     
     def stop(self):
         assert self.running
+        self.bonus_elapsed_time = self.elapsed_time_ns()
         self.paused = False
         self.running = False
-        self.bonus_elapsed_time = self.elapsed_time()
+    
+    # Sets the elapsed time, without changing the running state
+    def seek(self, elapsed_time_ns: int):
+        self.bonus_elapsed_time = elapsed_time_ns
+        
+        if self.running and not self.paused:
+            self.start_time = self.clock.now_ns()
     
     def reset(self):
         assert not self.running
@@ -0,0 +1,100 @@
+# Python 3
+# Memory of a generated recording stored as action objects vs compact action columns
+# Usage: python bench/bench_action_columns_memory.py [--events 1000000]
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynput.keyboard import KeyCode
+from Model.KeyPressType import KeyPressType
+from Model.KeyboardInputEvent import KeystrokeEvent
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionColumns import ScriptActionColumns
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptInputEventAction import ScriptInputEventAction
+from Utilities.Point import Point
+
+KEY_EVERY = 10 # One key press and release every KEY_EVERY events, the other events are mouse moves
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_action_columns_memory.py', description='Memory of the action storage')
+    parser.add_argument('--events', type=int, default=1000000, help='number of recorded events')
+    return parser.parse_args(arguments)
+
+
+# The events are created one by one, as they arrive while recording
+def recorded_events(event_count: int):
+    key = KeyCode.from_char('a')
+    
+    for index in range(event_count):
+        time = index * 0.001
+        
+        if index % KEY_EVERY == 0:
+            yield ScriptActionType.KEYBOARD_PRESS, KeystrokeEvent(KeyPressType.PRESS, key), time
+        elif index % KEY_EVERY == 1:
+            yield ScriptActionType.KEYBOARD_RELEASE, KeystrokeEvent(KeyPressType.RELEASE, key), time
+        else:
+            yield ScriptActionType.MOUSE_MOVE, MouseMoveEvent(Point(index % 1920, index % 1080)), time
+
+
+def make_objects(event_count: int) -> ScriptActions:
+    actions = []
+    
+    for action_type, event, time in recorded_events(event_count):
+        event.set_time(time)
+        actions.append(ScriptInputEventAction(action_type, event, time))
+    
+    return ScriptActions(actions)
+
+
+def make_columns(event_count: int) -> ScriptActions:
+    columns = ScriptActionColumns()
+    
+    for action_type, event, time in recorded_events(event_count):
+        event.set_time(time)
+        columns.append_event(event, action_type)
+    
+    return ScriptActions(columns)
+
+
+# Time (in seconds), retained memory (in bytes) and result of function
+def measure(function):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return duration, memory, result
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    print(f'events        {options.events}, one key press and release every {KEY_EVERY}, mouse moves otherwise')
+    
+    duration, object_memory, actions = measure(lambda: make_objects(options.events))
+    print(f'objects       {object_memory / 2 ** 20:.1f} MB, {object_memory / options.events:.0f} bytes/event, built in {duration:.2f} s with tracing')
+    del actions
+    
+    duration, column_memory, actions = measure(lambda: make_columns(options.events))
+    print(f'columns       {column_memory / 2 ** 20:.1f} MB, {column_memory / options.events:.0f} bytes/event, built in {duration:.2f} s with tracing')
+    print(f'ratio         {object_memory / column_memory:.1f}x smaller')
+    
+    # Editing needs the action objects, they are created from the columns on demand
+    start = time.perf_counter()
+    actions.data[len(actions.data) // 2:len(actions.data) // 2 + 1000]
+    print(f'materialize   {(time.perf_counter() - start) * 1000:.2f} ms for 1000 actions')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,155 @@
+# Python 3
+# Cost of the logging calls in the record and playback hot loops
+# Compares the ways of writing a verbose message while verbose logging is off, then runs the listener
+# and simulator hot paths with verbose logging off, on, and on with the asynchronous writer
+# The records are formatted but not written anywhere, no input is sent to the system
+# Usage: python bench/bench_logging_cost.py [--calls 1000000]
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from Service.Dependencies import DependencyService
+from Service.EventMonitor import MouseEventMonitor
+from Service.EventSimulator import MouseEventSimulator
+from Utilities.Logger import LoggerProtocol, VerboseFlag
+from Utilities.LogSink import LogLevel, LogSubsystem, LogTimeFormat, text_line
+from Utilities.RingBuffer import RingBuffer
+
+BUFFER_CAPACITY = 1 << 16
+
+
+# Formats the records like the stdout sink and discards them
+class NullLogSink:
+    def __init__(self):
+        self.time_format = LogTimeFormat()
+        self.count = 0
+    
+    def write(self, record):
+        text_line(record, self.time_format, True)
+        self.count += 1
+    
+    def flush(self): pass
+    def close(self): pass
+
+
+# Listener that listens to nothing, the benchmark calls the monitor like the listener thread would
+class NullListener:
+    def start(self): pass
+    def stop(self): pass
+    def wait(self): pass
+    def join(self): pass
+
+
+# Mouse controller that sends nothing
+class NullController:
+    position = None
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_logging_cost.py', description='Logging cost in the hot loops')
+    parser.add_argument('--calls', type=int, default=1000000, help='calls per measure')
+    return parser.parse_args(arguments)
+
+
+# Time (in µs) per call of function(index)
+def measure(function, call_count: int) -> float:
+    start = time.perf_counter()
+    
+    for index in range(call_count):
+        function(index)
+    
+    return (time.perf_counter() - start) / call_count * 1e6
+
+
+def measure_disabled_calls(logger, call_count: int):
+    verbose = VerboseFlag(logger)
+    
+    def nothing(index):
+        pass
+    
+    def f_string(index):
+        logger.verbose_info(f'({index}, {index}) moved')
+    
+    def lazy_args(index):
+        logger.verbose_info('(%s, %s) moved', index, index)
+    
+    def flag_check(index):
+        if verbose:
+            logger.verbose_info('(%s, %s) moved', index, index)
+    
+    baseline = measure(nothing, call_count)
+    print('verbose off, per call')
+    
+    for title, function in (('f-string', f_string), ('%-style args', lazy_args), ('VerboseFlag check', flag_check)):
+        print(f'  {title:<18} {measure(function, call_count) - baseline:7.3f} µs')
+
+
+def make_monitor() -> (MouseEventMonitor, RingBuffer):
+    buffer = RingBuffer(BUFFER_CAPACITY)
+    monitor = di[MouseEventMonitor]
+    monitor.setup(None, None, None, None)
+    monitor.set_listener(NullListener())
+    monitor.set_buffer(buffer)
+    monitor.start()
+    return monitor, buffer
+
+
+def measure_hot_loops(logger, sink: NullLogSink, call_count: int):
+    monitor, buffer = make_monitor()
+    simulator = MouseEventSimulator()
+    simulator.mouse = NullController()
+    
+    def record(index):
+        monitor.on_move(index, index)
+        
+        if buffer.size() == BUFFER_CAPACITY:
+            buffer.drain()
+    
+    def play(index):
+        simulator.move_to(index, index)
+    
+    print('hot loops, per event')
+    
+    for title, level, asynchronous in (('verbose off', LogLevel.INFO, False), ('verbose on', LogLevel.VERBOSE, False),
+                                       ('verbose on, async', LogLevel.VERBOSE, True)):
+        logger.set_level(level)
+        logger.set_asynchronous(asynchronous)
+        written_count = sink.count
+        record_time = measure(record, call_count)
+        play_time = measure(play, call_count)
+        logger.flush()
+        print(f'  {title:<18} record {record_time:7.3f} µs, play {play_time:7.3f} µs, '
+              f'{sink.count - written_count} records written, {logger.get_dropped_count()} dropped')
+    
+    logger.set_asynchronous(False)
+    logger.set_level(LogLevel.INFO)
+    monitor.stop()
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    logger = di[LoggerProtocol]
+    sink = NullLogSink()
+    
+    for value in logger.get_sinks():
+        logger.remove_sink(value)
+    
+    logger.add_sink(sink)
+    logger.set_level(LogLevel.INFO)
+    
+    print(f'calls         {options.calls}')
+    measure_disabled_calls(logger.for_subsystem(LogSubsystem.RECORDER), options.calls)
+    measure_hot_loops(logger, sink, options.calls)
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,134 @@
+# Python 3
+# Allocations and memory of the model types through load, play and save of a generated script
+# The events are not sent to the system
+# Usage: python bench/bench_model_allocations.py [--actions 200000]
+import argparse
+import gc
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from Model.KeyPressType import KeyPressType
+from Model.KeyboardInputEvent import KeystrokeEvent
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Model.ScriptInputEventAction import ScriptInputEventAction
+from Service.Dependencies import DependencyService
+from Service.EventSimulator import MouseEventSimulatorProtocol, KeyboardEventSimulatorProtocol
+from Service.ScriptStorage import ScriptStorage
+from Service.Work.ScriptActionExecutionBuilder import ScriptActionExecutionBuilderProtocol
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+from Utilities.Path import Path
+from Utilities.Point import Point
+
+KEY_EVERY = 10 # One key press and release every KEY_EVERY actions, the other actions are mouse moves
+COPY_COUNT = 100000 # Calls of the ScriptData info and configuration getters
+
+
+# Keyboard and mouse simulator that sends nothing
+class NullEventSimulator:
+    def simulate(self, event): pass
+    def press(self, key): pass
+    def release(self, key): pass
+    def click(self, key): pass
+    def move_to(self, x, y): pass
+    def scroll(self, position, offset): pass
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_model_allocations.py', description='Model allocations and memory')
+    parser.add_argument('--actions', type=int, default=200000, help='number of actions of the script')
+    return parser.parse_args(arguments)
+
+
+def make_script(action_count: int) -> ScriptData:
+    actions = []
+    
+    for index in range(action_count):
+        time = index * 0.001
+        
+        if index % KEY_EVERY == 0:
+            event = KeystrokeEvent(KeyPressType.PRESS, 'a')
+            action_type = ScriptActionType.KEYBOARD_PRESS
+        elif index % KEY_EVERY == 1:
+            event = KeystrokeEvent(KeyPressType.RELEASE, 'a')
+            action_type = ScriptActionType.KEYBOARD_RELEASE
+        else:
+            event = MouseMoveEvent(Point(index % 1920, index % 1080))
+            action_type = ScriptActionType.MOUSE_MOVE
+        
+        event.set_time(time)
+        actions.append(ScriptInputEventAction(action_type, event, time))
+    
+    return ScriptData(ScriptActions(actions))
+
+
+def play(script: ScriptData):
+    plan = di[ScriptActionExecutionBuilderProtocol].compile(None, ScriptActionTimeline(script.get_actions()))
+    
+    for index in range(plan.count()):
+        plan.step(index).execute()
+
+
+# The getters share the immutable info and configuration instead of copying them
+def read_summaries(script: ScriptData) -> list:
+    return [(script.get_info(), script.get_config()) for _ in range(COPY_COUNT)]
+
+
+def peak_rss() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # MB, ru_maxrss is in KB on Linux
+
+
+# Prints the time, peak traced memory and retained memory blocks of function, returns its result
+def measure(title: str, function):
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    print(f'{title:<12} {duration:7.2f} s, peak {peak / 2 ** 20:7.1f} MB, {retained_blocks:>9} blocks retained, '
+          f'peak rss {peak_rss():.0f} MB')
+    return result
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.WARNING)
+    di[MouseEventSimulatorProtocol] = NullEventSimulator()
+    di[KeyboardEventSimulatorProtocol] = NullEventSimulator()
+    
+    print(f'actions      {options.actions}, times with tracing')
+    
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = Path(os.path.join(directory, 'script.json'))
+        ScriptStorage(json_path).write_script_data_to_file(make_script(options.actions))
+        
+        script = measure('load json', lambda: ScriptStorage(json_path).read_script_data_from_file())
+        measure('play', lambda: play(script))
+        measure('save json', lambda: ScriptStorage(Path(os.path.join(directory, 'saved.json'))).write_script_data_to_file(script))
+        measure('save mky', lambda: ScriptStorage(Path(os.path.join(directory, 'saved.mky'))).write_script_data_to_file(script))
+        summaries = measure('summaries', lambda: read_summaries(script))
+        print(f'{"":<12} {len({id(info) for info, _ in summaries})} info instance(s) for {COPY_COUNT} get_info() calls')
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,119 @@
+# Python 3
+# Per action dispatch overhead of a compiled script: building the execution of every action when it is reached
+# (before) vs the prebuilt and reusable steps of the plan (after), on a generated columnar script
+# The events are not sent to the system
+# Usage: python bench/bench_plan_dispatch.py [--actions 1000000] [--repeat 3]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from pynput.keyboard import KeyCode
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Service.Dependencies import DependencyService
+from Service.EventSimulator import MouseEventSimulatorProtocol, KeyboardEventSimulatorProtocol
+from Service.Work.ScriptActionExecutionBuilder import ScriptActionExecutionBuilderProtocol
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+
+KEY_EVERY = 10 # One key press and release every KEY_EVERY actions, the other actions are mouse moves
+
+
+# Keyboard and mouse simulator that sends nothing
+class NullEventSimulator:
+    def simulate(self, event): pass
+    def press(self, key): pass
+    def release(self, key): pass
+    def click(self, key): pass
+    def move_to(self, x, y): pass
+    def scroll(self, position, offset): pass
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_plan_dispatch.py', description='Per action dispatch overhead')
+    parser.add_argument('--actions', type=int, default=1000000, help='number of actions of the script')
+    parser.add_argument('--repeat', type=int, default=3, help='number of times the script is stepped through')
+    return parser.parse_args(arguments)
+
+
+def make_columns(action_count: int) -> ScriptActionColumns:
+    result = ScriptActionColumns()
+    move = TYPE_CODES[ScriptActionType.MOUSE_MOVE]
+    press = TYPE_CODES[ScriptActionType.KEYBOARD_PRESS]
+    release = TYPE_CODES[ScriptActionType.KEYBOARD_RELEASE]
+    key = KeyCode.from_char('a')
+    
+    for index in range(action_count):
+        time = index * 0.001
+        
+        if index % KEY_EVERY == 0:
+            result.append_values(press, time, key=key)
+        elif index % KEY_EVERY == 1:
+            result.append_values(release, time, key=key)
+        else:
+            result.append_values(move, time, index % 1000, index % 700)
+    
+    return result
+
+
+# The action and its execution are built when the action is reached, as before the plan had input steps
+def step_building(builder, timeline: ScriptActionTimeline, repeat_count: int):
+    for _ in range(repeat_count):
+        for index in range(timeline.count()):
+            builder.build(timeline.action(index)).execute()
+
+
+def step_plan(plan, repeat_count: int):
+    for _ in range(repeat_count):
+        for index in range(plan.count()):
+            plan.step(index).execute()
+
+
+# Time (in seconds) and peak traced memory (in bytes) of function
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak, result
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.WARNING)
+    di[MouseEventSimulatorProtocol] = NullEventSimulator()
+    di[KeyboardEventSimulatorProtocol] = NullEventSimulator()
+    
+    timeline = ScriptActionTimeline(ScriptActions(make_columns(options.actions)))
+    builder = di[ScriptActionExecutionBuilderProtocol]
+    step_count = options.actions * options.repeat
+    
+    duration, peak, plan = measure(lambda: builder.compile(None, timeline))
+    print(f'actions   {options.actions} columnar, stepped {options.repeat} time(s)')
+    print(f'compile   {duration:.3f} s, {peak / 2 ** 20:.1f} MB')
+    
+    # Without tracing, which slows down every allocation
+    for title, function in (('before', lambda: step_building(builder, timeline, options.repeat)),
+                            ('after', lambda: step_plan(plan, options.repeat))):
+        start = time.perf_counter()
+        function()
+        duration = time.perf_counter() - start
+        print(f'{title:<9} {duration / step_count * 1e6:.3f} us/action, {step_count / duration:.0f} actions/s')
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+# Python 3
+# Plays a generated script of mouse moves and reports the CPU usage and the lateness of the actions
+# The moves are not sent to the system, only the scheduling of the playback is measured
+# Usage: python bench/bench_playback_lateness.py [--actions 100000] [--interval 0.5] [--spin 1]
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Service.Dependencies import DependencyService
+from Service.EventSimulator import MouseEventSimulatorProtocol, KeyboardEventSimulatorProtocol
+from Service.Work.ScriptSimulation import ScriptSimulation, SPIN_INTERVAL
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+
+
+# Keyboard and mouse simulator that sends nothing
+class NullEventSimulator:
+    def simulate(self, event): pass
+    def press(self, key): pass
+    def release(self, key): pass
+    def click(self, key): pass
+    def move_to(self, x, y): pass
+    def scroll(self, position, offset): pass
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_playback_lateness.py', description='Playback lateness and CPU usage')
+    parser.add_argument('--actions', type=int, default=100000, help='number of mouse moves')
+    parser.add_argument('--interval', type=float, default=0.5, help='time (in ms) between two moves')
+    parser.add_argument('--spin', type=float, default=SPIN_INTERVAL,
+                        help='time (in ms) spent spinning before every deadline')
+    return parser.parse_args(arguments)
+
+
+def make_script(action_count: int, interval: float) -> ScriptData:
+    columns = ScriptActionColumns()
+    code = TYPE_CODES[ScriptActionType.MOUSE_MOVE]
+    
+    for index in range(action_count):
+        columns.append_values(code, index * interval / 1000, index % 1000, index % 700)
+    
+    return ScriptData(ScriptActions(columns))
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.WARNING)
+    di[MouseEventSimulatorProtocol] = NullEventSimulator()
+    di[KeyboardEventSimulatorProtocol] = NullEventSimulator()
+    
+    simulation = ScriptSimulation(make_script(options.actions, options.interval))
+    simulation.set_spin_interval(options.spin)
+    
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    simulation.run()
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+    
+    summary = simulation.timing_summary()
+    
+    print(f'actions       {summary.fired_count} every {options.interval} ms, spin {options.spin} ms')
+    print(f'load time     {simulation.get_load_time():.3f} s')
+    print(f'run time      {simulation.get_run_time():.3f} s')
+    print(f'cpu           {cpu_time:.3f} s, {100 * cpu_time / wall_time:.1f}% of one core')
+    print(f'lateness p50  {summary.lateness_p50 * 1000:.3f} ms')
+    print(f'lateness p95  {summary.lateness_p95 * 1000:.3f} ms')
+    print(f'lateness p99  {summary.lateness_p99 * 1000:.3f} ms')
+    print(f'lateness max  {summary.lateness_max * 1000:.3f} ms')
+    print(f'throughput    {summary.throughput:.0f} actions/s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,128 @@
+# Python 3
+# Sends generated mouse moves at a fixed interval while the main thread is periodically busy, like a UI refresh
+# Compares the intervals between the capture times (stamped in the listener thread) and the delivery times
+# (when the main thread receives the event), the nominal interval is the one of the generated moves
+# Usage: python bench/bench_recording_jitter.py [--events 2000] [--interval 1] [--load 30] [--load-every 100]
+import argparse
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No events are listened to, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QCoreApplication, QTimer
+from kink import di
+from Service.Dependencies import DependencyService
+from Service.EventMonitor import MouseEventMonitor
+from Utilities.Clock import ClockProtocol, ns_to_seconds
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+
+
+# Listener that listens to nothing, the generator thread stands in for it
+class NullListener:
+    def start(self): pass
+    def stop(self): pass
+    def wait(self): pass
+    def join(self): pass
+
+
+class Generator(threading.Thread):
+    def __init__(self, monitor: MouseEventMonitor, event_count: int, interval: float):
+        super(Generator, self).__init__()
+        self.monitor = monitor
+        self.event_count = event_count
+        self.interval = interval
+    
+    def run(self):
+        deadline = time.perf_counter()
+        
+        for index in range(self.event_count):
+            delay = deadline - time.perf_counter()
+            
+            if delay > 0:
+                time.sleep(delay)
+            
+            self.monitor.on_move(index % 1920, index % 1080)
+            deadline += self.interval
+
+
+# Keeps the main thread busy for load seconds every time it fires
+# The busy loop holds the GIL, so captures can still wait up to sys.getswitchinterval()
+class UILoad:
+    def __init__(self, load: float, load_every: float):
+        self.load = load
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(round(load_every * 1000))
+    
+    def refresh(self):
+        end = time.perf_counter() + self.load
+        
+        while time.perf_counter() < end:
+            pass
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_recording_jitter.py', description='Capture and delivery jitter')
+    parser.add_argument('--events', type=int, default=2000, help='number of mouse moves')
+    parser.add_argument('--interval', type=float, default=1, help='time (in ms) between two moves')
+    parser.add_argument('--load', type=float, default=30, help='time (in ms) the main thread is busy')
+    parser.add_argument('--load-every', type=float, default=100, help='time (in ms) between two busy periods')
+    return parser.parse_args(arguments)
+
+
+def percentile(values: list, fraction: float) -> float:
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+# Prints the deviation (in ms) of the intervals between the times from the nominal interval
+def print_jitter(title: str, times: list, interval: float):
+    deviations = sorted(abs(ns_to_seconds(end - start) - interval) for start, end in zip(times, times[1:]))
+    print(f'{title:<10} p50 {percentile(deviations, 0.5) * 1000:7.3f} ms, '
+          f'p99 {percentile(deviations, 0.99) * 1000:7.3f} ms, max {deviations[-1] * 1000:7.3f} ms')
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    application = QCoreApplication(sys.argv[:1])
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.WARNING)
+    clock = di[ClockProtocol]
+    
+    capture_times = []
+    delivery_times = []
+    monitor = di[MouseEventMonitor]
+    
+    def on_move(event):
+        delivery_times.append(clock.now_ns())
+        capture_times.append(monitor.get_capture_time())
+        
+        if len(delivery_times) == options.events:
+            application.quit()
+    
+    monitor.setup(on_move, lambda event: None, lambda event: None, lambda event: None)
+    monitor.set_listener(NullListener())
+    monitor.start()
+    
+    load = UILoad(options.load / 1000, options.load_every / 1000)
+    generator = Generator(monitor, options.events, options.interval / 1000)
+    generator.start()
+    application.exec_()
+    generator.join()
+    load.timer.stop()
+    monitor.stop()
+    
+    print(f'events     {len(delivery_times)} every {options.interval} ms, '
+          f'main thread busy {options.load} ms every {options.load_every} ms')
+    print_jitter('capture', capture_times, options.interval / 1000)
+    print_jitter('delivery', delivery_times, options.interval / 1000)
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
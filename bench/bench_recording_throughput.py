@@ -0,0 +1,135 @@
+# Python 3
+# Records a paced stream of generated mouse events through the listener ring buffers
+# Reports the events recorded and dropped, the buffer fill, the capture cost and the CPU usage
+# The system listeners are not started, a producer thread calls the monitor like the listener thread would
+# Usage: python bench/bench_recording_throughput.py [--rate 2000] [--seconds 10] [--capacity 65536]
+import argparse
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No events are listened to, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from pynput.mouse import Button as MouseKey
+from Service.Dependencies import DependencyService
+from Service.EventMonitorManager import EventMonitorWorker, RING_BUFFER_CAPACITY
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+from Utilities.RingBuffer import RingBuffer
+
+CLICK_EVERY = 100 # One click (press and release) every CLICK_EVERY moves
+START_TIMEOUT = 5 # Seconds
+
+
+# Listener that listens to nothing, the producer thread stands in for it
+class NullListener:
+    def start(self): pass
+    def stop(self): pass
+    def wait(self): pass
+    def join(self): pass
+
+
+class Producer(threading.Thread):
+    def __init__(self, worker: EventMonitorWorker, rate: int, duration: float):
+        super(Producer, self).__init__()
+        self.worker = worker
+        self.rate = rate
+        self.duration = duration
+        self.event_count = 0
+        self.capture_time = 0
+        self.max_fill = 0
+    
+    def run(self):
+        monitor = self.worker.mouse_monitor
+        buffer = self.worker.mouse_buffer
+        interval = 1 / self.rate
+        start = time.perf_counter()
+        end = start + self.duration
+        deadline = start
+        
+        while deadline < end:
+            delay = deadline - time.perf_counter()
+            
+            if delay > 0:
+                time.sleep(delay)
+            
+            x = self.event_count % 1920
+            y = self.event_count % 1080
+            
+            capture_start = time.perf_counter()
+            monitor.on_move(x, y)
+            
+            if self.event_count % CLICK_EVERY == 0:
+                monitor.on_click(x, y, MouseKey.left, True)
+                monitor.on_click(x, y, MouseKey.left, False)
+                self.event_count += 2
+            
+            self.capture_time += time.perf_counter() - capture_start
+            self.event_count += 1
+            self.max_fill = max(self.max_fill, buffer.size())
+            deadline += interval
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_recording_throughput.py', description='Recording throughput')
+    parser.add_argument('--rate', type=int, default=2000, help='mouse moves per second')
+    parser.add_argument('--seconds', type=float, default=10, help='recording duration')
+    parser.add_argument('--capacity', type=int, default=RING_BUFFER_CAPACITY,
+                        help='events per ring buffer, a power of two')
+    return parser.parse_args(arguments)
+
+
+def make_worker(capacity: int) -> EventMonitorWorker:
+    worker = EventMonitorWorker()
+    worker.keyboard_monitor.set_listener(NullListener())
+    worker.mouse_monitor.set_listener(NullListener())
+    worker.mouse_buffer = RingBuffer(capacity)
+    worker.mouse_monitor.set_buffer(worker.mouse_buffer)
+    return worker
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.ERROR) # Dropped events are reported below
+    
+    worker = make_worker(options.capacity)
+    worker.start()
+    deadline = time.monotonic() + START_TIMEOUT
+    
+    while not worker.mouse_monitor.is_running():
+        if time.monotonic() > deadline:
+            print('the recording did not start')
+            return 1
+        
+        time.sleep(0.001)
+    
+    producer = Producer(worker, options.rate, options.seconds)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    producer.start()
+    producer.join()
+    worker.stop()
+    worker.wait()
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - wall_start
+    
+    recorded_count = worker.get_actions().count()
+    
+    print(f'rate          {producer.event_count / wall_time:.0f} events/s for {wall_time:.2f} s, '
+          f'{options.rate} moves/s requested')
+    print(f'events        {producer.event_count} sent, {worker.mouse_buffer.get_pushed_count()} pushed, '
+          f'{worker.get_dropped_count()} dropped, {recorded_count} recorded')
+    print(f'buffer fill   {producer.max_fill} max of {worker.mouse_buffer.capacity()}')
+    print(f'capture cost  {producer.capture_time / producer.event_count * 1e6:.2f} µs/event in the listener thread')
+    print(f'cpu           {cpu_time:.3f} s, {100 * cpu_time / wall_time:.1f}% of one core')
+    
+    return 0 if recorded_count + worker.get_dropped_count() == producer.event_count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+# Python 3
+# Saves and loads a generated script of 1M actions in the JSON and the binary script formats
+# Reports the times and the file sizes, and checks that both formats load the same actions
+# Usage: python bench/bench_script_format.py [--actions 1000000]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from pynput.keyboard import KeyCode
+from Model.KeyPressType import KeyPressType
+from Model.KeyboardInputEvent import KeystrokeEvent
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionColumns import ScriptActionColumns, NO_KEY
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Service.Dependencies import DependencyService
+from Service.ScriptStorage import ScriptStorage, JSON_FILE_FORMAT, BINARY_FILE_FORMAT
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+from Utilities.Path import Path
+from Utilities.Point import Point
+
+KEY_EVERY = 10 # One key press and release every KEY_EVERY actions, the other actions are mouse moves
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_script_format.py', description='Script load and save times')
+    parser.add_argument('--actions', type=int, default=1000000, help='number of actions of the script')
+    return parser.parse_args(arguments)
+
+
+def make_script(action_count: int) -> ScriptData:
+    columns = ScriptActionColumns()
+    key = KeyCode.from_char('a')
+    
+    for index in range(action_count):
+        if index % KEY_EVERY == 0:
+            event = KeystrokeEvent(KeyPressType.PRESS, key)
+            action_type = ScriptActionType.KEYBOARD_PRESS
+        elif index % KEY_EVERY == 1:
+            event = KeystrokeEvent(KeyPressType.RELEASE, key)
+            action_type = ScriptActionType.KEYBOARD_RELEASE
+        else:
+            event = MouseMoveEvent(Point(index % 1920, index % 1080))
+            action_type = ScriptActionType.MOUSE_MOVE
+        
+        event.set_time(index * 0.001)
+        columns.append_event(event, action_type)
+    
+    return ScriptData(ScriptActions(columns))
+
+
+# Returns the loaded script, prints the times and the file size
+def save_and_load(script: ScriptData, path: Path, title: str) -> ScriptData:
+    storage = ScriptStorage(path)
+    
+    start = time.perf_counter()
+    storage.write_script_data_to_file(script)
+    save_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = storage.read_script_data_from_file(columnar=True)
+    load_time = time.perf_counter() - start
+    
+    size = os.path.getsize(path.absolute)
+    print(f'{title:<8} save {save_time:7.3f} s, load {load_time:7.3f} s, size {size / 2 ** 20:7.1f} MB')
+    return result
+
+
+# Compares the columns, the keys by value since the key tables can be in a different order
+def same_actions(script: ScriptData, other: ScriptData) -> bool:
+    columns = script.get_actions().data
+    other_columns = other.get_actions().data
+    
+    for name in ('times', 'types', 'xs', 'ys', 'dxs', 'dys'):
+        if getattr(columns, name) != getattr(other_columns, name):
+            return False
+    
+    return key_values(columns) == key_values(other_columns)
+
+
+def key_values(columns: ScriptActionColumns) -> list:
+    return [None if key == NO_KEY else str(columns.key_table[key]) for key in columns.keys]
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.WARNING)
+    
+    script = make_script(options.actions)
+    print(f'actions  {options.actions}')
+    
+    with tempfile.TemporaryDirectory() as directory:
+        json_script = save_and_load(script, Path(os.path.join(directory, f'script.{JSON_FILE_FORMAT}')), 'json')
+        binary_script = save_and_load(script, Path(os.path.join(directory, f'script.{BINARY_FILE_FORMAT}')), 'binary')
+    
+    matches = same_actions(script, json_script) and same_actions(script, binary_script)
+    print(f'actions  {"identical" if matches else "DIFFERENT"} after loading both formats')
+    
+    return 0 if matches else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
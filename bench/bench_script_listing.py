@@ -0,0 +1,129 @@
+# Python 3
+# Lists a generated folder of scripts the way the scripts tab does, and reports the time of every step
+# Usage: python bench/bench_script_listing.py [--scripts 1000] [--actions 200] [--format json|mky] [--legacy] [--threads N]
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy') # No input is simulated, so no display is needed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kink import di
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Model.ScriptInfo import ScriptInfo
+from Model.ScriptSummary import ScriptSummary
+from Parser.ScriptDataParser import JSON_DEFAULT_ROOT, JSON_INFO, JSON_EVENT_COUNT, JSON_DURATION
+from Service import ScriptCatalog as script_catalog
+from Service.Dependencies import DependencyService
+from Service.ScriptCatalog import ScriptCatalog, ScriptCatalogSort, CATALOG_FILE_NAME
+from Service.ScriptStorage import ScriptStorage
+from Utilities import Path as PathUtils
+from Utilities.Logger import LoggerProtocol
+from Utilities.LogSink import LogLevel
+from Utilities.Path import Path
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='bench_script_listing.py', description='Scripts folder listing time')
+    parser.add_argument('--scripts', type=int, default=1000, help='number of scripts in the folder')
+    parser.add_argument('--actions', type=int, default=200, help='number of actions of every script')
+    parser.add_argument('--format', choices=('json', 'mky'), default='json', help='file format of the scripts')
+    parser.add_argument('--legacy', action='store_true',
+                        help='json only, remove the event count and duration from the headers, so every script is read in full')
+    parser.add_argument('--threads', type=int, default=script_catalog.MAX_READ_WORKERS,
+                        help='threads reading the scripts, compared with a single thread')
+    
+    result = parser.parse_args(arguments)
+    
+    if result.legacy and result.format != 'json':
+        parser.error('--legacy requires --format json')
+    
+    if result.threads < 1:
+        parser.error('--threads must be 1 or more')
+    
+    return result
+
+
+def make_scripts(directory: str, options):
+    columns = ScriptActionColumns()
+    code = TYPE_CODES[ScriptActionType.MOUSE_MOVE]
+    
+    for index in range(options.actions):
+        columns.append_values(code, index * 0.01, index, index)
+    
+    actions = ScriptActions(columns)
+    
+    for index in range(options.scripts):
+        name = f'script-{index:05}'
+        file_path = PathUtils.combine_paths(directory, f'{name}.{options.format}')
+        ScriptStorage(file_path).write_script_data_to_file(ScriptData(actions, ScriptSummary(ScriptInfo(name=name))))
+        
+        if options.legacy:
+            remove_stats(file_path)
+
+
+# Header of the scripts written before the event count and duration were stored
+def remove_stats(file_path: Path):
+    with open(file_path.absolute, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    
+    del data[JSON_DEFAULT_ROOT][JSON_INFO][JSON_EVENT_COUNT]
+    del data[JSON_DEFAULT_ROOT][JSON_INFO][JSON_DURATION]
+    
+    with open(file_path.absolute, 'w', encoding='utf-8') as file:
+        json.dump(data, file)
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+# Without the catalog file, every script is read
+def cold_update(directory: str, workers: int) -> float:
+    catalog_path = os.path.join(directory, CATALOG_FILE_NAME)
+    
+    if os.path.exists(catalog_path):
+        os.remove(catalog_path)
+    
+    script_catalog.MAX_READ_WORKERS = workers
+    duration, read_count = timed(ScriptCatalog(Path(directory)).update)
+    assert read_count > 0
+    return duration
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    DependencyService.setup()
+    di[LoggerProtocol].set_level(LogLevel.WARNING)
+    max_workers = script_catalog.MAX_READ_WORKERS
+    
+    with tempfile.TemporaryDirectory() as directory:
+        duration, _ = timed(lambda: make_scripts(directory, options))
+        legacy = ', legacy headers' if options.legacy else ''
+        print(f'scripts            {options.scripts} .{options.format} of {options.actions} actions{legacy}, written in {duration:.2f} s')
+        
+        for workers in sorted({1, options.threads}):
+            print(f'cold, {workers} thread(s)  {cold_update(directory, workers):.3f} s')
+        
+        script_catalog.MAX_READ_WORKERS = max_workers
+        catalog = ScriptCatalog(Path(directory))
+        duration, read_count = timed(catalog.update)
+        print(f'warm               {duration:.3f} s, {read_count} read')
+        
+        duration, entries = timed(lambda: catalog.query('script-00', ScriptCatalogSort.DURATION))
+        print(f'query              {duration * 1000:.2f} ms, {len(entries)} match(es)')
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
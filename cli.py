@@ -0,0 +1,159 @@
+# Python 3
+# Runs scripts without the GUI, Qt is never imported
+# Usage: python cli.py run scripts/script.json [--repeat N] [--report DIR]
+#        python cli.py convert scripts/script.json scripts/script.mky
+#        python cli.py convert recordings/recording.jsonl scripts/script.json
+import argparse
+import sys
+import threading
+from dataclasses import replace
+from kink import di
+from Model.ScriptConfiguration import ScriptConfiguration
+from Model.ScriptData import ScriptData
+from Model.ScriptInfo import ScriptInfo
+from Model.ScriptSummary import ScriptSummary
+from Service.OSNotificationCenter import OSNotificationCenterProtocol
+from Service.Dependencies import DependencyService
+from Service.RecordingJournal import JOURNAL_FILE_FORMAT, read_journal
+from Service.ScriptStorage import ScriptStorage
+from Service.Work.ScriptSimulation import ScriptSimulation
+from Utilities.LogSink import RotatingFileLogSink, LogSubsystem
+from Utilities.Logger import Logger, LoggerProtocol
+from Utilities.Path import Path
+
+LOG_FILE_PATH = 'logs/monkeying.log'
+NOTIFICATION_FLUSH_TIMEOUT = 10 # Time (in seconds) to wait for the start/end notifications before exiting
+WAIT_INTERVAL = 0.2 # Time (in seconds) between checks for Ctrl+C while the script runs
+
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_CANCELLED = 130
+
+
+def parse_arguments(arguments):
+    parser = argparse.ArgumentParser(prog='cli.py', description='Monkeying, runs scripts without the GUI')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help='run a script')
+    run_parser.add_argument('path', help='script file')
+    run_parser.add_argument('--repeat', type=int, default=None, metavar='N',
+                            help='number of times the script is repeated after the first run, overrides the script configuration')
+    run_parser.add_argument('--report', default=None, metavar='DIR',
+                            help='directory where a timing report of the run is written, no report by default')
+    
+    convert_parser = commands.add_parser('convert', help='convert a script to the format given by the output file extension')
+    convert_parser.add_argument('path', help=f'script file, or the .{JOURNAL_FILE_FORMAT} journal of a recording that was not saved')
+    convert_parser.add_argument('output', help='converted script file, .json or .mky')
+    
+    result = parser.parse_args(arguments)
+    
+    if result.command == 'run' and result.repeat is not None and result.repeat < 0:
+        parser.error('--repeat must be 0 or more')
+    
+    return result
+
+
+def read_script(path: str, repeat_count) -> ScriptData:
+    result = ScriptStorage(Path(path)).read_script_data_from_file(columnar=True)
+    
+    if repeat_count is not None:
+        result.set_config(replace(result.get_config(), repeat_count=repeat_count, repeat_forever=False))
+    
+    return result
+
+
+# Runs the script on a background thread, so Ctrl+C cancels it cleanly, returns the exit code
+def run_script(script_data: ScriptData, report_directory, logger) -> int:
+    simulation = ScriptSimulation(script_data)
+    simulation.set_report_directory(report_directory)
+    errors = []
+    finished = threading.Event()
+    
+    def run():
+        try:
+            simulation.run()
+        except Exception as error:
+            errors.append(error)
+        finally:
+            finished.set()
+    
+    thread = threading.Thread(target=run, name='ScriptSimulation')
+    thread.start()
+    
+    # Waits on an event instead of joining, a join interrupted by Ctrl+C may return before the thread ends
+    try:
+        while not finished.wait(WAIT_INTERVAL):
+            pass
+    except KeyboardInterrupt:
+        logger.info('cli cancel')
+        simulation.cancel()
+        finished.wait()
+        return EXIT_CANCELLED
+    
+    thread.join()
+    
+    if len(errors) > 0:
+        logger.error(f'cli script failed, error: {errors[0]!r}')
+        return EXIT_FAILURE
+    
+    if simulation.get_error() is not None:
+        return EXIT_FAILURE
+    
+    return EXIT_SUCCESS
+
+
+def convert_script(path: str, output: str, logger) -> int:
+    try:
+        if path.endswith(f'.{JOURNAL_FILE_FORMAT}'):
+            script_data = read_recovered_script(path, output)
+        else:
+            script_data = ScriptStorage(Path(path)).read_script_data_from_file(columnar=True)
+        
+        ScriptStorage(Path(output)).write_script_data_to_file(script_data)
+    except Exception as error:
+        logger.error(f"cli failed to convert '{path}', error: {error}")
+        return EXIT_FAILURE
+    
+    return EXIT_SUCCESS
+
+
+# A journal only has the recorded actions, the script is named after the output file
+def read_recovered_script(path: str, output: str) -> ScriptData:
+    summary = ScriptSummary(ScriptInfo(name=Path(output).stem()), ScriptConfiguration())
+    return ScriptData(read_journal(Path(path)), summary)
+
+
+def main(arguments) -> int:
+    options = parse_arguments(arguments)
+    
+    # DI
+    DependencyService.setup()
+    
+    logger: Logger = di[LoggerProtocol]
+    logger.add_sink(RotatingFileLogSink(Path(LOG_FILE_PATH)))
+    cli_logger = logger.for_subsystem(LogSubsystem.SIMULATOR)
+    
+    if options.command == 'convert':
+        result = convert_script(options.path, options.output, logger.for_subsystem(LogSubsystem.STORAGE))
+        logger.close()
+        return result
+    
+    try:
+        script_data = read_script(options.path, options.repeat)
+    except Exception as error:
+        cli_logger.error(f"cli failed to read '{options.path}', error: {error}")
+        logger.close()
+        return EXIT_FAILURE
+    
+    result = run_script(script_data, options.report, cli_logger)
+    
+    # Notifications are shown in the background and rate limited, the end notification may still be pending
+    if not di[OSNotificationCenterProtocol].flush(NOTIFICATION_FLUSH_TIMEOUT):
+        cli_logger.warning('cli notifications not shown before exiting')
+    
+    logger.close()
+    return result
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -3,14 +3,24 @@ import os
 
 from PyQt5.QtWidgets import QApplication
 import sys
+from kink import di
 from MainView.MainRouter import MainRouter
 from Service.Dependencies import DependencyService
+from Utilities.LogSink import RotatingFileLogSink
+from Utilities.Logger import Logger, LoggerProtocol
+from Utilities.Path import Path
 
 SCRIPTS_PATH = 'scripts'
+LOG_FILE_PATH = 'logs/monkeying.log'
 
 # DI
 DependencyService.setup()
 
+# Logging, written in the background so a slow console or disk does not slow down playback
+logger: Logger = di[LoggerProtocol]
+logger.set_asynchronous(True)
+logger.add_sink(RotatingFileLogSink(Path(LOG_FILE_PATH)))
+
 # Scripts folder
 if not os.path.exists(SCRIPTS_PATH):
     os.makedirs(SCRIPTS_PATH)
@@ -26,3 +36,4 @@ router.widget.setMaximumSize(1024, 640)
 
 # Exec
 app.exec()
+logger.close()
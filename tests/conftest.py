@@ -0,0 +1,13 @@
+import os
+import sys
+import pytest
+
+# pynput needs a display unless told otherwise, the tests never touch real input
+os.environ.setdefault('PYNPUT_BACKEND', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Settings, journals and other files written by the code under test stay out of the working tree
+@pytest.fixture(autouse=True)
+def working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,94 @@
+import pytest
+from kink import di
+from pynput.keyboard import Key, KeyCode
+from pynput.mouse import Button as MouseKey
+from Model.KeyPressType import KeyPressType
+from Model.KeyboardInputEvent import KeystrokeEvent
+from Model.MouseInputEvent import MouseClickEvent, MouseMoveEvent, MouseScrollEvent
+from Model.ScriptActionColumns import ScriptActionColumns
+from Model.ScriptActionTimeline import ScriptActionTimeline
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptInputEventAction import ScriptInputEventAction
+from Model.ScriptMessageAction import ScriptMessageAction
+from Service.EventSimulator import KeyboardEventSimulator, MouseEventSimulator, \
+    KeyboardEventSimulatorProtocol, MouseEventSimulatorProtocol
+from Service.Work.ScriptActionExecutionBuilder import ScriptActionExecutionBuilderProtocol
+from Utilities.Point import Point
+
+
+# Stands in for the pynput controllers, records what the simulators send
+class FakeController:
+    def __init__(self, calls):
+        self.calls = calls
+    
+    def set_position(self, value): self.calls.append(('position', value))
+    position = property(None, set_position)
+    
+    def press(self, key): self.calls.append(('press', key))
+    def release(self, key): self.calls.append(('release', key))
+    def tap(self, key): self.calls.append(('tap', key))
+    def click(self, key): self.calls.append(('click', key))
+    def move(self, dx, dy): self.calls.append(('move', dx, dy))
+    def scroll(self, dx, dy): self.calls.append(('scroll', dx, dy))
+
+
+@pytest.fixture
+def calls():
+    result = []
+    keyboard = KeyboardEventSimulator()
+    keyboard.keyboard = FakeController(result)
+    mouse = MouseEventSimulator()
+    mouse.mouse = FakeController(result)
+    di[KeyboardEventSimulatorProtocol] = keyboard
+    di[MouseEventSimulatorProtocol] = mouse
+    return result
+
+
+def input_action(action_type, event, time):
+    event.set_time(time)
+    return ScriptInputEventAction(action_type, event, time)
+
+
+def make_actions():
+    return [
+        input_action(ScriptActionType.MOUSE_MOVE, MouseMoveEvent(Point(10, 20)), 0.0),
+        input_action(ScriptActionType.MOUSE_MOVE, MouseMoveEvent(Point(10.5, 21)), 0.01),
+        input_action(ScriptActionType.MOUSE_PRESS, MouseClickEvent(KeyPressType.PRESS, MouseKey.left, Point(10, 21)), 0.02),
+        input_action(ScriptActionType.MOUSE_RELEASE, MouseClickEvent(KeyPressType.RELEASE, MouseKey.left, Point(10, 21)), 0.03),
+        ScriptMessageAction('halfway', False, 0.04),
+        input_action(ScriptActionType.KEYBOARD_PRESS, KeystrokeEvent(KeyPressType.PRESS, Key.shift), 0.05),
+        input_action(ScriptActionType.KEYBOARD_CLICK, KeystrokeEvent(KeyPressType.CLICK, KeyCode.from_char('a')), 0.06),
+        input_action(ScriptActionType.KEYBOARD_RELEASE, KeystrokeEvent(KeyPressType.RELEASE, Key.shift), 0.07),
+        input_action(ScriptActionType.MOUSE_CLICK, MouseClickEvent(KeyPressType.CLICK, MouseKey.right, Point(3, 4)), 0.08),
+        input_action(ScriptActionType.MOUSE_SCROLL, MouseScrollEvent(Point(5, 6), Point(0, -2)), 0.09),
+    ]
+
+
+def play(plan, repeat_count=1):
+    for _ in range(repeat_count):
+        for index in range(plan.count()):
+            step = plan.step(index)
+            step.execute()
+            assert not step.update()
+
+
+def test_columnar_plan_matches_action_plan(calls):
+    builder = di[ScriptActionExecutionBuilderProtocol]
+    
+    play(builder.compile(None, ScriptActionTimeline(ScriptActions(make_actions()))))
+    expected = list(calls)
+    calls.clear()
+    
+    play(builder.compile(None, ScriptActionTimeline(ScriptActions(ScriptActionColumns(make_actions())))), repeat_count=2)
+    
+    assert len(expected) > 0
+    assert calls == expected + expected
+
+
+def test_columnar_plan_reuses_input_steps(calls):
+    columns = ScriptActionColumns(make_actions())
+    plan = di[ScriptActionExecutionBuilderProtocol].compile(None, ScriptActionTimeline(ScriptActions(columns)))
+    
+    assert len(plan.steps) == len(columns.others) == 1
+    assert len({id(plan.step(index)) for index in range(plan.count())}) == 3 # Key, mouse and message steps
@@ -0,0 +1,109 @@
+import pytest
+from kink import di
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionType import ScriptActionType
+from Model.ScriptActions import ScriptActions
+from Model.ScriptData import ScriptData
+from Model.ScriptInputEventAction import ScriptInputEventAction
+from Service.EventSimulator import MouseEventSimulator, MouseEventSimulatorProtocol
+from Service.Work.ScriptSimulation import ScriptSimulation, ScriptSimulationState
+from Utilities.Clock import ClockProtocol, FakeClock, seconds_to_ns
+from Utilities.Point import Point
+
+START_TIME = 10 # Seconds, the clock does not start at 0 like the timers
+TIMES = (0.0, 0.1, 0.25, 0.5, 0.8)
+
+
+# Stands in for the pynput mouse controller, records the time of every move
+class FakeMouseController:
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.moves = []
+    
+    def set_position(self, value): self.moves.append((self.clock.now_ns() - seconds_to_ns(START_TIME), value))
+    position = property(None, set_position)
+
+
+@pytest.fixture
+def clock():
+    previous = di[ClockProtocol]
+    result = FakeClock(seconds_to_ns(START_TIME))
+    di[ClockProtocol] = result
+    yield result
+    di[ClockProtocol] = previous
+
+
+@pytest.fixture
+def controller(clock):
+    result = FakeMouseController(clock)
+    mouse = MouseEventSimulator()
+    mouse.mouse = result
+    di[MouseEventSimulatorProtocol] = mouse
+    return result
+
+
+def make_script(times) -> ScriptData:
+    actions = []
+    
+    for index, time in enumerate(times):
+        event = MouseMoveEvent(Point(index, index))
+        event.set_time(time)
+        actions.append(ScriptInputEventAction(ScriptActionType.MOUSE_MOVE, event, time))
+    
+    return ScriptData(ScriptActions(actions))
+
+
+def at(seconds) -> int:
+    return seconds_to_ns(seconds)
+
+
+def test_actions_fire_at_their_deadlines(clock, controller):
+    simulation = ScriptSimulation(make_script(TIMES))
+    
+    simulation.run()
+    
+    assert controller.moves == [(at(time), (index, index)) for index, time in enumerate(TIMES)]
+    assert simulation.state() == ScriptSimulationState.FINISHED
+    assert simulation.timing_summary().lateness_max == 0
+
+
+# An action is never fired before its time, nor before the actions before it
+def test_actions_fire_in_order(clock, controller):
+    simulation = ScriptSimulation(make_script((0.0, 0.3, 0.1, 0.3, 0.5)))
+    
+    simulation.run()
+    
+    assert controller.moves == [(at(0.0), (0, 0)), (at(0.3), (1, 1)), (at(0.3), (2, 2)), (at(0.3), (3, 3)),
+                                (at(0.5), (4, 4))]
+
+
+def test_pause_delays_the_next_actions(clock, controller):
+    simulation = ScriptSimulation(make_script(TIMES))
+    clock.call_at(START_TIME + 0.3, simulation.pause)
+    clock.call_at(START_TIME + 1.3, simulation.resume)
+    
+    simulation.run()
+    
+    assert [time for time, _ in controller.moves] == [at(0.0), at(0.1), at(0.25), at(1.5), at(1.8)]
+    assert simulation.timing_summary().lateness_max == 0
+
+
+def test_seek_skips_to_the_action(clock, controller):
+    simulation = ScriptSimulation(make_script(TIMES))
+    clock.call_at(START_TIME + 0.05, lambda: simulation.seek(3))
+    
+    simulation.run()
+    
+    assert controller.moves == [(at(0.0), (0, 0)), (at(0.05), (3, 3)), (at(0.35), (4, 4))]
+
+
+def test_seek_while_paused(clock, controller):
+    simulation = ScriptSimulation(make_script(TIMES))
+    clock.call_at(START_TIME + 0.2, simulation.pause)
+    clock.call_at(START_TIME + 0.4, lambda: simulation.seek(1))
+    clock.call_at(START_TIME + 1.0, simulation.resume)
+    
+    simulation.run()
+    
+    assert controller.moves == [(at(0.0), (0, 0)), (at(0.1), (1, 1)), (at(1.0), (1, 1)), (at(1.15), (2, 2)),
+                                (at(1.4), (3, 3)), (at(1.7), (4, 4))]
@@ -0,0 +1,113 @@
+import time
+import pytest
+from kink import di
+from Model.ScriptActionType import ScriptActionType
+from Parser.ScriptActionDescriptionParser import ScriptActionDescriptionParserProtocol, Grouping
+from MainView.RecordScriptPresenter import RecordScriptPresenter
+from Service import EventMonitor
+from Service.SettingsManager import SettingsManagerField, SettingsManagerProtocol
+
+START_TIMEOUT = 5 # Seconds
+MOVE_COUNT = 500
+
+
+class FakeListener:
+    def __init__(self, **kwargs): pass
+    def start(self): pass
+    def stop(self): pass
+    def wait(self): pass
+    def join(self): pass
+
+
+# Shows the events oldest first, like the table does newest first
+class FakeRecordScriptWidget:
+    def __init__(self):
+        self.events = []
+    
+    def begin_recording(self, sender): pass
+    def stop_recording(self, sender): pass
+    
+    def set_events_data(self, data):
+        self.events = list(data)
+    
+    def add_events_data(self, removed_count, data):
+        del self.events[len(self.events) - removed_count:]
+        self.events.extend(data)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setattr(EventMonitor, 'KeyboardListener', FakeListener)
+    monkeypatch.setattr(EventMonitor.mouse, 'Listener', FakeListener)
+    
+    result = di[SettingsManagerProtocol]
+    fields = (SettingsManagerField.RECORD_PATH_TOLERANCE, SettingsManagerField.RECORD_TO_JOURNAL)
+    previous = {field: result.get_all_values().get(field) for field in fields}
+    yield result
+    
+    for field, value in previous.items():
+        if value is None:
+            result.get_all_values().pop(field, None)
+            result.get_config().pop(field, None)
+        else:
+            result.set_field_value(field, value)
+
+
+def make_presenter() -> (RecordScriptPresenter, FakeRecordScriptWidget):
+    widget = FakeRecordScriptWidget()
+    presenter = RecordScriptPresenter()
+    presenter.set_widget(widget)
+    return presenter, widget
+
+
+def wait_until(condition):
+    deadline = time.monotonic() + START_TIMEOUT
+    
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def described(presenter: RecordScriptPresenter) -> list:
+    parser = di[ScriptActionDescriptionParserProtocol]
+    return parser.parse_actions(presenter.get_recorded_events_as_actions(), Grouping(ScriptActionType.MOUSE_MOVE))
+
+
+# Records a straight line, which the filter simplifies to its two ends when the worker finishes
+@pytest.mark.parametrize('journal', ('false', 'true'))
+@pytest.mark.parametrize('tolerance', ('0', '2'))
+def test_events_are_described_again_when_replaced(tolerance, journal, settings):
+    settings.set_field_value(SettingsManagerField.RECORD_PATH_TOLERANCE, tolerance)
+    settings.set_field_value(SettingsManagerField.RECORD_TO_JOURNAL, journal)
+    presenter, widget = make_presenter()
+    
+    presenter.begin_recording(sender=widget)
+    worker = presenter.event_monitor.worker
+    wait_until(worker.mouse_monitor.is_running)
+    
+    for index in range(MOVE_COUNT):
+        worker.mouse_monitor.on_move(index, 2 * index)
+    
+    wait_until(lambda: worker.mouse_buffer.is_empty())
+    presenter.update_events()
+    described_count = presenter.description_state.action_count
+    
+    presenter.stop_recording(sender=widget)
+    
+    assert not presenter.update_timer.isActive()
+    
+    # The events are replaced when the worker finishes, any update after that describes them from the start
+    presenter.event_monitor.wait()
+    presenter.update_events()
+    recorded_count = presenter.get_recorded_events_as_actions().count()
+    
+    assert recorded_count == (MOVE_COUNT if tolerance == '0' else 2)
+    assert described_count <= MOVE_COUNT
+    assert presenter.description_state.action_count == recorded_count
+    assert widget.events == described(presenter)
+    
+    # Delivered by the event loop once the worker has finished
+    presenter.recording_finished()
+    
+    assert presenter.description_state.action_count == recorded_count
+    assert widget.events == described(presenter)
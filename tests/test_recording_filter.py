@@ -0,0 +1,120 @@
+import math
+import random
+import pytest
+from Utilities.Point import Point
+from Model.MouseInputEvent import MouseMoveEvent
+from Model.ScriptActionColumns import ScriptActionColumns, TYPE_CODES
+from Model.ScriptActionType import ScriptActionType
+from Service.RecordingFilter import (RecordingFilter, RecordingFilterOptions, MOUSE_MOVE_CODE,
+                                     simplified_path, segment_distance)
+
+TOLERANCES = (0.5, 1, 2, 5)
+EPSILON = 1e-9
+POINT_COUNT = 2000
+
+
+def line_path():
+    return [(10 + index * 0.5, 20 + index * 0.25) for index in range(POINT_COUNT)]
+
+
+def curve_path():
+    return [(400 + 300 * math.cos(index / 200), 300 + 200 * math.sin(index / 150)) for index in range(POINT_COUNT)]
+
+
+def jitter_path():
+    generator = random.Random(42)
+    return [(index * 0.5 + generator.uniform(-3, 3), 100 + generator.uniform(-3, 3)) for index in range(POINT_COUNT)]
+
+
+PATHS = {'line': line_path, 'curve': curve_path, 'jitter': jitter_path}
+
+
+# Every point between two kept points is within tolerance of the segment joining them
+def assert_within_tolerance(xs, ys, kept, tolerance):
+    for first, last in zip(kept, kept[1:]):
+        for index in range(first + 1, last):
+            value = segment_distance(xs[index], ys[index], xs[first], ys[first], xs[last], ys[last])
+            assert value <= tolerance + EPSILON, f'point {index} is {value} away from the kept path'
+
+
+@pytest.mark.parametrize('tolerance', TOLERANCES)
+@pytest.mark.parametrize('name', PATHS.keys())
+def test_simplified_path_stays_within_tolerance(name, tolerance):
+    points = PATHS[name]()
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    
+    kept = simplified_path(xs, ys, 0, len(points) - 1, tolerance)
+    
+    assert kept[0] == 0
+    assert kept[-1] == len(points) - 1
+    assert kept == sorted(set(kept))
+    assert_within_tolerance(xs, ys, kept, tolerance)
+
+
+def test_simplified_line_keeps_only_ends():
+    points = line_path()
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    
+    assert simplified_path(xs, ys, 0, len(points) - 1, 0.5) == [0, len(points) - 1]
+
+
+@pytest.mark.parametrize('tolerance', TOLERANCES)
+def test_simplify_keeps_other_events_and_run_ends(tolerance):
+    click_code = TYPE_CODES[ScriptActionType.MOUSE_CLICK]
+    columns = ScriptActionColumns()
+    time = 0.0
+    
+    for path in PATHS.values():
+        for x, y in path():
+            columns.append_values(MOUSE_MOVE_CODE, time, x, y)
+            time += 0.001
+        
+        columns.append_values(click_code, time)
+        time += 0.001
+    
+    recording_filter = RecordingFilter(RecordingFilterOptions(tolerance=tolerance))
+    result = recording_filter.simplify(columns)
+    
+    assert len(result) < len(columns)
+    assert recording_filter.get_stats().dropped_by_simplification == len(columns) - len(result)
+    assert list(result.types).count(click_code) == len(PATHS)
+    
+    # Times are increasing, so they identify the kept samples in the original columns
+    kept = [list(columns.times).index(value) for value in result.times]
+    run_start = 0
+    
+    for index in range(len(columns) + 1):
+        if index < len(columns) and columns.types[index] == MOUSE_MOVE_CODE:
+            continue
+        
+        if index > run_start:
+            run = [value for value in kept if run_start <= value < index]
+            assert run[0] == run_start
+            assert run[-1] == index - 1
+            assert_within_tolerance(columns.xs, columns.ys, run, tolerance)
+        
+        run_start = index + 1
+
+
+def test_accepts_move_holds_last_dropped_move():
+    recording_filter = RecordingFilter(RecordingFilterOptions(min_interval=0.01, min_distance=2))
+    events = []
+    
+    for index, (x, y) in enumerate(line_path()[:100]):
+        event = MouseMoveEvent(Point(x, y))
+        event.set_time(index * 0.004)
+        events.append(event)
+    
+    accepted = [event for event in events if recording_filter.accepts_move(event)]
+    held = recording_filter.release_held_move()
+    
+    assert accepted[0] is events[0]
+    assert held is events[-1]
+    assert recording_filter.release_held_move() is None
+    
+    kept = accepted + [held]
+    stats = recording_filter.get_stats()
+    assert stats.received_moves == len(events)
+    assert stats.dropped_count() == len(events) - len(kept)
@@ -0,0 +1,139 @@
+import math
+import random
+import time
+import pytest
+from kink import di
+from pynput.mouse import Button as MouseKey
+from Model.ScriptData import ScriptData
+from Service import EventMonitor
+from Service.EventMonitorManager import EventMonitorWorker
+from Service.EventSimulator import KeyboardEventSimulator, MouseEventSimulator, \
+    KeyboardEventSimulatorProtocol, MouseEventSimulatorProtocol
+from Service.RecordingFilter import RecordingFilterOptions, segment_distance
+from Service.Work.ScriptSimulation import ScriptSimulation
+
+EPSILON = 1e-9
+POINT_COUNT = 1000
+START_TIMEOUT = 5 # Seconds
+
+
+def line_path():
+    return [(10 + index, 20 + index // 2) for index in range(POINT_COUNT)]
+
+
+def curve_path():
+    return [(round(400 + 300 * math.cos(index / 100)), round(300 + 200 * math.sin(index / 75))) for index in range(POINT_COUNT)]
+
+
+def jitter_path():
+    generator = random.Random(7)
+    return [(index // 2 + generator.randint(-3, 3), 100 + generator.randint(-3, 3)) for index in range(POINT_COUNT)]
+
+
+PATHS = {'line': line_path, 'curve': curve_path, 'jitter': jitter_path}
+
+
+class FakeListener:
+    def __init__(self, **kwargs): pass
+    def start(self): pass
+    def stop(self): pass
+    def wait(self): pass
+    def join(self): pass
+
+
+# Stands in for the pynput controllers, records what the simulators send
+class FakeController:
+    def __init__(self, calls):
+        self.calls = calls
+    
+    def set_position(self, value): self.calls.append(('position', value))
+    position = property(None, set_position)
+    
+    def press(self, key): self.calls.append(('press', key))
+    def release(self, key): self.calls.append(('release', key))
+    def tap(self, key): self.calls.append(('tap', key))
+    def click(self, key): self.calls.append(('click', key))
+    def move(self, dx, dy): self.calls.append(('move', dx, dy))
+    def scroll(self, dx, dy): self.calls.append(('scroll', dx, dy))
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    monkeypatch.setattr(EventMonitor, 'KeyboardListener', FakeListener)
+    monkeypatch.setattr(EventMonitor.mouse, 'Listener', FakeListener)
+    
+    result = []
+    keyboard = KeyboardEventSimulator()
+    keyboard.keyboard = FakeController(result)
+    mouse = MouseEventSimulator()
+    mouse.mouse = FakeController(result)
+    di[KeyboardEventSimulatorProtocol] = keyboard
+    di[MouseEventSimulatorProtocol] = mouse
+    return result
+
+
+# Moves the mouse along points and clicks at the end, as seen by the listener
+def record(points, options: RecordingFilterOptions) -> ScriptData:
+    worker = EventMonitorWorker(options)
+    monitor = worker.mouse_monitor
+    worker.start()
+    deadline = time.monotonic() + START_TIMEOUT
+    
+    while not monitor.is_running():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    
+    for x, y in points:
+        monitor.on_move(x, y)
+    
+    x, y = points[-1]
+    monitor.on_click(x, y, MouseKey.left, True)
+    monitor.on_click(x, y, MouseKey.left, False)
+    worker.stop()
+    worker.wait()
+    return ScriptData(worker.get_actions())
+
+
+def replay(script: ScriptData, calls) -> list:
+    ScriptSimulation(script).run()
+    return list(calls)
+
+
+def polyline_distance(point, polyline) -> float:
+    x, y = point
+    
+    if len(polyline) == 1:
+        return math.hypot(x - polyline[0][0], y - polyline[0][1])
+    
+    return min(segment_distance(x, y, ax, ay, bx, by) for (ax, ay), (bx, by) in zip(polyline, polyline[1:]))
+
+
+@pytest.mark.parametrize('name', PATHS.keys())
+def test_unfiltered_recording_replays_every_move(name, calls):
+    points = PATHS[name]()
+    
+    replayed = replay(record(points, RecordingFilterOptions()), calls)
+    
+    assert [value for kind, value in replayed if kind == 'position'] == points
+    assert replayed[-2:] == [('press', MouseKey.left), ('release', MouseKey.left)]
+
+
+@pytest.mark.parametrize('tolerance', (1, 3))
+@pytest.mark.parametrize('min_distance', (0, 2))
+@pytest.mark.parametrize('name', PATHS.keys())
+def test_filtered_recording_replays_within_tolerance(name, min_distance, tolerance, calls):
+    points = PATHS[name]()
+    options = RecordingFilterOptions(min_distance=min_distance, tolerance=tolerance)
+    
+    replayed = replay(record(points, options), calls)
+    path = [value for kind, value in replayed if kind == 'position']
+    
+    assert len(path) < len(points)
+    assert path[0] == points[0]
+    
+    # The cursor is where the user clicked
+    assert replayed[-3:] == [('position', points[-1]), ('press', MouseKey.left), ('release', MouseKey.left)]
+    
+    # A move dropped by distance is within min_distance of a recorded move, which is within tolerance of the path
+    for point in points:
+        assert polyline_distance(point, path) <= min_distance + tolerance + EPSILON